@@ -0,0 +1,20 @@
+CREATE TABLE IF NOT EXISTS merchants (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  monzo_merchant_id TEXT,
+  first_seen_at TEXT NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS merchants_monzo_id_unique
+ON merchants(monzo_merchant_id) WHERE monzo_merchant_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS merchant_aliases (
+  alias TEXT PRIMARY KEY,
+  merchant_id INTEGER NOT NULL,
+  FOREIGN KEY(merchant_id) REFERENCES merchants(id)
+);
+
+ALTER TABLE transactions ADD COLUMN merchant_id INTEGER REFERENCES merchants(id);
+
+CREATE INDEX IF NOT EXISTS transactions_merchant_created_idx
+ON transactions(merchant_id, created_at);
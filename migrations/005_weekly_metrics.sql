@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS weekly_metrics (
+  user_id TEXT NOT NULL,
+  week_start TEXT NOT NULL,
+  metric TEXT NOT NULL,
+  value REAL NOT NULL,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (user_id, week_start, metric),
+  FOREIGN KEY(user_id) REFERENCES users(id)
+);
@@ -0,0 +1,5 @@
+ALTER TABLE job_runs ADD COLUMN duration_ms INTEGER;
+ALTER TABLE job_runs ADD COLUMN metrics_json TEXT;
+
+CREATE INDEX IF NOT EXISTS job_runs_job_started_idx
+ON job_runs(job_name, started_at);
@@ -0,0 +1,8 @@
+CREATE INDEX IF NOT EXISTS transactions_created_id_idx
+ON transactions(created_at, id);
+
+CREATE INDEX IF NOT EXISTS aggregates_daily_day_category_idx
+ON aggregates_daily(day, category, id);
+
+CREATE INDEX IF NOT EXISTS insights_created_id_idx
+ON insights(created_at, id);
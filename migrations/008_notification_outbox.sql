@@ -0,0 +1,31 @@
+CREATE TABLE IF NOT EXISTS notification_outbox (
+  id TEXT PRIMARY KEY,
+  user_id TEXT NOT NULL,
+  title TEXT NOT NULL,
+  message TEXT NOT NULL,
+  url TEXT,
+  status TEXT NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at TEXT NOT NULL,
+  last_error TEXT,
+  created_at TEXT NOT NULL,
+  sent_at TEXT,
+  FOREIGN KEY(user_id) REFERENCES users(id)
+);
+
+CREATE INDEX IF NOT EXISTS notification_outbox_due_idx
+ON notification_outbox(status, next_attempt_at);
+
+CREATE TABLE IF NOT EXISTS notification_daily_counts (
+  user_id TEXT NOT NULL,
+  day TEXT NOT NULL,
+  sent INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, day),
+  FOREIGN KEY(user_id) REFERENCES users(id)
+);
+
+INSERT OR IGNORE INTO notification_daily_counts (user_id, day, sent)
+SELECT user_id, substr(created_at, 1, 10), COUNT(1)
+FROM notifications
+WHERE status = 'sent'
+GROUP BY user_id, substr(created_at, 1, 10);
@@ -0,0 +1,21 @@
+CREATE TABLE IF NOT EXISTS rules_version (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  version INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO rules_version (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS rules_version_on_insert AFTER INSERT ON rules
+BEGIN
+  UPDATE rules_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rules_version_on_update AFTER UPDATE ON rules
+BEGIN
+  UPDATE rules_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rules_version_on_delete AFTER DELETE ON rules
+BEGIN
+  UPDATE rules_version SET version = version + 1 WHERE id = 1;
+END;
@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS pending_checks (
+  transaction_id TEXT PRIMARY KEY,
+  status TEXT NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  checked_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS transactions_pending_idx
+ON transactions(created_at, id) WHERE is_pending = 1;
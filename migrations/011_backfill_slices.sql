@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS backfill_slices (
+  account_id TEXT NOT NULL,
+  slice_start TEXT NOT NULL,
+  slice_end TEXT NOT NULL,
+  status TEXT NOT NULL,
+  rows INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (account_id, slice_start, slice_end)
+);
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
+from . import telemetry
 from .spend_filters import build_spend_filter_clause
 
 logger = logging.getLogger("mentos.aggregates")
@@ -31,6 +32,8 @@ def rebuild_daily(conn, days: int = 35) -> None:
     )
 
     rows = cur.fetchall()
+    telemetry.count("rows_read", len(rows))
+    telemetry.count("rows_written", len(rows))
     for row in rows:
         conn.execute(
             """
@@ -41,3 +44,58 @@ def rebuild_daily(conn, days: int = 35) -> None:
         )
     conn.commit()
     logger.info("Rebuilt aggregates for last %s days", days)
+
+
+def daily_cells(conn, transaction_ids: list[str]) -> set[tuple[str, str]]:
+    """The ``(day, category)`` aggregate cells the given transactions fall in."""
+    if not transaction_ids:
+        return set()
+    placeholders = ",".join("?" for _ in transaction_ids)
+    cur = conn.execute(
+        f"""
+        SELECT date(COALESCE(settled_at, created_at)), COALESCE(category, 'uncategorized')
+        FROM transactions WHERE id IN ({placeholders})
+        """,
+        transaction_ids,
+    )
+    return {(row[0], row[1]) for row in cur.fetchall()}
+
+
+def refresh_daily_cells(conn, cells: set[tuple[str, str]]) -> int:
+    """Recompute only the given ``(day, category)`` cells of ``aggregates_daily``.
+
+    Used when a single transaction arrives or changes, instead of rebuilding
+    the whole window. The caller owns the commit.
+    """
+    if not cells:
+        return 0
+    days = sorted({day for day, _ in cells})
+    day_placeholders = ",".join("?" for _ in days)
+    filter_clause, filter_params = build_spend_filter_clause(conn)
+    cur = conn.execute(
+        f"""
+        SELECT
+          date(COALESCE(settled_at, created_at)) as day,
+          COALESCE(category, 'uncategorized') as cat,
+          SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END) as total_amount,
+          SUM(CASE WHEN amount < 0 THEN 1 ELSE 0 END) as cnt
+        FROM transactions
+        WHERE date(COALESCE(settled_at, created_at)) IN ({day_placeholders})
+          AND is_pending = 0{filter_clause}
+        GROUP BY day, cat
+        """,
+        (*days, *filter_params),
+    )
+    rows = [row for row in cur.fetchall() if (row[0], row[1]) in cells]
+    conn.executemany(
+        "DELETE FROM aggregates_daily WHERE day = ? AND category = ?",
+        sorted(cells),
+    )
+    conn.executemany(
+        """
+        INSERT INTO aggregates_daily (id, user_id, day, category, total_amount, count, created_at, updated_at)
+        VALUES (hex(randomblob(16)), ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+        """,
+        [("user_1", row[0], row[1], row[2] or 0, row[3] or 0) for row in rows],
+    )
+    return len(cells)
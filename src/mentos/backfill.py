@@ -0,0 +1,199 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dt_time
+
+from . import telemetry
+from .aggregates import rebuild_daily
+from .ingest import upsert_transactions
+from .monzo_client import MonzoClient, MonzoError
+from .storage import ensure_user
+from .sync import store_accounts
+
+logger = logging.getLogger("mentos.backfill")
+
+DEFAULT_SLICE_DAYS = 7
+DEFAULT_WORKERS = 4
+# Well under Monzo's per-client limits; 429s are still retried by the client.
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+PAGE_LIMIT = 100
+
+
+def _parse_dt(ts: str) -> datetime:
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+class RateLimiter:
+    """Token bucket shared by the fetch workers."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            # Reserve the token now so later callers queue behind this one.
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+
+@dataclass(frozen=True)
+class Slice:
+    account_id: str
+    start: datetime
+    end: datetime
+
+
+def plan_slices(
+    account_ids: list[str], since: date, until: datetime, slice_days: int = DEFAULT_SLICE_DAYS
+) -> list[Slice]:
+    """Cut ``[since, until)`` into ``slice_days`` windows per account.
+
+    Boundaries sit on a fixed grid (multiples of ``slice_days`` since
+    0001-01-01), so a later run with a different ``since`` lines up with the
+    slices already checkpointed. The newest slice is clipped at ``until``.
+    """
+    first = date.fromordinal(since.toordinal() - (since.toordinal() - 1) % slice_days)
+    start = datetime.combine(first, dt_time(), tzinfo=timezone.utc)
+    slices = []
+    while start < until:
+        end = min(start + timedelta(days=slice_days), until)
+        slices.extend(Slice(account_id, start, end) for account_id in account_ids)
+        start = end
+    return slices
+
+
+def fetch_slice(client, limiter: RateLimiter, piece: Slice) -> list[dict]:
+    """Every transaction in one slice, paging backwards from its end."""
+    since = piece.start.isoformat()
+    before = piece.end.isoformat()
+    transactions: list[dict] = []
+    while True:
+        limiter.acquire()
+        items = client.list_transactions(piece.account_id, since=since, before=before).get("transactions", [])
+        transactions.extend(items)
+        if len(items) < PAGE_LIMIT:
+            return transactions
+        before = items[-1].get("created")
+        if not before or _parse_dt(before) <= piece.start:
+            return transactions
+
+
+def _done_slices(conn) -> set[tuple[str, str, str]]:
+    return {
+        tuple(row)
+        for row in conn.execute(
+            "SELECT account_id, slice_start, slice_end FROM backfill_slices WHERE status = 'done'"
+        )
+    }
+
+
+def _checkpoint(conn, piece: Slice, status: str, rows: int = 0) -> None:
+    conn.execute(
+        """
+        INSERT INTO backfill_slices (account_id, slice_start, slice_end, status, rows, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(account_id, slice_start, slice_end)
+        DO UPDATE SET status = excluded.status, rows = excluded.rows, updated_at = excluded.updated_at
+        """,
+        (
+            piece.account_id,
+            piece.start.isoformat(),
+            piece.end.isoformat(),
+            status,
+            rows,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+    )
+
+
+def backfill(
+    conn,
+    token: str | None,
+    since: date,
+    until: datetime | None = None,
+    client: MonzoClient | None = None,
+    slice_days: int = DEFAULT_SLICE_DAYS,
+    workers: int = DEFAULT_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+) -> dict:
+    """Pull transaction history back to ``since`` in parallel time slices.
+
+    Slices are fetched on a worker pool sharing one rate limiter and written
+    here, one commit per slice together with its checkpoint. Completed
+    slices are skipped on the next run, so an interrupted backfill resumes
+    where it stopped. A slice refused with ``verification_required`` (Monzo
+    only serves older history shortly after strong customer authentication)
+    is recorded as such and retried next time; the rest carry on.
+    """
+    client = client or MonzoClient(token)
+    until = until or datetime.now(timezone.utc)
+    user_id = ensure_user(conn)
+    accounts = client.list_accounts()
+    store_accounts(conn, user_id, accounts)
+    account_ids = [acc["id"] for acc in accounts.get("accounts", []) if acc.get("id")]
+
+    done = _done_slices(conn)
+    slices = plan_slices(account_ids, since, until, slice_days)
+    todo = [s for s in slices if (s.account_id, s.start.isoformat(), s.end.isoformat()) not in done]
+    result = {
+        "slices": len(slices),
+        "skipped": len(slices) - len(todo),
+        "fetched": 0,
+        "verification_required": 0,
+        "rows": 0,
+    }
+    logger.info("Backfill since %s: %s slices, %s already done", since, len(slices), result["skipped"])
+
+    limiter = RateLimiter(requests_per_second, burst=max(workers, 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mentos-backfill") as pool:
+        futures = {
+            pool.submit(contextvars.copy_context().run, fetch_slice, client, limiter, piece): piece
+            for piece in todo
+        }
+        try:
+            for future in as_completed(futures):
+                piece = futures[future]
+                try:
+                    transactions = future.result()
+                except MonzoError as exc:
+                    if "verification_required" not in str(exc):
+                        raise
+                    logger.warning(
+                        "Slice %s..%s for %s needs verification; will retry next run",
+                        piece.start.date(),
+                        piece.end.date(),
+                        piece.account_id,
+                    )
+                    _checkpoint(conn, piece, "verification_required")
+                    conn.commit()
+                    result["verification_required"] += 1
+                    continue
+                telemetry.count("rows_read", len(transactions))
+                upsert_transactions(conn, user_id, piece.account_id, transactions)
+                _checkpoint(conn, piece, "done", len(transactions))
+                conn.commit()
+                result["fetched"] += 1
+                result["rows"] += len(transactions)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    if result["rows"]:
+        oldest = slices[0].start.date()
+        rebuild_daily(conn, days=(datetime.now(timezone.utc).date() - oldest).days + 1)
+    logger.info("Backfill finished: %s", result)
+    return result
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import base64
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from .aggregates import rebuild_daily
+from .breakthroughs import (
+    detect_breakthroughs,
+    seed_v1_goals,
+    update_weekly_goal_progress,
+    week_start,
+)
+from .db import apply_migrations, connect
+from .insights.context import build_spend_context
+from .monzo_stub import StubMonzoClient
+from .replay import prime_last_sync
+from .reports import nightly_report
+from .storage import ensure_default_rules, ensure_user
+from .sync import sync_all
+from .synthetic import SyntheticUser, generate_user, to_fixture
+
+BENCH_SCHEMA_VERSION = 1
+BENCHMARKS = (
+    "sync_all",
+    "rebuild_daily",
+    "nightly_report",
+    "update_weekly_goal_progress",
+    "detect_breakthroughs",
+    "build_spend_context",
+    "generate_timeline",
+    "cli_startup",
+)
+GOAL_PROGRESS_WEEKS = 12
+# Synthetic data ends here unless overridden, so results do not depend on
+# the day the suite runs.
+DEFAULT_END = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+REBUILD_DAYS = 35
+# Short commands scripts and cron call often; each runs in a fresh interpreter.
+CLI_STARTUP_COMMANDS = (
+    ("config", "get", "poll_interval_minutes"),
+    ("config", "list"),
+    ("status",),
+    ("transactions", "--limit", "5"),
+)
+
+
+class BenchSkipped(Exception):
+    pass
+
+
+class _Stopwatch:
+    """Accumulates time spent inside ``with`` blocks so setup is not measured."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self._started = 0.0
+
+    def __enter__(self) -> "_Stopwatch":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds += time.perf_counter() - self._started
+
+
+class _BenchContext:
+    def __init__(self, users: list[SyntheticUser], now: datetime, tz: ZoneInfo, workdir: str):
+        self.users = users
+        self.now = now
+        self.tz = tz
+        self.workdir = workdir
+        self.db_path = str(Path(workdir, "bench.sqlite"))
+        apply_migrations(self.db_path)
+        self.conn = connect(self.db_path)
+        ensure_default_rules(self.conn, ensure_user(self.conn))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _bench_sync_all(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    user = ctx.users[0]
+    client = StubMonzoClient(user.accounts, user.pots, user.transactions)
+    if user.transactions:
+        prime_last_sync(ctx.conn, user.transactions[0]["created"])
+    with clock:
+        sync_all(ctx.conn, "bench", client=client)
+    return ctx.conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0]
+
+
+def _bench_rebuild_daily(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    # rebuild_daily counts back from the real clock; reach the same
+    # REBUILD_DAYS before the synthetic end.
+    days = REBUILD_DAYS + max(0, (datetime.now(timezone.utc) - ctx.now).days)
+    with clock:
+        rebuild_daily(ctx.conn, days=days)
+    return ctx.conn.execute("SELECT COUNT(1) FROM aggregates_daily").fetchone()[0]
+
+
+def _bench_nightly_report(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    # The report the nightly job would send after the synthetic end.
+    day = ctx.now.astimezone(ctx.tz).date() - timedelta(days=1)
+    with clock:
+        payload = nightly_report(ctx.conn, ctx.tz, None, day=day)
+    return len(payload["summary"])
+
+
+def _bench_goal_progress(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    seed_v1_goals(ctx.conn)
+    current = week_start(ctx.now.date())
+    updated = 0
+    for n in range(GOAL_PROGRESS_WEEKS - 1, -1, -1):
+        as_of = datetime.combine(current - timedelta(weeks=n), datetime.min.time())
+        with clock:
+            updated += update_weekly_goal_progress(ctx.conn, as_of=as_of)
+    return updated
+
+
+def _bench_detect_breakthroughs(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    with clock:
+        return len(detect_breakthroughs(ctx.conn))
+
+
+def _bench_spend_context(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    rows = 0
+    for user in ctx.users:
+        fixture = to_fixture(user, now=ctx.now, tz_name=str(ctx.tz))
+        with clock:
+            build_spend_context(
+                transactions=fixture["monzo"]["transactions"],
+                goals=fixture["goals"],
+                prefs=fixture["preferences"],
+                meta_now=fixture["meta"]["now"],
+                timezone=fixture["meta"]["timezone"],
+            )
+        rows += len(fixture["monzo"]["transactions"])
+    return rows
+
+
+def _bench_generate_timeline(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    # The server package is only importable with PYTHONPATH=server and its
+    # dependencies installed; the local benchmarks do not require it.
+    os.environ.setdefault("TOKEN_ENCRYPTION_KEY_B64", base64.b64encode(b"0" * 32).decode())
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(ctx.workdir, 'server.sqlite')}")
+    try:
+        from app.db.models import Transaction, User
+        from app.db.session import Base
+        from app.services.timeline.generator import generate_timeline
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+    except ImportError as exc:
+        raise BenchSkipped(f"server app not importable ({exc}); run with PYTHONPATH=server")
+
+    engine = create_engine(f"sqlite:///{Path(ctx.workdir, 'timeline.sqlite')}", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    rows = 0
+    try:
+        for user in ctx.users:
+            db_user = User(apple_sub=f"bench-{user.user_id}")
+            session.add(db_user)
+            session.flush()
+            session.add_all(
+                Transaction(
+                    id=f"{user.user_id}-{tx['id']}",
+                    user_id=db_user.id,
+                    amount=tx["amount"],
+                    timestamp=datetime.fromisoformat(tx["created"].replace("Z", "+00:00")),
+                    merchant_name=(tx.get("merchant") or {}).get("name"),
+                    category=tx.get("category"),
+                )
+                for tx in user.transactions
+            )
+            session.commit()
+            with clock:
+                generate_timeline(session, db_user.id, None, 200, now_dt=ctx.now)
+            rows += len(user.transactions)
+    finally:
+        session.close()
+        engine.dispose()
+    return rows
+
+
+def run_cli(args: tuple[str, ...], db_path: str, *python_flags: str) -> subprocess.CompletedProcess:
+    """Run ``mentos <args>`` in a fresh interpreter against ``db_path``."""
+    env = {
+        **os.environ,
+        "MENTOS_DB_PATH": db_path,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(Path(__file__).resolve().parents[1]), os.getenv("PYTHONPATH")])),
+    }
+    return subprocess.run(
+        [sys.executable, *python_flags, "-m", "mentos", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _bench_cli_startup(ctx: _BenchContext, clock: _Stopwatch) -> int:
+    ctx.conn.commit()
+    for args in CLI_STARTUP_COMMANDS:
+        with clock:
+            run_cli(args, ctx.db_path)
+    return len(CLI_STARTUP_COMMANDS)
+
+
+_RUNNERS: dict[str, Callable[[_BenchContext, _Stopwatch], int]] = {
+    "sync_all": _bench_sync_all,
+    "rebuild_daily": _bench_rebuild_daily,
+    "nightly_report": _bench_nightly_report,
+    "update_weekly_goal_progress": _bench_goal_progress,
+    "detect_breakthroughs": _bench_detect_breakthroughs,
+    "build_spend_context": _bench_spend_context,
+    "generate_timeline": _bench_generate_timeline,
+    "cli_startup": _bench_cli_startup,
+}
+
+
+def run_benchmarks(
+    *,
+    transactions: int = 10_000,
+    users: int = 1,
+    seed: int = 7,
+    repeat: int = 3,
+    only: list[str] | None = None,
+    tz_name: str = "Europe/London",
+    end: datetime = DEFAULT_END,
+) -> dict:
+    """Run the end-to-end benchmark suite against seeded synthetic data.
+
+    Database benchmarks run in order against a fresh SQLite file per repeat
+    using the first synthetic user; context and timeline benchmarks cover
+    every user; ``cli_startup`` runs short commands in fresh interpreters.
+    The best wall time across repeats is reported. Synthetic data ends at
+    ``end`` (a fixed date by default), which is recorded in ``params``.
+    """
+    selected = [name for name in BENCHMARKS if not only or name in only]
+    # Database benchmarks build on each other, so every step up to the last
+    # selected one runs; only the selected ones are reported.
+    db_steps = BENCHMARKS[:5]
+    last_db_step = max((db_steps.index(n) for n in selected if n in db_steps), default=-1)
+    to_run = list(db_steps[: last_db_step + 1]) + [n for n in BENCHMARKS[5:] if n in selected]
+
+    now = end.astimezone(timezone.utc).replace(microsecond=0)
+    tz = ZoneInfo(tz_name)
+    synthetic = [generate_user(seed=seed, index=i, transactions=transactions, end=now) for i in range(users)]
+
+    results: dict[str, dict] = {}
+    for _ in range(max(1, repeat)):
+        with tempfile.TemporaryDirectory() as workdir:
+            ctx = _BenchContext(synthetic, now, tz, workdir)
+            try:
+                for name in to_run:
+                    clock = _Stopwatch()
+                    try:
+                        rows = _RUNNERS[name](ctx, clock)
+                    except BenchSkipped as exc:
+                        results[name] = {"skipped": str(exc)}
+                        continue
+                    if name not in selected:
+                        continue
+                    best = results.get(name, {}).get("seconds")
+                    if best is None or clock.seconds < best:
+                        results[name] = {
+                            "seconds": round(clock.seconds, 6),
+                            "rows": int(rows),
+                            "us_per_row": round(clock.seconds * 1e6 / rows, 3) if rows else None,
+                        }
+            finally:
+                ctx.close()
+
+    return {
+        "schema": BENCH_SCHEMA_VERSION,
+        "params": {
+            "transactions_per_user": transactions,
+            "users": users,
+            "seed": seed,
+            "repeat": repeat,
+            "timezone": tz_name,
+            "end": now.isoformat(),
+            "python": platform.python_version(),
+        },
+        "benchmarks": {name: results[name] for name in selected if name in results},
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> list[list[str]]:
+    rows = []
+    names = sorted(set(baseline.get("benchmarks", {})) | set(current.get("benchmarks", {})))
+    for name in names:
+        before = baseline.get("benchmarks", {}).get(name, {}).get("seconds")
+        after = current.get("benchmarks", {}).get(name, {}).get("seconds")
+        ratio = f"{after / before:.2f}x" if before and after else "-"
+        rows.append(
+            [
+                name,
+                f"{before:.4f}" if before is not None else "-",
+                f"{after:.4f}" if after is not None else "-",
+                ratio,
+            ]
+        )
+    return rows
@@ -1,69 +1,17 @@
 import json
 import uuid
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from functools import partial
 from typing import Any
 
 from .chatgpt import ChatGPTClient
+from .copywriter import CopyWriter
+from .goal_rules import METRICS, V1_RULES, BreakthroughRule
+from .weekly_metrics import load_weekly_metrics, week_start
 
 DEFAULT_USER_ID = "user_1"
 
 
-@dataclass(frozen=True)
-class BreakthroughRule:
-    goal_type: str
-    improvement_target: float
-    sustained_weeks: int
-    green_threshold_ratio: float
-    trigger_green_weeks: int
-    trigger_window_weeks: int
-    description: str
-
-
-V1_RULES: dict[str, BreakthroughRule] = {
-    "reduce_food_delivery": BreakthroughRule(
-        goal_type="spending",
-        improvement_target=25.0,
-        sustained_weeks=3,
-        green_threshold_ratio=0.75,
-        trigger_green_weeks=3,
-        trigger_window_weeks=3,
-        description="Reduce food delivery spend by 25% for 3 weeks.",
-    ),
-    "save_more_money": BreakthroughRule(
-        goal_type="saving",
-        improvement_target=0.0,
-        sustained_weeks=8,
-        green_threshold_ratio=1.0,
-        trigger_green_weeks=2,
-        trigger_window_weeks=2,
-        description="End-of-month surplus for 2 months.",
-    ),
-    "healthy_spending": BreakthroughRule(
-        goal_type="behavioural",
-        improvement_target=10.0,
-        sustained_weeks=6,
-        green_threshold_ratio=0.85,
-        trigger_green_weeks=4,
-        trigger_window_weeks=6,
-        description="Hit 4 green weeks out of 6.",
-    ),
-    "reduce_nightlife": BreakthroughRule(
-        goal_type="spending",
-        improvement_target=30.0,
-        sustained_weeks=4,
-        green_threshold_ratio=0.70,
-        trigger_green_weeks=4,
-        trigger_window_weeks=4,
-        description="Reduce late-night spend by 30% for 4 weeks.",
-    ),
-}
-
-
-def week_start(d: date) -> date:
-    return d - timedelta(days=d.weekday())
-
-
 def _money(value: float) -> str:
     return f"£{value / 100:.0f}"
 
@@ -99,98 +47,46 @@ def seed_v1_goals(conn) -> None:
     conn.commit()
 
 
-def _sum_spend_for_window(conn, start: datetime, end: datetime, mode: str) -> float:
-    if mode == "delivery":
-        cur = conn.execute(
-            """
-            SELECT SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END)
-            FROM transactions
-            WHERE created_at >= ?
-              AND created_at < ?
-              AND is_pending = 0
-              AND category = 'eating_out'
-            """,
-            (start.isoformat(), end.isoformat()),
-        )
-    elif mode == "nightlife":
-        cur = conn.execute(
-            """
-            SELECT SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END)
-            FROM transactions
-            WHERE created_at >= ?
-              AND created_at < ?
-              AND is_pending = 0
-              AND CAST(strftime('%H', created_at) AS INTEGER) >= 22
-            """,
-            (start.isoformat(), end.isoformat()),
-        )
-    elif mode == "savings_surplus":
-        cur = conn.execute(
-            """
-            SELECT
-              SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END),
-              SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END)
-            FROM transactions
-            WHERE created_at >= ? AND created_at < ? AND is_pending = 0
-            """,
-            (start.isoformat(), end.isoformat()),
-        )
-        income, spend = cur.fetchone()
-        return float((income or 0) - (spend or 0))
-    elif mode == "healthy_spending":
-        cur = conn.execute(
-            """
-            SELECT
-              SUM(CASE WHEN amount < 0 AND category = 'groceries' THEN -amount ELSE 0 END),
-              SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END)
-            FROM transactions
-            WHERE created_at >= ? AND created_at < ? AND is_pending = 0
-            """,
-            (start.isoformat(), end.isoformat()),
-        )
-        groceries, total_spend = cur.fetchone()
-        if not total_spend:
-            return 0.0
-        return float(groceries or 0) / float(total_spend)
-    else:
-        return 0.0
-    row = cur.fetchone()
-    return float((row[0] if row else 0) or 0)
+def metric_value(components: dict[str, float], mode: str) -> float:
+    metric = METRICS.get(mode)
+    return metric.evaluate(components) if metric else 0.0
 
 
-def _baseline(conn, metric_mode: str, now: datetime, weeks: int = 6) -> float:
-    values = []
-    end = week_start(now.date())
-    for n in range(weeks, 0, -1):
-        ws = end - timedelta(weeks=n)
-        we = ws + timedelta(weeks=1)
-        values.append(
-            _sum_spend_for_window(
-                conn,
-                datetime.combine(ws, datetime.min.time()),
-                datetime.combine(we, datetime.min.time()),
-                metric_mode,
-            )
-        )
+def rolling_baseline(
+    weekly: dict[date, dict[str, float]], metric_mode: str, end_week: date, weeks: int = 6
+) -> float:
+    """Mean of the non-zero metric values over the ``weeks`` before ``end_week``."""
+    first = end_week - timedelta(weeks=weeks)
+    values = [
+        metric_value(weekly[first + timedelta(weeks=n)], metric_mode) for n in range(weeks)
+    ]
     vals = [v for v in values if v > 0]
     if not vals:
         return 0.0
     return sum(vals) / len(vals)
 
 
+def _baseline(
+    conn,
+    metric_mode: str,
+    now: datetime,
+    weeks: int = 6,
+    weekly: dict[date, dict[str, float]] | None = None,
+) -> float:
+    end = week_start(now.date())
+    if weekly is None:
+        weekly = load_weekly_metrics(conn, end - timedelta(weeks=weeks), end)
+    return rolling_baseline(weekly, metric_mode, end, weeks)
+
+
 def _metric_mode(goal_name: str) -> str:
-    if goal_name == "reduce_food_delivery":
-        return "delivery"
-    if goal_name == "reduce_nightlife":
-        return "nightlife"
-    if goal_name == "save_more_money":
-        return "savings_surplus"
-    if goal_name == "healthy_spending":
-        return "healthy_spending"
-    return ""
+    rule = V1_RULES.get(goal_name)
+    return rule.metric.name if rule and rule.metric else ""
 
 
-def score_week(metric_value: float, baseline: float, goal_name: str) -> int:
+def score_week(
+    metric_value: float, baseline: float, goal_name: str, green_ratio: float = 0.75
+) -> int:
     if goal_name == "save_more_money":
         return 2 if metric_value > 0 else 0
     if goal_name == "healthy_spending":
@@ -202,7 +98,7 @@ def score_week(metric_value: float, baseline: float, goal_name: str) -> int:
     if baseline <= 0:
         return 1
     ratio = metric_value / baseline
-    if ratio < 0.75:
+    if ratio < green_ratio:
         return 2
     if ratio <= 1.0:
         return 1
@@ -213,17 +109,19 @@ def update_weekly_goal_progress(conn, as_of: datetime | None = None) -> int:
     now = as_of or datetime.utcnow()
     current_week = week_start(now.date())
     previous_week = current_week - timedelta(weeks=1)
-    start = datetime.combine(previous_week, datetime.min.time())
-    end = datetime.combine(current_week, datetime.min.time())
+    # The six baseline weeks end with the week being scored, so one read of
+    # the materialized weekly metrics covers both.
+    weekly = load_weekly_metrics(conn, current_week - timedelta(weeks=6), current_week)
 
     updated = 0
     for goal in _get_goals(conn):
         mode = _metric_mode(goal["name"])
         if not mode:
             continue
-        baseline = goal["baseline_value"] or _baseline(conn, mode, now)
-        metric_value = _sum_spend_for_window(conn, start, end, mode)
-        score = score_week(metric_value, baseline, goal["name"])
+        baseline = goal["baseline_value"] or _baseline(conn, mode, now, weekly=weekly)
+        value = metric_value(weekly[previous_week], mode)
+        rule = V1_RULES[goal["name"]]
+        score = score_week(value, baseline, goal["name"], rule.green_threshold_ratio)
         conn.execute(
             "UPDATE goals SET baseline_value = ? WHERE id = ?",
             (baseline, goal["id"]),
@@ -236,7 +134,7 @@ def update_weekly_goal_progress(conn, as_of: datetime | None = None) -> int:
             SET metric_value = excluded.metric_value,
                 score = excluded.score
             """,
-            (str(uuid.uuid4()), goal["id"], previous_week.isoformat(), metric_value, score),
+            (str(uuid.uuid4()), goal["id"], previous_week.isoformat(), value, score),
         )
         updated += 1
 
@@ -254,6 +152,22 @@ def _compute_improvement_percent(baseline: float, current: float, goal_name: str
     return max(0.0, ((baseline - current) / baseline) * 100)
 
 
+def evaluate_breakthrough(
+    rule: BreakthroughRule, goal_name: str, baseline: float, rows: list
+) -> float | None:
+    """Improvement percent if ``rows`` (newest first) trigger ``rule``, else None.
+
+    Each row is ``(week_start, metric_value, score)``.
+    """
+    if len(rows) < rule.trigger_window_weeks:
+        return None
+    green_weeks = sum(1 for _, _, score in rows if score == 2)
+    improvement = _compute_improvement_percent(baseline, float(rows[0][1]), goal_name)
+    if green_weeks < rule.trigger_green_weeks or improvement < rule.improvement_target:
+        return None
+    return improvement
+
+
 def _build_fallback_message(
     goal_name: str, baseline: float, current: float, weeks: int
 ) -> tuple[str, str]:
@@ -316,7 +230,25 @@ def _generate_breakthrough_message(
         return fallback_message, fallback_next
 
 
-def detect_breakthroughs(conn, chatgpt_client: ChatGPTClient | None = None) -> list[dict[str, Any]]:
+def _upgraded_copy(chatgpt_client: ChatGPTClient, copy_args: tuple) -> dict[str, str]:
+    message, next_goal = _generate_breakthrough_message(chatgpt_client, *copy_args)
+    if (message, next_goal) == _build_fallback_message(*copy_args):
+        return {}
+    return {"message": message, "next_goal_suggestion": next_goal}
+
+
+def detect_breakthroughs(
+    conn,
+    chatgpt_client: ChatGPTClient | None = None,
+    copywriter: CopyWriter | None = None,
+) -> list[dict[str, Any]]:
+    """Record breakthroughs for goals whose recent weeks meet their rule.
+
+    With a ``copywriter``, events are stored with the fallback copy and the
+    personalized copy is generated in the background instead of inline.
+    """
+    background = bool(copywriter and chatgpt_client and chatgpt_client.is_configured())
+    upgrades: list[tuple[str, tuple]] = []
     created = []
     for goal in _get_goals(conn):
         rule = V1_RULES.get(goal["name"])
@@ -333,17 +265,12 @@ def detect_breakthroughs(conn, chatgpt_client: ChatGPTClient | None = None) -> l
             (goal["id"], rule.trigger_window_weeks),
         )
         rows = cur.fetchall()
-        if len(rows) < rule.trigger_window_weeks:
-            continue
-
-        green_weeks = sum(1 for _, _, score in rows if score == 2)
-        latest_metric = float(rows[0][1])
-        improvement = _compute_improvement_percent(
-            float(goal["baseline_value"] or 0), latest_metric, goal["name"]
+        improvement = evaluate_breakthrough(
+            rule, goal["name"], float(goal["baseline_value"] or 0), rows
         )
-
-        if green_weeks < rule.trigger_green_weeks or improvement < rule.improvement_target:
+        if improvement is None:
             continue
+        latest_metric = float(rows[0][1])
 
         latest_week = rows[0][0]
         existing = conn.execute(
@@ -358,13 +285,16 @@ def detect_breakthroughs(conn, chatgpt_client: ChatGPTClient | None = None) -> l
         if existing:
             continue
 
-        message, next_goal = _generate_breakthrough_message(
-            chatgpt_client,
+        copy_args = (
             goal["name"],
             float(goal["baseline_value"] or 0),
             latest_metric,
             rule.sustained_weeks,
         )
+        if background:
+            message, next_goal = _build_fallback_message(*copy_args)
+        else:
+            message, next_goal = _generate_breakthrough_message(chatgpt_client, *copy_args)
         breakthrough = {
             "id": str(uuid.uuid4()),
             "goal_id": goal["id"],
@@ -394,6 +324,10 @@ def detect_breakthroughs(conn, chatgpt_client: ChatGPTClient | None = None) -> l
             ),
         )
         created.append(breakthrough)
+        if background:
+            upgrades.append((breakthrough["id"], copy_args))
 
     conn.commit()
+    for event_id, copy_args in upgrades:
+        copywriter.submit("breakthroughs", event_id, partial(_upgraded_copy, chatgpt_client, copy_args))
     return created
@@ -3,6 +3,8 @@ import logging
 
 import requests
 
+from . import telemetry, tracing
+
 logger = logging.getLogger("mentos.chatgpt")
 
 
@@ -56,16 +58,18 @@ class ChatGPTClient:
             ],
         }
 
+        telemetry.count("llm_calls")
         try:
-            response = requests.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=body,
-                timeout=self.timeout_seconds,
-            )
+            with telemetry.phase("llm"), tracing.span("chatgpt.request", model=self.model):
+                response = requests.post(
+                    url,
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json=body,
+                    timeout=self.timeout_seconds,
+                )
             response.raise_for_status()
             payload = response.json()
             message = (
@@ -1,28 +1,20 @@
 import argparse
+import contextlib
 import json
 import logging
 import os
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rich.console import Console
-from rich.table import Table
-
-from .chatgpt import ChatGPTClient
+# Subcommand dependencies (rich, requests, jobs, reports, ...) are imported
+# inside the command that needs them so short commands start quickly.
 from .config import load_settings
 from .db import apply_migrations, connect
-from .jobs import (
-    daily_sweep,
-    monthly_review,
-    nightly_report,
-    poll_and_aggregate,
-    weekly_breakthrough_review,
-)
 from .logging import setup_logging
-from .monzo_client import MonzoClient
-from .notifications import Notification, PushoverClient
-from .reports import nightly_report as generate_nightly_report
 from .storage import (
+    ensure_default_rules,
     ensure_user,
     get_rule,
     list_rules,
@@ -30,53 +22,50 @@ from .storage import (
     set_rule,
     store_monzo_token,
 )
-from .sweep import run_daily_sweep
-from .sync import sync_all
+
+if TYPE_CHECKING:
+    from .profiling import Profiler
+    from .tracing import Tracer
 
 logger = logging.getLogger("mentos.cli")
-console = Console()
+_console = None
 
 
 def _print_table(title: str, columns: list[str], rows: list[list[str]]) -> None:
+    global _console
+    from rich.console import Console
+    from rich.table import Table
+
+    _console = _console or Console()
     table = Table(title=title)
     for column in columns:
         table.add_column(column)
     for row in rows:
         table.add_row(*row)
-    console.print(table)
+    _console.print(table)
 
 
 def cmd_db_init(args) -> None:
+    from .merchants import backfill_merchant_ids
+    from .weekly_metrics import rebuild_weekly_metrics
+
     settings = load_settings()
-    migrations_dir = os.path.join(os.path.dirname(__file__), "..", "..", "migrations")
-    apply_migrations(settings.db_path, migrations_dir)
+    apply_migrations(settings.db_path)
     conn = connect(settings.db_path)
     user_id = ensure_user(conn)
-    if get_rule(conn, "poll_interval_minutes") is None:
-        set_rule(
-            conn,
-            user_id,
-            "poll_interval_minutes",
-            int(os.getenv("MENTOS_POLL_INTERVAL_MINUTES", "5")),
-        )
-    if get_rule(conn, "max_notifications_per_day") is None:
-        set_rule(conn, user_id, "max_notifications_per_day", 6)
-    if get_rule(conn, "quiet_hours_start") is None:
-        set_rule(conn, user_id, "quiet_hours_start", "22:00")
-    if get_rule(conn, "quiet_hours_end") is None:
-        set_rule(conn, user_id, "quiet_hours_end", "07:00")
-    if get_rule(conn, "sweep_enabled") is None:
-        set_rule(conn, user_id, "sweep_enabled", False)
-    if get_rule(conn, "exclude_categories") is None:
-        set_rule(conn, user_id, "exclude_categories", ["transfers", "savings"])
-    if get_rule(conn, "exclude_description_keywords") is None:
-        set_rule(conn, user_id, "exclude_description_keywords", ["pot_"])
-    if get_rule(conn, "insight_goals") is None:
-        set_rule(conn, user_id, "insight_goals", ["balanced"])
+    ensure_default_rules(
+        conn,
+        user_id,
+        {"poll_interval_minutes": int(os.getenv("MENTOS_POLL_INTERVAL_MINUTES", "5"))},
+    )
+    backfill_merchant_ids(conn)
+    rebuild_weekly_metrics(conn, user_id)
     logger.info("DB ready at %s", settings.db_path)
 
 
 def cmd_notify_test(args) -> None:
+    from .notifications import Notification, PushoverClient
+
     settings = load_settings()
     client = PushoverClient(
         settings.pushover_app_token,
@@ -143,16 +132,61 @@ def _resolve_monzo_token(settings, conn) -> str | None:
 
 
 def cmd_sync(args) -> None:
+    from .sync import sync_all
+
     settings = load_settings()
     conn = connect(settings.db_path)
     token = _resolve_monzo_token(settings, conn)
     if not token:
         raise RuntimeError("Missing Monzo token")
+    if args.backfill:
+        _backfill(args, conn, token)
+        return
     sync_all(conn, token)
     logger.info("Sync complete")
+    if args.reconcile:
+        from .reconcile import reconcile_pending
+
+        result = reconcile_pending(conn, token)
+        logger.info("Pending reconciliation: %s", result)
+
+
+def _backfill(args, conn, token: str) -> None:
+    from .backfill import backfill
+
+    if not args.since:
+        raise SystemExit("--backfill needs --since YYYY-MM-DD")
+    result = backfill(
+        conn,
+        token,
+        date.fromisoformat(args.since),
+        slice_days=int(args.slice_days),
+        workers=int(args.workers),
+        requests_per_second=float(args.rate),
+    )
+    _print_table(
+        "Backfill",
+        ["Slices", "Skipped", "Fetched", "Needs verification", "Rows"],
+        [
+            [
+                str(result["slices"]),
+                str(result["skipped"]),
+                str(result["fetched"]),
+                str(result["verification_required"]),
+                str(result["rows"]),
+            ]
+        ],
+    )
+    if result["verification_required"]:
+        logger.warning(
+            "Some slices need strong customer authentication; approve access in the Monzo app "
+            "and rerun the same command to resume."
+        )
 
 
 def cmd_accounts(args) -> None:
+    from .monzo_client import MonzoClient
+
     settings = load_settings()
     conn = connect(settings.db_path)
     token = _resolve_monzo_token(settings, conn)
@@ -174,6 +208,9 @@ def cmd_accounts(args) -> None:
 
 
 def cmd_report(args) -> None:
+    from .notifications import PushoverClient
+    from .reports import nightly_report as generate_nightly_report
+
     settings = load_settings()
     conn = connect(settings.db_path)
     notifier = (
@@ -189,6 +226,8 @@ def cmd_report(args) -> None:
 
 
 def cmd_sweep(args) -> None:
+    from .sweep import run_daily_sweep
+
     settings = load_settings()
     conn = connect(settings.db_path)
     token = _resolve_monzo_token(settings, conn)
@@ -199,6 +238,10 @@ def cmd_sweep(args) -> None:
 
 
 def cmd_run(args) -> None:
+    from .chatgpt import ChatGPTClient
+    from .notifications import PushoverClient
+    from .scheduler import Scheduler, default_jobs
+
     settings = load_settings()
     conn = connect(settings.db_path)
     tz = settings.timezone
@@ -215,53 +258,110 @@ def cmd_run(args) -> None:
     token = _resolve_monzo_token(settings, conn)
     try:
         poll_minutes = int(get_rule(conn, "poll_interval_minutes") or 5)
+        reconcile_minutes = int(get_rule(conn, "reconcile_interval_minutes") or 60)
     except Exception:
-        poll_minutes = 5
-
-    logger.info("mentos loop starting")
-    last_poll_key = None
-    last_sweep_key = None
-    last_report_key = None
-    last_monthly_key = None
-    last_breakthrough_key = None
-    while True:
-        now = datetime.now(tz)
-
-        poll_key = now.strftime("%Y-%m-%d %H:%M")
-        if now.minute % poll_minutes == 0 and last_poll_key != poll_key:
-            poll_and_aggregate(conn, token)
-            last_poll_key = poll_key
-
-        # Daily sweep at 00:05
-        sweep_key = f"{now.strftime('%Y-%m-%d')} 00:05"
-        if now.hour == 0 and now.minute == 5 and last_sweep_key != sweep_key:
-            daily_sweep(conn, tz, token)
-            last_sweep_key = sweep_key
-
-        # Nightly report at 00:10
-        report_key = f"{now.strftime('%Y-%m-%d')} 00:10"
-        if now.hour == 0 and now.minute == 10 and last_report_key != report_key:
-            nightly_report(conn, tz, notifier)
-            last_report_key = report_key
-
-        # Weekly breakthrough review on Monday at 09:05
-        breakthrough_key = f"{now.strftime('%G-W%V')} 09:05"
-        if (
-            now.weekday() == 0
-            and now.hour == 9
-            and now.minute == 5
-            and last_breakthrough_key != breakthrough_key
-        ):
-            weekly_breakthrough_review(conn, tz, notifier, chatgpt_client=chatgpt_client)
-            last_breakthrough_key = breakthrough_key
-
-        # Monthly review on 1st at 09:00
-        monthly_key = f"{now.strftime('%Y-%m')}-01 09:00"
-        if now.day == 1 and now.hour == 9 and now.minute == 0 and last_monthly_key != monthly_key:
-            monthly_review(conn, tz, notifier, chatgpt_client=chatgpt_client)
-            last_monthly_key = monthly_key
-
-        time.sleep(30)
+        poll_minutes, reconcile_minutes = 5, 60
+    conn.close()
+
+    scheduler = Scheduler(
+        settings.db_path,
+        default_jobs(tz, token, notifier, chatgpt_client, poll_minutes, reconcile_minutes),
+        tz,
+        workers=int(args.workers),
+    )
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        logger.info("mentos loop stopping")
+
+
+def cmd_webhook_serve(args) -> None:
+    import threading
+
+    from .jobs import poll_and_aggregate
+    from .scheduler import Every, Job, Scheduler
+    from .webhooks import WebhookServer
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    token = _resolve_monzo_token(settings, conn)
+    conn.close()
+
+    # Webhooks carry new transactions; a slow poll still reconciles
+    # settlements, edits and anything delivered while the server was down.
+    reconcile = Scheduler(
+        settings.db_path,
+        [
+            Job(
+                "poll_and_aggregate",
+                Every(int(args.reconcile_minutes)),
+                lambda job_conn, slot: poll_and_aggregate(job_conn, token, now=slot),
+            )
+        ],
+        settings.timezone,
+        workers=1,
+    )
+    threading.Thread(target=reconcile.run_forever, name="mentos-reconcile", daemon=True).start()
+
+    secret = args.secret or os.getenv("MENTOS_WEBHOOK_SECRET") or None
+    server = WebhookServer((args.host, int(args.port)), settings.db_path, path=args.path, secret=secret)
+    logger.info("Listening for Monzo webhooks on http://%s:%s%s", args.host, server.server_port, args.path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Webhook server stopping")
+    finally:
+        reconcile.stop()
+        server.server_close()
+
+
+def cmd_webhook_replay(args) -> None:
+    from .webhooks import mock_events, post_events
+
+    results = post_events(args.url, mock_events(args.mocks))
+    _print_table(
+        "Webhook replay",
+        ["Status", "Transaction", "Cells"],
+        [[str(r.get("status")), str(r.get("transaction_id", "")), str(r.get("cells", ""))] for r in results],
+    )
+
+
+def cmd_export(args) -> None:
+    import sys
+
+    from .exporter import DEFAULT_PAGE_SIZE, EXPORT_TABLES, export_table
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    names = args.tables or list(EXPORT_TABLES)
+    unknown = [name for name in names if name not in EXPORT_TABLES]
+    if unknown:
+        raise RuntimeError(f"Unknown export tables: {', '.join(unknown)} (choose from {', '.join(EXPORT_TABLES)})")
+    if args.output == "-" and len(names) != 1:
+        raise RuntimeError("Exporting to stdout takes exactly one table")
+    page_size = int(args.page_size) if args.page_size else DEFAULT_PAGE_SIZE
+
+    stats = []
+    for name in names:
+        if args.output == "-":
+            stats.append(export_table(conn, EXPORT_TABLES[name], sys.stdout, args.format, page_size))
+            continue
+        os.makedirs(args.output, exist_ok=True)
+        path = os.path.join(args.output, f"{name}.{args.format}")
+        with open(path, "w", encoding="utf-8", newline="") as out:
+            stats.append(export_table(conn, EXPORT_TABLES[name], out, args.format, page_size))
+    for entry in stats:
+        logger.info(
+            "Exported %s %s rows in %.2fs (%s rows/s)",
+            entry["rows"], entry["table"], entry["seconds"], entry["rows_per_second"],
+        )
+    if args.output != "-":
+        _print_table(
+            f"Export to {args.output}",
+            ["Table", "Rows", "Seconds", "Rows/s"],
+            [[e["table"], str(e["rows"]), f"{e['seconds']:.2f}", str(e["rows_per_second"])] for e in stats],
+        )
+
 
 def cmd_transactions(args) -> None:
     settings = load_settings()
@@ -339,9 +439,32 @@ def cmd_transactions(args) -> None:
         table_rows,
     )
 
+def _print_perf(conn, runs: int) -> None:
+    from .telemetry import perf_summary
+
+    rows = sorted(perf_summary(conn, runs), key=lambda r: (r["job"], r["unit"] != "ms", r["metric"] != "total", r["metric"]))
+    _print_table(
+        f"Job performance (last {runs} runs)",
+        ["Job", "Metric", "Runs", "p50", "p95"],
+        [
+            [
+                r["job"],
+                r["metric"],
+                str(r["runs"]),
+                f"{r['p50']:.0f}" + (" ms" if r["unit"] == "ms" else ""),
+                f"{r['p95']:.0f}" + (" ms" if r["unit"] == "ms" else ""),
+            ]
+            for r in rows
+        ],
+    )
+
+
 def cmd_status(args) -> None:
     settings = load_settings()
     conn = connect(settings.db_path)
+    if args.perf:
+        _print_perf(conn, int(args.runs))
+        return
     cur = conn.execute(
         "SELECT last_sync_at FROM monzo_connections WHERE id = ?",
         ("monzo_default",),
@@ -404,6 +527,10 @@ def cmd_pots(args) -> None:
 
 
 def cmd_breakthroughs(args) -> None:
+    from .chatgpt import ChatGPTClient
+    from .jobs import weekly_breakthrough_review
+    from .notifications import PushoverClient
+
     settings = load_settings()
     conn = connect(settings.db_path)
     notifier = (
@@ -424,8 +551,301 @@ def cmd_breakthroughs(args) -> None:
     logger.info("Breakthrough review complete")
 
 
+def cmd_scenarios(args) -> None:
+    from .scenario_batch import run_batch
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            summary = run_batch(
+                args.source,
+                out=out,
+                workers=int(args.workers),
+                stubs_dir=args.stubs,
+                cards_dir=args.cards_dir,
+                max_matches=int(args.max_matches),
+            )
+    else:
+        summary = run_batch(
+            args.source,
+            workers=int(args.workers),
+            stubs_dir=args.stubs,
+            cards_dir=args.cards_dir,
+            max_matches=int(args.max_matches),
+        )
+    if summary["error"]:
+        raise SystemExit(1)
+
+
+def _parse_bench_end(value: str) -> datetime:
+    end = datetime.fromisoformat(value)
+    return end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+
+
+def cmd_bench(args) -> None:
+    from .bench import DEFAULT_END, compare_results, run_benchmarks
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_benchmarks(
+        transactions=int(args.transactions),
+        users=int(args.users),
+        seed=int(args.seed),
+        repeat=int(args.repeat),
+        only=only,
+        end=_parse_bench_end(args.end) if args.end else DEFAULT_END,
+    )
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            out.write(payload + "\n")
+    else:
+        print(payload)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        _print_table(
+            "Benchmark comparison",
+            ["Benchmark", "Baseline (s)", "Current (s)", "Ratio"],
+            compare_results(baseline, results),
+        )
+
+
+def cmd_replay_capture(args) -> None:
+    from .replay import capture
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    result = capture(conn, args.output)
+    logger.info("Captured %s", result)
+
+
+def cmd_replay_run(args) -> None:
+    import tempfile
+
+    from .replay import replay, synthetic_source
+
+    settings = load_settings()
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.synthetic:
+            source = synthetic_source(workdir, int(args.synthetic), seed=int(args.seed))
+        elif args.source:
+            source = args.source
+        else:
+            raise SystemExit("Give a captured directory or --synthetic N")
+        results = replay(
+            source,
+            settings.timezone,
+            repeat=int(args.repeat),
+            latency_ms=float(args.latency_ms),
+        )
+    if args.synthetic:
+        results["source"] = f"synthetic:{args.synthetic}"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            out.write(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    _print_table(
+        f"Replay of {results['source']} ({results['repeat']} runs)",
+        ["Stage", "p50 ms", "p95 ms", "Rows", "Rows/s"],
+        [
+            [name, str(stage["p50_ms"]), str(stage["p95_ms"]), str(stage["rows"]), str(stage["rows_per_second"] or "-")]
+            for name, stage in results["stages"].items()
+        ],
+    )
+
+
+def cmd_synth(args) -> None:
+    from .synthetic import iter_users, to_fixture, write_monzo_dir
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    users = iter_users(
+        users=int(args.users),
+        transactions_per_user=int(args.transactions),
+        seed=int(args.seed),
+        end=now,
+    )
+    if args.format == "fixtures":
+        with open(args.output, "w", encoding="utf-8") as out:
+            for user in users:
+                out.write(json.dumps(to_fixture(user, now=now)) + "\n")
+    else:
+        for user in users:
+            target = args.output if int(args.users) == 1 else os.path.join(args.output, user.user_id)
+            write_monzo_dir(user, target)
+    logger.info("Wrote synthetic data to %s", args.output)
+
+
+def cmd_goals_replay(args) -> None:
+    from .goal_replay import replay_goals
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    first = date.fromisoformat(args.from_date)
+    last = date.fromisoformat(args.to_date) if args.to_date else datetime.now(settings.timezone).date() - timedelta(weeks=1)
+    plan = replay_goals(conn, first, last, dry_run=args.dry_run, rebaseline=args.rebaseline)
+    rows = plan.changed_progress if args.dry_run else []
+    if rows:
+        _print_table(
+            "Goal progress changes",
+            ["Week", "Goal", "Metric", "Score", "Change"],
+            [
+                [r["week_start"], r["goal_name"], f"{r['metric_value']:.2f}", str(r["score"]), r["change"]]
+                for r in rows
+            ],
+        )
+    events = [("breakthrough", e) for e in plan.breakthroughs] + [("drift", e) for e in plan.drift_events]
+    if events:
+        _print_table(
+            "Events" + (" (not written)" if args.dry_run else ""),
+            ["Triggered", "Kind", "Goal", "Message"],
+            [[e["triggered_at"], kind, e["goal_name"], e["message"]] for kind, e in sorted(events, key=lambda x: x[1]["triggered_at"])],
+        )
+    summary = plan.summary()
+    _print_table(
+        "Goal replay" + (" (dry run)" if args.dry_run else ""),
+        list(summary),
+        [[str(v) for v in summary.values()]],
+    )
+
+
+def cmd_goals_simulate(args) -> None:
+    from .rule_simulator import load_histories, parse_grid_values, run_grid
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    goals = [g for raw in args.goal or [] for g in raw.split(",") if g] or None
+    first = date.fromisoformat(args.from_date) if args.from_date else None
+    last = date.fromisoformat(args.to_date) if args.to_date else None
+    grid = {}
+    if args.improvement_target:
+        grid["improvement_target"] = parse_grid_values(args.improvement_target)
+    if args.green_weeks:
+        grid["trigger_green_weeks"] = parse_grid_values(args.green_weeks, int)
+    if args.green_ratio:
+        grid["green_threshold_ratio"] = parse_grid_values(args.green_ratio)
+
+    started = time.perf_counter()
+    histories = load_histories(conn, goals, first, last)
+    results = list(run_grid(histories, grid))
+    elapsed = time.perf_counter() - started
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+    results.sort(key=lambda r: (r["goal"], -r["breakthroughs"], r["improvement_target"]))
+    _print_table(
+        "Rule simulation",
+        ["Goal", "Target %", "Green weeks", "Green ratio", "Breakthroughs", "Drift", "Breakthrough weeks"],
+        [
+            [
+                r["goal"],
+                f"{r['improvement_target']:g}",
+                str(r["trigger_green_weeks"]),
+                f"{r['green_threshold_ratio']:g}",
+                str(r["breakthroughs"]),
+                str(r["drift_events"]),
+                ", ".join(r["breakthrough_weeks"]),
+            ]
+            for r in results[: args.limit]
+        ],
+    )
+    weeks = len(histories[0].weeks) if histories else 0
+    logger.info("Simulated %s settings over %s weeks in %.2fs", len(results), weeks, elapsed)
+
+
+def cmd_import(args) -> None:
+    from .aggregates import rebuild_daily
+    from .importer import DEFAULT_BATCH_SIZE, import_export
+
+    settings = load_settings()
+    conn = connect(settings.db_path)
+    stats = import_export(
+        conn,
+        args.path,
+        fmt=args.format,
+        account_id=args.account_id,
+        tz=settings.timezone,
+        batch_size=int(args.batch_size) if args.batch_size else DEFAULT_BATCH_SIZE,
+    )
+    if stats["inserted"] and stats["earliest"]:
+        earliest = datetime.fromisoformat(stats["earliest"].replace("Z", "+00:00"))
+        rebuild_daily(conn, days=(datetime.now(timezone.utc) - earliest).days + 1)
+    _print_table(
+        "Import",
+        ["Read", "Inserted", "Skipped", "Account", "Seconds", "Rows/s"],
+        [[str(stats[k]) for k in ("read", "inserted", "skipped", "account_id", "seconds", "rows_per_second")]],
+    )
+
+
+def cmd_trace_summary(args) -> None:
+    from .tracing import Tracer, folded, read_spans, summarize
+
+    tracer = Tracer.from_env() or Tracer()
+    if args.path:
+        tracer.path = Path(args.path)
+    files = tracer.files()
+    if not files:
+        raise SystemExit(f"No trace files at {tracer.path}")
+    rows = summarize(read_spans(files))
+    if args.folded:
+        print(folded(rows), end="")
+        return
+    roots_ms = sum(row["total_ms"] for row in rows if len(row["stack"]) == 1) or 1.0
+    rows = [row for row in rows if row["total_ms"] >= roots_ms * float(args.min_percent) / 100]
+    _print_table(
+        f"Spans from {len(files)} file(s)",
+        ["Span", "Count", "Total ms", "Self ms", "% of roots", "Errors"],
+        [
+            [
+                "  " * (len(row["stack"]) - 1) + row["stack"][-1],
+                str(row["count"]),
+                f"{row['total_ms']:.1f}",
+                f"{row['self_ms']:.1f}",
+                f"{row['total_ms'] / roots_ms * 100:.1f}",
+                str(row["errors"] or ""),
+            ]
+            for row in rows
+        ],
+    )
+
+
+def _tracer(args) -> "Tracer | None":
+    from .tracing import Tracer
+
+    tracer = Tracer.from_env()
+    if tracer is None and not args.trace:
+        return None
+    tracer = tracer or Tracer()
+    if args.trace_path:
+        tracer.path = Path(args.trace_path)
+    return tracer
+
+
+def _profiler(args) -> "Profiler | None":
+    from .profiling import Profiler
+
+    profiler = Profiler.from_env()
+    if profiler is None and not args.profile:
+        return None
+    profiler = profiler or Profiler()
+    if args.profile_dir:
+        profiler.directory = Path(args.profile_dir)
+    if args.profile_min_seconds is not None:
+        profiler.min_seconds = args.profile_min_seconds
+    return profiler
+
+
 def main() -> None:
+    from . import tracing
+
     parser = argparse.ArgumentParser(prog="mentos")
+    parser.add_argument("--profile", action="store_true", help="Write CPU and memory profiles (also MENTOS_PROFILE=1)")
+    parser.add_argument("--profile-dir", default=None, help="Where profiles go (default: ./profiles)")
+    parser.add_argument(
+        "--profile-min-seconds", type=float, default=None, help="Only keep profiles of runs at least this slow"
+    )
+    parser.add_argument("--trace", action="store_true", help="Write tracing spans as JSONL (also MENTOS_TRACE=1)")
+    parser.add_argument(
+        "--trace-path", default=None, help="Trace file, rotated by size (default: ./traces/mentos-trace.jsonl)"
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     db_parser = sub.add_parser("db", help="Database commands")
@@ -455,12 +875,23 @@ def main() -> None:
     token_set.set_defaults(func=cmd_token_set)
 
     sync = sub.add_parser("sync", help="Sync Monzo data")
+    sync.add_argument(
+        "--reconcile", action="store_true", help="Also re-check pending transactions by id"
+    )
+    sync.add_argument(
+        "--backfill", action="store_true", help="Fetch history back to --since in parallel slices"
+    )
+    sync.add_argument("--since", help="Backfill start date (YYYY-MM-DD)")
+    sync.add_argument("--slice-days", default="7", help="Days per backfill slice")
+    sync.add_argument("--workers", default="4", help="Backfill slices fetched concurrently")
+    sync.add_argument("--rate", default="4", help="Max Monzo requests per second during backfill")
     sync.set_defaults(func=cmd_sync)
 
     accounts = sub.add_parser("accounts", help="List Monzo accounts")
     accounts.set_defaults(func=cmd_accounts)
 
     run = sub.add_parser("run", help="Run loop")
+    run.add_argument("--workers", default="4", help="Jobs that may run concurrently")
     run.set_defaults(func=cmd_run)
 
     report = sub.add_parser("report", help="Run nightly report now")
@@ -474,6 +905,28 @@ def main() -> None:
     sweep = sub.add_parser("sweep", help="Run daily sweep now")
     sweep.set_defaults(func=cmd_sweep)
 
+    webhook_serve = sub.add_parser("webhook-serve", help="Receive Monzo transaction webhooks")
+    webhook_serve.add_argument("--host", default="127.0.0.1")
+    webhook_serve.add_argument("--port", default="8787")
+    webhook_serve.add_argument("--path", default="/webhooks/monzo")
+    webhook_serve.add_argument("--secret", default=None, help="Required ?token= value (or MENTOS_WEBHOOK_SECRET)")
+    webhook_serve.add_argument("--reconcile-minutes", default="60", help="Interval of the fallback reconciliation poll")
+    webhook_serve.set_defaults(func=cmd_webhook_serve)
+
+    webhook_replay = sub.add_parser("webhook-replay", help="POST mock transactions to a webhook receiver")
+    webhook_replay.add_argument("--url", default="http://127.0.0.1:8787/webhooks/monzo")
+    webhook_replay.add_argument("--mocks", default="scripts/mocks", help="Directory with monzo_*.json mocks")
+    webhook_replay.set_defaults(func=cmd_webhook_replay)
+
+    export = sub.add_parser("export", help="Stream tables to CSV or JSON Lines")
+    export.add_argument(
+        "tables", nargs="*", help="transactions, aggregates, goal_progress, insights (default: all)"
+    )
+    export.add_argument("--format", choices=["csv", "jsonl"], default="jsonl")
+    export.add_argument("--output", default="./export", help="Directory for <table>.<format>, or - for stdout")
+    export.add_argument("--page-size", default=None, help="Rows per keyset page (default: 1000)")
+    export.set_defaults(func=cmd_export)
+
     tx = sub.add_parser("transactions", help="List recent transactions")
     tx.add_argument("--limit", default="50")
     tx.add_argument("--days", default=None, help="Limit to last N days")
@@ -481,15 +934,123 @@ def main() -> None:
     tx.set_defaults(func=cmd_transactions)
 
     status = sub.add_parser("status", help="Show last sync, recent jobs, recent transactions")
+    status.add_argument("--perf", action="store_true", help="Show p50/p95 timings per job and phase")
+    status.add_argument("--runs", default="50", help="Recent runs per job to summarize with --perf")
     status.set_defaults(func=cmd_status)
 
     pots = sub.add_parser("pots", help="List pots")
     pots.set_defaults(func=cmd_pots)
 
+    scenarios = sub.add_parser(
+        "scenarios", help="Evaluate a fixture directory or JSONL corpus, one JSON line per scenario"
+    )
+    scenarios.add_argument("source", help="Fixture directory or .jsonl corpus")
+    scenarios.add_argument("--workers", default="1", help="Worker processes")
+    scenarios.add_argument("--stubs", default=None, help="Directory of <name>.response.json LLM stubs, or one stub file for every scenario")
+    scenarios.add_argument("--cards-dir", default="insights/cards")
+    scenarios.add_argument("--max-matches", default="3")
+    scenarios.add_argument("--output", default=None, help="Write JSON lines here instead of stdout")
+    scenarios.set_defaults(func=cmd_scenarios)
+
+    bench = sub.add_parser("bench", help="Run the benchmark suite on seeded synthetic data")
+    bench.add_argument("--transactions", default="10000", help="Transactions per synthetic user")
+    bench.add_argument("--users", default="1")
+    bench.add_argument("--seed", default="7")
+    bench.add_argument("--repeat", default="3", help="Repeats; best time is reported")
+    bench.add_argument("--only", default=None, help="Comma list of benchmarks (default: all)")
+    bench.add_argument("--end", default=None, help="Synthetic data end (ISO, UTC if naive)")
+    bench.add_argument("--output", default=None, help="Write results JSON here instead of stdout")
+    bench.add_argument("--compare", default=None, help="Previous results JSON to compare against")
+    bench.set_defaults(func=cmd_bench)
+
+    synth = sub.add_parser("synth", help="Generate seeded synthetic Monzo data")
+    synth.add_argument("output", help="JSONL file (fixtures) or directory (monzo)")
+    synth.add_argument("--users", default="1")
+    synth.add_argument("--transactions", default="1000", help="Transactions per user")
+    synth.add_argument("--seed", default="7")
+    synth.add_argument("--format", choices=["monzo", "fixtures"], default="monzo")
+    synth.set_defaults(func=cmd_synth)
+
+    replay = sub.add_parser("replay", help="Record and replay Monzo responses for ingestion benchmarks")
+    replay_sub = replay.add_subparsers(dest="replay_cmd", required=True)
+    replay_capture = replay_sub.add_parser("capture", help="Write captured raw_events as a Monzo directory")
+    replay_capture.add_argument("output", help="Directory to write")
+    replay_capture.set_defaults(func=cmd_replay_capture)
+    replay_run = replay_sub.add_parser("run", help="Time sync, aggregates and report over a capture")
+    replay_run.add_argument("source", nargs="?", help="Captured (or synth) Monzo directory")
+    replay_run.add_argument("--synthetic", default=None, help="Generate this many transactions instead")
+    replay_run.add_argument("--seed", default="7")
+    replay_run.add_argument("--repeat", default="3", help="Fresh-database runs; p50/p95 are reported")
+    replay_run.add_argument("--latency-ms", default="0", help="Simulated network latency per request")
+    replay_run.add_argument("--output", default=None, help="Also write results JSON here")
+    replay_run.set_defaults(func=cmd_replay_run)
+
+    trace = sub.add_parser("trace", help="Inspect tracing spans")
+    trace_sub = trace.add_subparsers(dest="trace_cmd", required=True)
+    trace_summary = trace_sub.add_parser("summary", help="Time per span stack, flame-graph style")
+    trace_summary.add_argument("--path", default=None, help="Trace file (rotated files next to it are included)")
+    trace_summary.add_argument("--folded", action="store_true", help="Print folded stacks for flamegraph.pl/speedscope")
+    trace_summary.add_argument("--min-percent", default="0", help="Hide stacks below this share of root time")
+    trace_summary.set_defaults(func=cmd_trace_summary)
+
+    goals = sub.add_parser("goals", help="Goal progress commands")
+    goals_sub = goals.add_subparsers(dest="goals_cmd", required=True)
+    goals_replay = goals_sub.add_parser("replay", help="Recompute goal progress and events for a range of weeks")
+    goals_replay.add_argument("--from", dest="from_date", required=True, help="First week (YYYY-MM-DD)")
+    goals_replay.add_argument("--to", dest="to_date", default=None, help="Last week (YYYY-MM-DD, default: last week)")
+    goals_replay.add_argument("--dry-run", action="store_true", help="Print what would change without writing")
+    goals_replay.add_argument("--rebaseline", action="store_true", help="Recompute baselines instead of keeping stored ones")
+    goals_replay.set_defaults(func=cmd_goals_replay)
+    goals_simulate = goals_sub.add_parser("simulate", help="Replay breakthrough rule settings over stored weekly metrics")
+    goals_simulate.add_argument("--goal", action="append", help="Goal name(s), repeatable or comma separated (default: all)")
+    goals_simulate.add_argument("--improvement-target", default=None, help="Values as a,b,c or start:stop:step")
+    goals_simulate.add_argument("--green-weeks", default=None, help="Values as a,b,c or start:stop:step")
+    goals_simulate.add_argument("--green-ratio", default=None, help="Values as a,b,c or start:stop:step")
+    goals_simulate.add_argument("--from", dest="from_date", default=None, help="First week (YYYY-MM-DD)")
+    goals_simulate.add_argument("--to", dest="to_date", default=None, help="Last week (YYYY-MM-DD)")
+    goals_simulate.add_argument("--limit", type=int, default=50, help="Rows to print")
+    goals_simulate.add_argument("--output", default=None, help="Write every result as JSONL")
+    goals_simulate.set_defaults(func=cmd_goals_simulate)
+
+    imp = sub.add_parser("import", help="Stream a Monzo CSV/JSON export into the database")
+    imp.add_argument("path", help="Monzo export (.csv, .json or .jsonl)")
+    imp.add_argument("--format", choices=["csv", "json", "jsonl"], default=None, help="Defaults to the file extension")
+    imp.add_argument("--account-id", default=None, help="Account to attach rows to (default: primary account)")
+    imp.add_argument("--batch-size", default=None, help="Rows per transaction (default: 5000)")
+    imp.set_defaults(func=cmd_import)
+
     args = parser.parse_args()
 
     setup_logging(load_settings().log_level)
-    args.func(args)
+    command = "-".join(
+        str(getattr(args, key)) for key in vars(args) if key == "cmd" or key.endswith("_cmd")
+    )
+    tracer = _tracer(args) if args.func is not cmd_trace_summary else None
+    # Like profiles, scheduler jobs each get their own trace; any other
+    # command is traced as a whole under its name.
+    tracing.install(tracer)
+    try:
+        with tracing.span(command) if args.func is not cmd_run else contextlib.nullcontext():
+            _run_profiled(args, command)
+    finally:
+        tracing.install(None)
+
+
+def _run_profiled(args, command: str) -> None:
+    from .profiling import install
+
+    profiler = _profiler(args)
+    if profiler is None:
+        args.func(args)
+        return
+    # Jobs are profiled per run under their own name and run key; a one-off
+    # command is profiled as a whole unless it is the scheduler loop itself.
+    install(profiler)
+    if args.func is cmd_run:
+        args.func(args)
+        return
+    with profiler.profile(command, datetime.now().strftime("%Y%m%dT%H%M%S")):
+        args.func(args)
 
 
 if __name__ == "__main__":
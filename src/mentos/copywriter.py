@@ -0,0 +1,107 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from .db import connect
+
+logger = logging.getLogger("mentos.copywriter")
+
+# Tables whose rows may have their copy upgraded in the background.
+_UPGRADABLE = {
+    "breakthroughs": ("message", "next_goal_suggestion"),
+    "goal_drift_events": ("message",),
+}
+# Finished upgrades kept for ``collect``; the copy is already written back,
+# so dropping the oldest unclaimed ones loses nothing.
+MAX_UNCOLLECTED = 256
+
+
+class CopyWriter:
+    """Generates personalized event copy on a small thread pool.
+
+    Events are stored with deterministic copy first; each submitted job asks
+    the LLM for better copy and writes it back on its own connection, since
+    SQLite connections cannot be shared across threads.
+    """
+
+    def __init__(self, db_path: str, workers: int = 2) -> None:
+        self.db_path = db_path
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mentos-copy")
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._finished: OrderedDict[str, Future] = OrderedDict()
+
+    def submit(self, table: str, event_id: str, generate: Callable[[], dict[str, str]]) -> Future:
+        if table not in _UPGRADABLE:
+            raise ValueError(f"copy for {table} cannot be upgraded")
+        # Carry the caller's context so LLM timings land on the job run.
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, self._run, table, event_id, generate)
+        with self._lock:
+            self._pending[event_id] = future
+        future.add_done_callback(lambda done: self._settle(event_id, done))
+        return future
+
+    def _settle(self, event_id: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(event_id) is not future:
+                return
+            del self._pending[event_id]
+            self._finished[event_id] = future
+            while len(self._finished) > MAX_UNCOLLECTED:
+                self._finished.popitem(last=False)
+
+    def _run(self, table: str, event_id: str, generate: Callable[[], dict[str, str]]) -> dict[str, str]:
+        started = time.perf_counter()
+        updates = {k: v for k, v in generate().items() if k in _UPGRADABLE[table]}
+        if updates:
+            conn = connect(self.db_path)
+            try:
+                assignments = ", ".join(f"{column} = ?" for column in updates)
+                conn.execute(
+                    f"UPDATE {table} SET {assignments} WHERE id = ?",
+                    (*updates.values(), event_id),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        logger.info(
+            "Copy for %s %s ready in %.1fs", table, event_id, time.perf_counter() - started
+        )
+        return updates
+
+    def collect(self, event_ids: list[str], deadline_seconds: float) -> dict[str, dict[str, str]]:
+        """Upgraded copy for the events that finish within ``deadline_seconds``.
+
+        Anything still running keeps going and is written back when done;
+        callers simply use the fallback copy they already have.
+        """
+        with self._lock:
+            futures = {}
+            for event_id in event_ids:
+                future = self._pending.get(event_id) or self._finished.get(event_id)
+                if future is not None:
+                    futures[future] = event_id
+        done, not_done = wait(futures, timeout=max(0.0, deadline_seconds))
+        if not_done:
+            logger.info("%s copy upgrades missed the %.0fs deadline", len(not_done), deadline_seconds)
+        with self._lock:
+            for future in done:
+                event_id = futures[future]
+                for entries in (self._pending, self._finished):
+                    if entries.get(event_id) is future:
+                        del entries[event_id]
+        upgrades: dict[str, dict[str, str]] = {}
+        for future in done:
+            try:
+                upgrades[futures[future]] = future.result()
+            except Exception as exc:
+                logger.warning("Copy generation failed: %s", exc)
+        return upgrades
+
+    def shutdown(self, wait_for_pending: bool = False) -> None:
+        self._pool.shutdown(wait=wait_for_pending)
@@ -2,14 +2,52 @@ import sqlite3
 from pathlib import Path
 from typing import Iterable
 
+from . import tracing
 
-def connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+MIGRATIONS_DIR = str(Path(__file__).resolve().parents[2] / "migrations")
+
+
+class Connection(sqlite3.Connection):
+    """A connection that remembers the path it was opened with."""
+
+    path: str = ""
+
+
+class TracedConnection(Connection):
+    """Traces each statement; only used while tracing is on, so untraced
+    connections pay nothing. Spans cover the call, not iterating the rows."""
+
+    def execute(self, sql, parameters=(), /):
+        with tracing.span("sql", statement=tracing.sql_statement(sql)):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, parameters, /):
+        with tracing.span("sql", statement=tracing.sql_statement(sql), many=True):
+            return super().executemany(sql, parameters)
+
+    def executescript(self, sql_script, /):
+        with tracing.span("sql", statement=tracing.sql_statement(sql_script)):
+            return super().executescript(sql_script)
+
+    def commit(self):
+        with tracing.span("sql.commit"):
+            return super().commit()
+
+
+def connect(db_path: str) -> Connection:
+    factory = TracedConnection if tracing.enabled() else Connection
+    conn = sqlite3.connect(db_path, factory=factory)
     conn.row_factory = sqlite3.Row
+    conn.path = str(db_path)
     return conn
 
 
-def apply_migrations(db_path: str, migrations_dir: str) -> None:
+def database_path(conn: sqlite3.Connection) -> str:
+    """File backing ``conn``'s main database; empty for in-memory databases."""
+    return conn.execute("PRAGMA database_list").fetchone()[2] or ""
+
+
+def apply_migrations(db_path: str, migrations_dir: str = MIGRATIONS_DIR) -> None:
     conn = connect(db_path)
     conn.execute(
         """
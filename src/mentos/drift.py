@@ -1,9 +1,11 @@
 import json
 import uuid
 from datetime import datetime
+from functools import partial
 from typing import Any
 
 from .chatgpt import ChatGPTClient
+from .copywriter import CopyWriter
 
 DRIFT_WINDOW_WEEKS = 4
 RED_WEEKS_THRESHOLD = 3
@@ -54,77 +56,131 @@ def _generate_drift_message(
         return content.strip() or fallback
 
 
+def evaluate_drift(rows: list, baseline: float) -> tuple[int, int] | None:
+    """``(off_track_weeks, red_weeks)`` if ``rows`` (newest first) signal drift.
+
+    Each row is ``(week_start, metric_value, score)``; fewer than
+    ``DRIFT_WINDOW_WEEKS`` rows never trigger.
+    """
+    if len(rows) < DRIFT_WINDOW_WEEKS:
+        return None
+    red_weeks = sum(1 for _, _, score in rows if score == 0)
+    off_track_weeks = sum(1 for _, _, score in rows if score <= 1)
+    consecutive_off_track = all(score <= 1 for _, _, score in rows)
+    average_spend = sum(float(metric_value or 0) for _, metric_value, _ in rows) / len(rows)
+    average_above_baseline = baseline > 0 and average_spend > baseline
+    triggered = (
+        red_weeks >= RED_WEEKS_THRESHOLD
+        or consecutive_off_track
+        or (average_above_baseline and off_track_weeks >= CONSECUTIVE_OFFTRACK_THRESHOLD)
+    )
+    return (off_track_weeks, red_weeks) if triggered else None
+
+
+_DRIFT_CANDIDATES_SQL = """
+WITH ranked AS (
+  SELECT
+    goal_id,
+    week_start,
+    metric_value,
+    score,
+    ROW_NUMBER() OVER (PARTITION BY goal_id ORDER BY week_start DESC) AS rn
+  FROM goal_progress
+),
+recent AS (
+  SELECT
+    goal_id,
+    MAX(week_start) AS latest_week,
+    COUNT(1) AS weeks,
+    SUM(score = 0) AS red_weeks,
+    SUM(score <= 1) AS off_track_weeks,
+    AVG(COALESCE(metric_value, 0)) AS average_spend
+  FROM ranked
+  WHERE rn <= :window
+  GROUP BY goal_id
+)
+SELECT g.id, g.name, r.off_track_weeks, r.red_weeks
+FROM goals g
+JOIN recent r ON r.goal_id = g.id
+WHERE r.weeks >= :window
+  AND (
+    r.red_weeks >= :red_threshold
+    OR r.off_track_weeks = r.weeks
+    OR (
+      COALESCE(g.baseline_value, 0) > 0
+      AND r.average_spend > g.baseline_value
+      AND r.off_track_weeks >= :offtrack_threshold
+    )
+  )
+  AND NOT EXISTS (
+    SELECT 1
+    FROM goal_drift_events e
+    WHERE e.goal_id = g.id
+      AND date(e.triggered_at) >= date(r.latest_week, :cooldown)
+  )
+ORDER BY g.created_at ASC
+"""
+
+
+def _upgraded_copy(chatgpt_client: ChatGPTClient, copy_args: tuple) -> dict[str, str]:
+    message = _generate_drift_message(chatgpt_client, *copy_args)
+    if message == _build_fallback_message(*copy_args[:2]):
+        return {}
+    return {"message": message}
+
+
 def detect_goal_drift_events(
     conn,
     chatgpt_client: ChatGPTClient | None = None,
+    copywriter: CopyWriter | None = None,
 ) -> list[dict[str, Any]]:
-    created: list[dict[str, Any]] = []
-    goals = conn.execute(
-        "SELECT id, name, baseline_value FROM goals ORDER BY created_at ASC"
+    """Record a drift event for every goal whose recent weeks signal drift.
+
+    Trigger conditions and the cooldown are evaluated for all goals in one
+    windowed query (the SQL form of ``evaluate_drift``); events are written
+    with a single ``executemany``. With a ``copywriter`` the personalized
+    copy is generated in the background after the fallback is stored.
+    """
+    background = bool(copywriter and chatgpt_client and chatgpt_client.is_configured())
+    candidates = conn.execute(
+        _DRIFT_CANDIDATES_SQL,
+        {
+            "window": DRIFT_WINDOW_WEEKS,
+            "red_threshold": RED_WEEKS_THRESHOLD,
+            "offtrack_threshold": CONSECUTIVE_OFFTRACK_THRESHOLD,
+            "cooldown": f"-{RECENT_EVENT_COOLDOWN_DAYS} day",
+        },
     ).fetchall()
 
-    for goal_id, goal_name, baseline in goals:
-        progress_rows = conn.execute(
-            """
-            SELECT week_start, metric_value, score
-            FROM goal_progress
-            WHERE goal_id = ?
-            ORDER BY week_start DESC
-            LIMIT ?
-            """,
-            (goal_id, DRIFT_WINDOW_WEEKS),
-        ).fetchall()
-        if len(progress_rows) < DRIFT_WINDOW_WEEKS:
-            continue
-
-        red_weeks = sum(1 for _, _, score in progress_rows if score == 0)
-        off_track_weeks = sum(1 for _, _, score in progress_rows if score <= 1)
-        consecutive_off_track = all(score <= 1 for _, _, score in progress_rows)
-
-        average_spend = sum(float(metric_value or 0) for _, metric_value, _ in progress_rows) / len(
-            progress_rows
+    created: list[dict[str, Any]] = []
+    upgrades: list[tuple[str, tuple]] = []
+    for goal_id, goal_name, off_track_weeks, red_weeks in candidates:
+        if background:
+            message = _build_fallback_message(goal_name, off_track_weeks)
+        else:
+            message = _generate_drift_message(chatgpt_client, goal_name, off_track_weeks, red_weeks)
+        created.append(
+            {
+                "id": str(uuid.uuid4()),
+                "goal_id": goal_id,
+                "triggered_at": datetime.utcnow().isoformat(),
+                "weeks_off_track": off_track_weeks,
+                "message": message,
+                "status": "pending",
+                "goal_name": goal_name,
+            }
         )
-        baseline_value = float(baseline or 0)
-        average_above_baseline = baseline_value > 0 and average_spend > baseline_value
+        if background:
+            upgrades.append((created[-1]["id"], (goal_name, off_track_weeks, red_weeks)))
 
-        triggered = (
-            red_weeks >= RED_WEEKS_THRESHOLD
-            or consecutive_off_track
-            or (average_above_baseline and off_track_weeks >= CONSECUTIVE_OFFTRACK_THRESHOLD)
+    conn.executemany(
+        """
+        INSERT INTO goal_drift_events (
+            id, goal_id, triggered_at, weeks_off_track, message, status
         )
-        if not triggered:
-            continue
-
-        latest_week = progress_rows[0][0]
-        existing = conn.execute(
-            """
-            SELECT 1
-            FROM goal_drift_events
-            WHERE goal_id = ?
-              AND date(triggered_at) >= date(?, ?)
-            """,
-            (goal_id, latest_week, f"-{RECENT_EVENT_COOLDOWN_DAYS} day"),
-        ).fetchone()
-        if existing:
-            continue
-
-        message = _generate_drift_message(chatgpt_client, goal_name, off_track_weeks, red_weeks)
-        event = {
-            "id": str(uuid.uuid4()),
-            "goal_id": goal_id,
-            "triggered_at": datetime.utcnow().isoformat(),
-            "weeks_off_track": off_track_weeks,
-            "message": message,
-            "status": "pending",
-            "goal_name": goal_name,
-        }
-        conn.execute(
-            """
-            INSERT INTO goal_drift_events (
-                id, goal_id, triggered_at, weeks_off_track, message, status
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
             (
                 event["id"],
                 event["goal_id"],
@@ -132,9 +188,11 @@ def detect_goal_drift_events(
                 event["weeks_off_track"],
                 event["message"],
                 event["status"],
-            ),
-        )
-        created.append(event)
-
+            )
+            for event in created
+        ],
+    )
     conn.commit()
+    for event_id, copy_args in upgrades:
+        copywriter.submit("goal_drift_events", event_id, partial(_upgraded_copy, chatgpt_client, copy_args))
     return created
@@ -0,0 +1,82 @@
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import IO, Iterator
+
+logger = logging.getLogger("mentos.exporter")
+
+DEFAULT_PAGE_SIZE = 1000
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    name: str
+    table: str
+    # Unique, NOT NULL and backed by an index, so each page is one index
+    # range seek after the previous page's last key.
+    key: tuple[str, ...]
+
+
+EXPORT_TABLES = {
+    "transactions": ExportTable("transactions", "transactions", ("created_at", "id")),
+    "aggregates": ExportTable("aggregates", "aggregates_daily", ("day", "category", "id")),
+    "goal_progress": ExportTable("goal_progress", "goal_progress", ("goal_id", "week_start")),
+    "insights": ExportTable("insights", "insights", ("created_at", "id")),
+}
+
+
+def iter_pages(conn, spec: ExportTable, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[list]:
+    """Rows of ``spec.table`` in key order, ``page_size`` at a time.
+
+    Keyset pagination: every page starts strictly after the last key of the
+    previous one, so the cost per page stays flat however deep the export
+    gets and at most one page is held in memory.
+    """
+    key = ", ".join(spec.key)
+    first = f"SELECT * FROM {spec.table} ORDER BY {key} LIMIT ?"
+    after = (
+        f"SELECT * FROM {spec.table} WHERE ({key}) > ({', '.join('?' for _ in spec.key)}) "
+        f"ORDER BY {key} LIMIT ?"
+    )
+    last = None
+    while True:
+        if last is None:
+            rows = conn.execute(first, (page_size,)).fetchall()
+        else:
+            rows = conn.execute(after, (*last, page_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = tuple(rows[-1][column] for column in spec.key)
+
+
+def export_table(
+    conn, spec: ExportTable, out: IO[str], fmt: str = "jsonl", page_size: int = DEFAULT_PAGE_SIZE
+) -> dict:
+    """Stream one table to ``out``; returns row count and throughput."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
+    started = time.perf_counter()
+    rows_written = 0
+    writer = None
+    for page in iter_pages(conn, spec, page_size):
+        if fmt == "csv":
+            if writer is None:
+                writer = csv.writer(out)
+                writer.writerow(page[0].keys())
+            writer.writerows(tuple(row) for row in page)
+        else:
+            out.writelines(json.dumps(dict(row), default=str) + "\n" for row in page)
+        rows_written += len(page)
+    seconds = time.perf_counter() - started
+    return {
+        "table": spec.name,
+        "rows": rows_written,
+        "seconds": round(seconds, 3),
+        "rows_per_second": int(rows_written / seconds) if seconds > 0 else 0,
+    }
@@ -0,0 +1,266 @@
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from .breakthroughs import (
+    V1_RULES,
+    _metric_mode,
+    evaluate_breakthrough,
+    metric_value,
+    rolling_baseline,
+    score_week,
+    seed_v1_goals,
+)
+from .breakthroughs import (
+    _build_fallback_message as _breakthrough_message,
+)
+from .drift import (
+    DRIFT_WINDOW_WEEKS,
+    RECENT_EVENT_COOLDOWN_DAYS,
+    evaluate_drift,
+)
+from .drift import (
+    _build_fallback_message as _drift_message,
+)
+from .weekly_metrics import load_weekly_metrics, week_start
+
+logger = logging.getLogger("mentos.goal_replay")
+
+# The live weekly review runs on Monday at 09:05; replayed events are stamped
+# as if it had run then, so breakthrough and drift cooldowns behave the same.
+REVIEW_TIME = time(9, 5)
+BASELINE_WEEKS = 6
+
+
+@dataclass
+class ReplayPlan:
+    first_week: date
+    last_week: date
+    progress: list[dict] = field(default_factory=list)
+    baselines: dict[str, tuple[float, float]] = field(default_factory=dict)
+    breakthroughs: list[dict] = field(default_factory=list)
+    drift_events: list[dict] = field(default_factory=list)
+
+    @property
+    def changed_progress(self) -> list[dict]:
+        return [row for row in self.progress if row["change"] != "same"]
+
+    def summary(self) -> dict:
+        return {
+            "weeks": len({row["week_start"] for row in self.progress}),
+            "progress_new": sum(1 for row in self.progress if row["change"] == "new"),
+            "progress_changed": sum(1 for row in self.progress if row["change"] == "changed"),
+            "baselines_changed": sum(1 for old, new in self.baselines.values() if old != new),
+            "breakthroughs": len(self.breakthroughs),
+            "drift_events": len(self.drift_events),
+        }
+
+
+def _event_dates(conn, table: str, goal_ids: list[str], since: date) -> dict[str, list[date]]:
+    dates: dict[str, list[date]] = {goal_id: [] for goal_id in goal_ids}
+    cur = conn.execute(
+        f"SELECT goal_id, date(triggered_at) FROM {table} WHERE date(triggered_at) >= ?",
+        (since.isoformat(),),
+    )
+    for goal_id, day in cur.fetchall():
+        if goal_id in dates:
+            dates[goal_id].append(date.fromisoformat(day))
+    return dates
+
+
+def plan_replay(conn, first: date, last: date, *, rebaseline: bool = False) -> ReplayPlan:
+    """Recompute goal progress, baselines and events for every week in a range.
+
+    Reads the materialized weekly metrics and existing progress once, then
+    evaluates every goal-week in memory with the same scoring, breakthrough
+    and drift rules the weekly review uses. Events already recorded are kept
+    and still count towards cooldowns. Nothing is written.
+    """
+    first_week, last_week = week_start(first), week_start(last)
+    plan = ReplayPlan(first_week, last_week)
+    weeks = []
+    ws = first_week
+    while ws <= last_week:
+        weeks.append(ws)
+        ws += timedelta(weeks=1)
+    if not weeks:
+        return plan
+
+    goals = conn.execute(
+        "SELECT id, name, baseline_value FROM goals ORDER BY created_at ASC"
+    ).fetchall()
+    goal_ids = [goal_id for goal_id, _, _ in goals]
+    weekly = load_weekly_metrics(
+        conn, first_week - timedelta(weeks=BASELINE_WEEKS), last_week + timedelta(weeks=1)
+    )
+
+    lookback = max([DRIFT_WINDOW_WEEKS, *(r.trigger_window_weeks for r in V1_RULES.values())])
+    history: dict[str, dict[date, tuple[float, int]]] = {goal_id: {} for goal_id in goal_ids}
+    cur = conn.execute(
+        """
+        SELECT goal_id, week_start, metric_value, score FROM goal_progress
+        WHERE week_start >= ? AND week_start <= ?
+        """,
+        ((first_week - timedelta(weeks=lookback)).isoformat(), last_week.isoformat()),
+    )
+    for goal_id, ws_raw, value, score in cur.fetchall():
+        if goal_id in history:
+            history[goal_id][date.fromisoformat(ws_raw)] = (float(value), int(score))
+
+    since = first_week - timedelta(days=RECENT_EVENT_COOLDOWN_DAYS)
+    breakthrough_dates = _event_dates(conn, "breakthroughs", goal_ids, since)
+    drift_dates = _event_dates(conn, "goal_drift_events", goal_ids, since)
+
+    for goal_id, name, stored_baseline in goals:
+        mode = _metric_mode(name)
+        if not mode:
+            continue
+        rule = V1_RULES.get(name)
+        old_baseline = float(stored_baseline or 0)
+        baseline = 0.0 if rebaseline else old_baseline
+        past = history[goal_id]
+        for ws in weeks:
+            review_week = ws + timedelta(weeks=1)
+            if not baseline:
+                baseline = rolling_baseline(weekly, mode, review_week, BASELINE_WEEKS)
+            value = metric_value(weekly[ws], mode)
+            score = score_week(value, baseline, name, rule.green_threshold_ratio)
+            previous = past.get(ws)
+            change = "new" if previous is None else "same" if previous == (value, score) else "changed"
+            past[ws] = (value, score)
+            plan.progress.append(
+                {
+                    "goal_id": goal_id,
+                    "goal_name": name,
+                    "week_start": ws.isoformat(),
+                    "metric_value": value,
+                    "score": score,
+                    "change": change,
+                }
+            )
+
+            rows = [(w.isoformat(), *past[w]) for w in sorted((w for w in past if w <= ws), reverse=True)]
+            triggered_at = datetime.combine(review_week, REVIEW_TIME)
+            if rule:
+                improvement = evaluate_breakthrough(
+                    rule, name, baseline, rows[: rule.trigger_window_weeks]
+                )
+                recent = any(d >= ws - timedelta(days=6) for d in breakthrough_dates[goal_id])
+                if improvement is not None and not recent:
+                    message, next_goal = _breakthrough_message(
+                        name, baseline, value, rule.sustained_weeks
+                    )
+                    plan.breakthroughs.append(
+                        {
+                            "id": str(uuid.uuid4()),
+                            "goal_id": goal_id,
+                            "goal_name": name,
+                            "triggered_at": triggered_at.isoformat(),
+                            "improvement_percent": improvement,
+                            "duration_weeks": rule.sustained_weeks,
+                            "message": message,
+                            "next_goal_suggestion": next_goal,
+                        }
+                    )
+                    breakthrough_dates[goal_id].append(triggered_at.date())
+
+            drift = evaluate_drift(rows[:DRIFT_WINDOW_WEEKS], baseline)
+            cooling = any(
+                d >= ws - timedelta(days=RECENT_EVENT_COOLDOWN_DAYS) for d in drift_dates[goal_id]
+            )
+            if drift is not None and not cooling:
+                off_track_weeks, _ = drift
+                plan.drift_events.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "goal_id": goal_id,
+                        "goal_name": name,
+                        "triggered_at": triggered_at.isoformat(),
+                        "weeks_off_track": off_track_weeks,
+                        "message": _drift_message(name, off_track_weeks),
+                        "status": "pending",
+                    }
+                )
+                drift_dates[goal_id].append(triggered_at.date())
+        plan.baselines[goal_id] = (old_baseline, baseline)
+    return plan
+
+
+def apply_replay(conn, plan: ReplayPlan) -> None:
+    """Write a plan with one bulk statement per table and a single commit."""
+    conn.executemany(
+        """
+        INSERT INTO goal_progress (id, goal_id, week_start, metric_value, score)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(goal_id, week_start) DO UPDATE
+        SET metric_value = excluded.metric_value,
+            score = excluded.score
+        """,
+        [
+            (str(uuid.uuid4()), row["goal_id"], row["week_start"], row["metric_value"], row["score"])
+            for row in plan.changed_progress
+        ],
+    )
+    conn.executemany(
+        "UPDATE goals SET baseline_value = ? WHERE id = ?",
+        [(new, goal_id) for goal_id, (old, new) in plan.baselines.items() if old != new],
+    )
+    conn.executemany(
+        """
+        INSERT INTO breakthroughs (
+            id, goal_id, triggered_at, improvement_percent,
+            duration_weeks, message, next_goal_suggestion
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                b["id"],
+                b["goal_id"],
+                b["triggered_at"],
+                b["improvement_percent"],
+                b["duration_weeks"],
+                b["message"],
+                b["next_goal_suggestion"],
+            )
+            for b in plan.breakthroughs
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO goal_drift_events (
+            id, goal_id, triggered_at, weeks_off_track, message, status
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (e["id"], e["goal_id"], e["triggered_at"], e["weeks_off_track"], e["message"], e["status"])
+            for e in plan.drift_events
+        ],
+    )
+    conn.commit()
+
+
+def replay_goals(
+    conn, first: date, last: date, *, dry_run: bool = False, rebaseline: bool = False
+) -> ReplayPlan:
+    if dry_run:
+        # A dry run writes nothing, so goals not seeded yet are left out.
+        seeded = {row[0] for row in conn.execute("SELECT name FROM goals")}
+        missing = sorted(set(V1_RULES) - seeded)
+        if missing:
+            logger.warning("Dry run: goals not seeded yet, skipped: %s", ", ".join(missing))
+    else:
+        seed_v1_goals(conn)
+    plan = plan_replay(conn, first, last, rebaseline=rebaseline)
+    if not dry_run:
+        apply_replay(conn, plan)
+    logger.info(
+        "Goal replay %s..%s%s: %s",
+        plan.first_week,
+        plan.last_week,
+        " (dry run)" if dry_run else "",
+        plan.summary(),
+    )
+    return plan
@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+
+@dataclass(frozen=True)
+class MetricTerm:
+    """A weekly sum over settled transactions, stored in ``weekly_metrics`` as ``name``.
+
+    ``direction`` picks outgoing spend (as a positive amount) or incoming
+    money. ``categories`` and the UTC ``from_hour``/``to_hour`` window narrow
+    the rows; a window with ``from_hour > to_hour`` wraps past midnight.
+    """
+
+    name: str
+    direction: str = "out"
+    categories: tuple[str, ...] = ()
+    from_hour: int | None = None
+    to_hour: int | None = None
+
+
+@dataclass(frozen=True)
+class GoalMetric:
+    """``(numerator - minus) / denominator`` over one week's terms."""
+
+    name: str
+    numerator: MetricTerm
+    minus: MetricTerm | None = None
+    denominator: MetricTerm | None = None
+
+    @property
+    def terms(self) -> tuple[MetricTerm, ...]:
+        return tuple(t for t in (self.numerator, self.minus, self.denominator) if t is not None)
+
+    def evaluate(self, components: dict[str, float]) -> float:
+        value = components[self.numerator.name]
+        if self.minus is not None:
+            value -= components[self.minus.name]
+        if self.denominator is not None:
+            total = components[self.denominator.name]
+            if not total:
+                return 0.0
+            return value / total
+        return value
+
+
+@dataclass(frozen=True)
+class BreakthroughRule:
+    goal_type: str
+    improvement_target: float
+    sustained_weeks: int
+    green_threshold_ratio: float
+    trigger_green_weeks: int
+    trigger_window_weeks: int
+    description: str
+    metric: GoalMetric | None = None
+
+
+SPEND = MetricTerm("spend")
+INCOME = MetricTerm("income", direction="in")
+
+V1_RULES: dict[str, BreakthroughRule] = {
+    "reduce_food_delivery": BreakthroughRule(
+        goal_type="spending",
+        improvement_target=25.0,
+        sustained_weeks=3,
+        green_threshold_ratio=0.75,
+        trigger_green_weeks=3,
+        trigger_window_weeks=3,
+        description="Reduce food delivery spend by 25% for 3 weeks.",
+        metric=GoalMetric("delivery", MetricTerm("delivery", categories=("eating_out",))),
+    ),
+    "save_more_money": BreakthroughRule(
+        goal_type="saving",
+        improvement_target=0.0,
+        sustained_weeks=8,
+        green_threshold_ratio=1.0,
+        trigger_green_weeks=2,
+        trigger_window_weeks=2,
+        description="End-of-month surplus for 2 months.",
+        metric=GoalMetric("savings_surplus", INCOME, minus=SPEND),
+    ),
+    "healthy_spending": BreakthroughRule(
+        goal_type="behavioural",
+        improvement_target=10.0,
+        sustained_weeks=6,
+        green_threshold_ratio=0.85,
+        trigger_green_weeks=4,
+        trigger_window_weeks=6,
+        description="Hit 4 green weeks out of 6.",
+        metric=GoalMetric(
+            "healthy_spending", MetricTerm("groceries", categories=("groceries",)), denominator=SPEND
+        ),
+    ),
+    "reduce_nightlife": BreakthroughRule(
+        goal_type="spending",
+        improvement_target=30.0,
+        sustained_weeks=4,
+        green_threshold_ratio=0.70,
+        trigger_green_weeks=4,
+        trigger_window_weeks=4,
+        description="Reduce late-night spend by 30% for 4 weeks.",
+        metric=GoalMetric("nightlife", MetricTerm("nightlife", from_hour=22, to_hour=24)),
+    ),
+}
+
+METRICS: dict[str, GoalMetric] = {
+    rule.metric.name: rule.metric for rule in V1_RULES.values() if rule.metric is not None
+}
+
+
+def metric_terms(metrics: Iterable[GoalMetric]) -> tuple[MetricTerm, ...]:
+    """Distinct terms across ``metrics`` in first-seen order."""
+    terms: dict[str, MetricTerm] = {}
+    for metric in metrics:
+        for term in metric.terms:
+            existing = terms.setdefault(term.name, term)
+            if existing != term:
+                raise ValueError(f"metric term {term.name!r} is defined twice differently")
+    return tuple(terms.values())
+
+
+def compile_term(term: MetricTerm) -> tuple[str, list[Any]]:
+    """SQL ``SUM`` expression (and its parameters) for one term."""
+    if term.direction == "in":
+        conditions, value = ["amount > 0"], "amount"
+    elif term.direction == "out":
+        conditions, value = ["amount < 0"], "-amount"
+    else:
+        raise ValueError(f"unknown direction for {term.name!r}: {term.direction}")
+    params: list[Any] = []
+    if term.categories:
+        conditions.append(f"category IN ({', '.join('?' for _ in term.categories)})")
+        params.extend(term.categories)
+    if term.from_hour is not None or term.to_hour is not None:
+        hour = "CAST(strftime('%H', created_at) AS INTEGER)"
+        start = term.from_hour if term.from_hour is not None else 0
+        end = term.to_hour if term.to_hour is not None else 24
+        joiner = "AND" if start <= end else "OR"
+        conditions.append(f"({hour} >= ? {joiner} {hour} < ?)")
+        params.extend([start, end])
+    return f"SUM(CASE WHEN {' AND '.join(conditions)} THEN {value} ELSE 0 END)", params
+
+
+def compile_terms(terms: Iterable[MetricTerm]) -> tuple[str, list[Any]]:
+    """Comma-joined aggregate columns for ``terms``, for one combined SELECT."""
+    columns: list[str] = []
+    params: list[Any] = []
+    for term in terms:
+        sql, term_params = compile_term(term)
+        columns.append(sql)
+        params.extend(term_params)
+    return ",\n          ".join(columns), params
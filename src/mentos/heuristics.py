@@ -101,18 +101,21 @@ def recurring_merchants(conn, months: int = 6) -> list[str]:
     filter_clause, filter_params = build_spend_filter_clause(conn)
     cur = conn.execute(
         f"""
-        SELECT merchant_name, date(created_at) as day
-        FROM transactions
-        WHERE created_at >= ? AND amount < 0 AND is_pending = 0 AND merchant_name IS NOT NULL{filter_clause}
+        SELECT m.name
+        FROM (
+          SELECT merchant_id, COUNT(DISTINCT substr(created_at, 1, 7)) AS months
+          FROM transactions
+          WHERE created_at >= ? AND amount < 0 AND is_pending = 0 AND merchant_id IS NOT NULL{filter_clause}
+          GROUP BY merchant_id
+        ) AS r
+        JOIN merchants m ON m.id = r.merchant_id
+        WHERE r.months >= 3
+        ORDER BY m.name
+        LIMIT 10
         """,
         (since, *filter_params),
     )
-    by_merchant = defaultdict(set)
-    for merchant_name, day in cur.fetchall():
-        month = day[:7]
-        by_merchant[merchant_name].add(month)
-    recurring = [m for m, months_set in by_merchant.items() if len(months_set) >= 3]
-    return sorted(recurring)[:10]
+    return [row[0] for row in cur.fetchall()]
 
 
 def detect_salary(conn, months: int = 6) -> list[dict]:
@@ -0,0 +1,205 @@
+import csv
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import IO, Iterator
+from zoneinfo import ZoneInfo
+
+from .ingest import upsert_transactions
+from .storage import ensure_user, get_rule
+
+logger = logging.getLogger("mentos.importer")
+
+DEFAULT_BATCH_SIZE = 5000
+IMPORT_ACCOUNT_ID = "monzo_export"
+_READ_CHUNK = 1 << 16
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _category_key(label: str) -> str | None:
+    label = (label or "").strip()
+    if not label:
+        return None
+    return "_".join(label.lower().replace("&", "and").split())
+
+
+def _pence(raw: str) -> int:
+    try:
+        return int((Decimal(raw.strip().replace(",", "")) * 100).to_integral_value())
+    except (InvalidOperation, AttributeError) as exc:
+        raise ImportFormatError(f"invalid amount: {raw!r}") from exc
+
+
+def csv_row_to_transaction(row: dict, tz: ZoneInfo) -> dict:
+    """Map one row of the Monzo app's CSV export onto the API transaction shape.
+
+    Export dates are local wall-clock times; they are converted to UTC so
+    imported rows sort and window exactly like API-synced ones.
+    """
+    tx_id = (row.get("Transaction ID") or "").strip()
+    if not tx_id:
+        raise ImportFormatError("missing Transaction ID")
+    local = datetime.strptime(
+        f"{row['Date'].strip()} {(row.get('Time') or '00:00:00').strip()}", "%d/%m/%Y %H:%M:%S"
+    ).replace(tzinfo=tz)
+    created = local.astimezone(timezone.utc).isoformat()
+    name = (row.get("Name") or "").strip()
+    tx_type = (row.get("Type") or "").strip().lower()
+    merchant = {"name": name} if name and tx_type in ("card payment", "contactless") else None
+    return {
+        "id": tx_id,
+        "created": created,
+        "settled": created,
+        "amount": _pence(row.get("Amount") or "0"),
+        "currency": (row.get("Currency") or "GBP").strip() or "GBP",
+        "description": (row.get("Description") or "").strip() or name,
+        "merchant": merchant,
+        "category": _category_key(row.get("Category") or ""),
+        "is_load": False,
+        "notes": (row.get("Notes and #tags") or "").strip(),
+        "import_source": "monzo_csv",
+    }
+
+
+def _iter_csv(handle: IO[str], tz: ZoneInfo) -> Iterator[dict]:
+    for row in csv.DictReader(handle):
+        yield csv_row_to_transaction(row, tz)
+
+
+def _iter_json_array(handle: IO[str]) -> Iterator[dict]:
+    """Yield the objects of the first JSON array in ``handle`` one at a time.
+
+    Accepts either a bare array or Monzo's ``{"transactions": [...]}``
+    envelope. Only one read chunk plus the object being decoded is held in
+    memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        if not started:
+            start = buffer.find("[", pos)
+            if start >= 0:
+                pos = start + 1
+                started = True
+                continue
+        else:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise ImportFormatError("truncated JSON export")
+                else:
+                    pos = end
+                    yield item
+                    continue
+        if eof:
+            if not started:
+                raise ImportFormatError("no transaction array found")
+            raise ImportFormatError("unterminated transaction array")
+        chunk = handle.read(_READ_CHUNK)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _iter_jsonl(handle: IO[str]) -> Iterator[dict]:
+    for line in handle:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_export(path: str, fmt: str | None = None, tz: ZoneInfo | None = None) -> Iterator[dict]:
+    fmt = fmt or Path(path).suffix.lstrip(".").lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+        if fmt == "csv":
+            yield from _iter_csv(handle, tz or ZoneInfo("Europe/London"))
+        elif fmt == "json":
+            yield from _iter_json_array(handle)
+        elif fmt == "jsonl":
+            yield from _iter_jsonl(handle)
+        else:
+            raise ImportFormatError(f"unsupported export format: {fmt or path}")
+
+
+def _resolve_account_id(conn, account_id: str | None) -> str:
+    if account_id:
+        return account_id
+    primary = get_rule(conn, "primary_account_id")
+    if primary:
+        return str(primary)
+    row = conn.execute("SELECT id FROM accounts ORDER BY created_at LIMIT 1").fetchone()
+    return row[0] if row else IMPORT_ACCOUNT_ID
+
+
+def import_export(
+    conn,
+    path: str,
+    *,
+    fmt: str | None = None,
+    account_id: str | None = None,
+    tz: ZoneInfo | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """Stream a Monzo export into ``transactions`` in bounded batches.
+
+    Existing rows win over imported ones, so re-running an import is a no-op
+    and never clobbers richer API payloads.
+    """
+    user_id = ensure_user(conn)
+    account_id = _resolve_account_id(conn, account_id)
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO accounts (id, user_id, name, type, currency, created_at, raw_json)
+        VALUES (?, ?, ?, ?, ?, datetime('now'), NULL)
+        """,
+        (account_id, user_id, "Imported history", "import", "GBP"),
+    )
+
+    started = time.perf_counter()
+    read = 0
+    written = 0
+    earliest: str | None = None
+    batch: list[dict] = []
+
+    def _flush() -> None:
+        nonlocal written
+        written += upsert_transactions(conn, user_id, account_id, batch, replace=False)
+        conn.commit()
+        batch.clear()
+
+    for tx in iter_export(path, fmt, tz):
+        read += 1
+        created = tx.get("created")
+        if created and (earliest is None or created < earliest):
+            earliest = created
+        batch.append(tx)
+        if len(batch) >= batch_size:
+            _flush()
+    _flush()
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "read": read,
+        "inserted": written,
+        "skipped": read - written,
+        "account_id": account_id,
+        "earliest": earliest,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(read / elapsed) if elapsed else read,
+    }
+    logger.info("Imported %s: %s", path, json.dumps(stats))
+    return stats
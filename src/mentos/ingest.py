@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, timezone
+from typing import Iterable
+
+from . import telemetry
+from .merchants import MerchantResolver
+from .weekly_metrics import refresh_weekly_metrics, week_of
+
+TRANSACTION_COLUMNS = (
+    "id",
+    "user_id",
+    "account_id",
+    "amount",
+    "currency",
+    "description",
+    "merchant_name",
+    "merchant_id",
+    "category",
+    "is_load",
+    "is_pending",
+    "created_at",
+    "settled_at",
+    "raw_json",
+)
+
+_PLACEHOLDERS = ", ".join("?" for _ in TRANSACTION_COLUMNS)
+_COLUMN_LIST = ", ".join(TRANSACTION_COLUMNS)
+_CREATED_AT = TRANSACTION_COLUMNS.index("created_at")
+
+
+def _parse_iso(ts: str) -> str:
+    return ts.replace("Z", "+00:00")
+
+
+def transaction_row(
+    tx: dict, user_id: str, account_id: str, merchants: MerchantResolver | None = None
+) -> tuple:
+    """Normalize one Monzo transaction payload into a ``transactions`` row."""
+    merchant_name = None
+    merchant = tx.get("merchant")
+    if isinstance(merchant, dict):
+        merchant_name = merchant.get("name")
+    return (
+        tx.get("id"),
+        user_id,
+        account_id,
+        tx.get("amount", 0),
+        tx.get("currency"),
+        tx.get("description"),
+        merchant_name,
+        merchants.resolve(merchant) if merchants else None,
+        tx.get("category"),
+        1 if tx.get("is_load") else 0,
+        1 if tx.get("settled") is None and tx.get("created") else 0,
+        _parse_iso(tx.get("created", datetime.now(timezone.utc).isoformat())),
+        _parse_iso(tx.get("settled")) if tx.get("settled") else None,
+        json.dumps(tx),
+    )
+
+
+def upsert_transactions(
+    conn,
+    user_id: str,
+    account_id: str,
+    transactions: Iterable[dict],
+    replace: bool = True,
+) -> int:
+    """Write a batch of Monzo transactions with one ``executemany``.
+
+    ``replace=False`` keeps rows that already exist, so history imports never
+    overwrite data synced from the API. ``weekly_metrics`` is refreshed for
+    every week the batch touched. Returns the number of rows written; the
+    caller owns the commit.
+    """
+    merchants = MerchantResolver(conn)
+    rows = [transaction_row(tx, user_id, account_id, merchants) for tx in transactions]
+    if not rows:
+        return 0
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    cur = conn.executemany(
+        f"{verb} INTO transactions ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS})",
+        rows,
+    )
+    written = cur.rowcount
+    telemetry.count("rows_written", written)
+    if written:
+        refresh_weekly_metrics(conn, user_id, {week_of(row[_CREATED_AT]) for row in rows})
+    return written
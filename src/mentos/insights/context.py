@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from datetime import UTC, datetime, timedelta
+from datetime import datetime, timedelta
 from statistics import mean
+from typing import Sequence
 from zoneinfo import ZoneInfo
 
+from .records import TxRecord, _to_dt, to_records
+
 SMALL_PURCHASE_LIMIT_GBP = 10.0
 
 SPEND_CONTEXT_EVIDENCE_KEYS = {
@@ -29,86 +32,55 @@ SPEND_CONTEXT_EVIDENCE_KEYS = {
 }
 
 
-def _to_dt(raw: str, timezone: ZoneInfo) -> datetime:
-    dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=UTC)
-    return dt.astimezone(timezone)
-
-
-def _merchant_name(tx: dict) -> str:
-    merchant = tx.get("merchant") or {}
-    name = merchant.get("name") or tx.get("description") or "unknown"
-    return str(name)
-
-
-def _spend_gbp(tx: dict) -> float:
-    amount = int(tx.get("amount", 0))
-    if amount >= 0:
-        return 0.0
-    return abs(amount) / 100
-
-
-def _window_transactions(transactions: list[dict], now: datetime, days: int, timezone: ZoneInfo) -> list[dict]:
+def _window_transactions(records: list[TxRecord], now: datetime, days: int) -> list[TxRecord]:
     start = now - timedelta(days=days)
-    return [tx for tx in transactions if start <= _to_dt(tx["created"], timezone) <= now]
+    return [tx for tx in records if start <= tx.created <= now]
 
 
-def _category_totals(transactions: list[dict]) -> dict[str, float]:
+def _category_totals(records: list[TxRecord]) -> dict[str, float]:
     totals: dict[str, float] = defaultdict(float)
-    for tx in transactions:
-        totals[str(tx.get("category") or "uncategorised")] += _spend_gbp(tx)
+    for tx in records:
+        totals[tx.category] += tx.spend_gbp
     return {k: round(v, 2) for k, v in sorted(totals.items()) if v > 0}
 
 
-def _merchant_spend(transactions: list[dict]) -> dict[str, float]:
+def _merchant_spend(records: list[TxRecord]) -> dict[str, float]:
     totals: dict[str, float] = defaultdict(float)
-    for tx in transactions:
-        totals[_merchant_name(tx)] += _spend_gbp(tx)
+    for tx in records:
+        totals[tx.merchant] += tx.spend_gbp
     return {k: round(v, 2) for k, v in totals.items() if v > 0}
 
 
-def _merchant_frequency(transactions: list[dict]) -> dict[str, int]:
-    counter: Counter[str] = Counter()
-    for tx in transactions:
-        if int(tx.get("amount", 0)) < 0:
-            counter[_merchant_name(tx)] += 1
-    return dict(counter)
+def _merchant_frequency(records: list[TxRecord]) -> dict[str, int]:
+    return dict(Counter(tx.merchant for tx in records if tx.amount < 0))
 
 
-def _top_by_spend(transactions: list[dict], limit: int = 5) -> list[dict]:
-    spend = _merchant_spend(transactions)
+def _top_by_spend(records: list[TxRecord], limit: int = 5) -> list[dict]:
+    spend = _merchant_spend(records)
     ranked = sorted(spend.items(), key=lambda x: x[1], reverse=True)[:limit]
     return [{"name": name, "spend_gbp": value} for name, value in ranked]
 
 
-def _top_by_frequency(transactions: list[dict], limit: int = 5) -> list[dict]:
-    freq = _merchant_frequency(transactions)
+def _top_by_frequency(records: list[TxRecord], limit: int = 5) -> list[dict]:
+    freq = _merchant_frequency(records)
     ranked = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:limit]
     return [{"name": name, "count": value} for name, value in ranked]
 
 
-def _late_night_count(transactions: list[dict], timezone: ZoneInfo) -> int:
-    count = 0
-    for tx in transactions:
-        if int(tx.get("amount", 0)) >= 0:
-            continue
-        hour = _to_dt(tx["created"], timezone).hour
-        if hour >= 22 or hour < 4:
-            count += 1
-    return count
+def _late_night_count(records: list[TxRecord]) -> int:
+    return sum(1 for tx in records if tx.amount < 0 and (tx.created.hour >= 22 or tx.created.hour < 4))
 
 
-def _small_purchase_count(transactions: list[dict]) -> int:
-    return sum(1 for tx in transactions if 0 < _spend_gbp(tx) < SMALL_PURCHASE_LIMIT_GBP)
+def _small_purchase_count(records: list[TxRecord]) -> int:
+    return sum(1 for tx in records if 0 < tx.spend_gbp < SMALL_PURCHASE_LIMIT_GBP)
 
 
-def _recurring_candidates(last_30: list[dict], timezone: ZoneInfo) -> list[dict]:
+def _recurring_candidates(last_30: list[TxRecord]) -> list[dict]:
     grouped: dict[str, list[datetime]] = defaultdict(list)
     for tx in last_30:
-        if int(tx.get("amount", 0)) >= 0:
+        if tx.amount >= 0:
             continue
-        grouped[_merchant_name(tx)].append(_to_dt(tx["created"], timezone))
+        grouped[tx.merchant].append(tx.created)
     out = []
     for name, dts in grouped.items():
         if len(dts) < 2:
@@ -119,19 +91,15 @@ def _recurring_candidates(last_30: list[dict], timezone: ZoneInfo) -> list[dict]
     return sorted(out, key=lambda x: (x["approx_period_days"], x["name"]))
 
 
-def _baseline_by_category(last_90: list[dict], now: datetime, timezone: ZoneInfo) -> dict[str, float]:
+def _baseline_by_category(last_90: list[TxRecord], now: datetime) -> dict[str, float]:
     start_week = (now - timedelta(days=90)).replace(hour=0, minute=0, second=0, microsecond=0)
     week_count = max(1, (now - start_week).days // 7)
     totals = _category_totals(last_90)
     return {k: round(v / week_count, 2) for k, v in totals.items()}
 
 
-def _payday_candidates(transactions: list[dict], timezone: ZoneInfo) -> list[dict]:
-    inbound_days: Counter[int] = Counter()
-    for tx in transactions:
-        if int(tx.get("amount", 0)) <= 0:
-            continue
-        inbound_days[_to_dt(tx["created"], timezone).day] += 1
+def _payday_candidates(records: list[TxRecord]) -> list[dict]:
+    inbound_days: Counter[int] = Counter(tx.created.day for tx in records if tx.amount > 0)
     if not inbound_days:
         return []
     max_hits = max(inbound_days.values())
@@ -141,14 +109,27 @@ def _payday_candidates(transactions: list[dict], timezone: ZoneInfo) -> list[dic
     ]
 
 
-def build_spend_context(*, transactions: list[dict], goals: dict, prefs: dict, meta_now: str, timezone: str) -> dict:
+def build_spend_context(
+    *,
+    transactions: Sequence[dict | TxRecord],
+    goals: dict,
+    prefs: dict,
+    meta_now: str,
+    timezone: str,
+) -> dict:
+    """Summarise transactions into the SpendContext the LLM prompt is built from.
+
+    ``transactions`` may be raw Monzo payloads or ``TxRecord``s built with
+    ``to_records`` for the same timezone.
+    """
     tz = ZoneInfo(timezone)
     now = _to_dt(meta_now, tz)
+    records = to_records(transactions, tz)
 
-    last_7 = _window_transactions(transactions, now, 7, tz)
-    last_14 = _window_transactions(transactions, now, 14, tz)
-    last_30 = _window_transactions(transactions, now, 30, tz)
-    last_90 = _window_transactions(transactions, now, 90, tz)
+    last_7 = _window_transactions(records, now, 7)
+    last_14 = _window_transactions(records, now, 14)
+    last_30 = _window_transactions(records, now, 30)
+    last_90 = _window_transactions(records, now, 90)
 
     return {
         "meta": {"timezone": timezone, "now": now.isoformat(), "currency": "GBP"},
@@ -157,7 +138,7 @@ def build_spend_context(*, transactions: list[dict], goals: dict, prefs: dict, m
                 "totals_by_category_gbp": _category_totals(last_7),
                 "top_merchants_by_spend": _top_by_spend(last_7),
                 "top_merchants_by_frequency": _top_by_frequency(last_7),
-                "late_night_tx_count": _late_night_count(last_7, tz),
+                "late_night_tx_count": _late_night_count(last_7),
                 "small_purchase_count": _small_purchase_count(last_7),
             },
             "last_14d": {
@@ -168,11 +149,11 @@ def build_spend_context(*, transactions: list[dict], goals: dict, prefs: dict, m
             "last_30d": {
                 "category_totals_gbp": _category_totals(last_30),
                 "merchant_frequency": _merchant_frequency(last_30),
-                "recurring_merchants_candidates": _recurring_candidates(last_30, tz),
+                "recurring_merchants_candidates": _recurring_candidates(last_30),
             },
             "last_90d": {
-                "baseline_by_category_gbp_per_week": _baseline_by_category(last_90, now, tz),
-                "payday_candidates": _payday_candidates(last_90, tz),
+                "baseline_by_category_gbp_per_week": _baseline_by_category(last_90, now),
+                "payday_candidates": _payday_candidates(last_90),
             },
         },
         "goals": {
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from .cards import get_insight_cards
+from .types import InsightCard
 
 
 @dataclass(frozen=True)
@@ -36,9 +37,9 @@ def dedupe_key(insight_id: str, now: datetime, evidence: dict) -> str:
     return hashlib.sha256(base).hexdigest()
 
 
-def apply_notification_policy(*, matches: list[dict], prefs: dict, previous_notifications: list[dict], now_iso: str, timezone: str, cards_dir: str = "insights/cards") -> GateDecision:
+def apply_notification_policy(*, matches: list[dict], prefs: dict, previous_notifications: list[dict], now_iso: str, timezone: str, cards_dir: str = "insights/cards", cards: list[InsightCard] | None = None) -> GateDecision:
     now = datetime.fromisoformat(now_iso.replace("Z", "+00:00")).astimezone(ZoneInfo(timezone))
-    cards = {c.id: c for c in get_insight_cards(cards_dir)}
+    cards_by_id = {c.id: c for c in (cards if cards is not None else get_insight_cards(cards_dir))}
 
     allowed: list[dict] = []
     suppressed: list[dict] = []
@@ -50,7 +51,7 @@ def apply_notification_policy(*, matches: list[dict], prefs: dict, previous_noti
 
     for match in matches:
         insight_id = match["insight_id"]
-        card = cards[insight_id]
+        card = cards_by_id[insight_id]
         if len(allowed) + len(sent_today) >= prefs["max_notifications_per_day"]:
             suppressed.append({"insight_id": insight_id, "reason": "daily_cap"})
             continue
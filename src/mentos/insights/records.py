@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sys
+from datetime import UTC, datetime
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+
+def _to_dt(raw: str, timezone: ZoneInfo) -> datetime:
+    dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(timezone)
+
+
+def _merchant_name(tx: dict) -> str:
+    merchant = tx.get("merchant") or {}
+    name = merchant.get("name") or tx.get("description") or "unknown"
+    return str(name)
+
+
+class TxRecord:
+    """One Monzo transaction, parsed once for the insights pipeline.
+
+    ``created`` is already in the user's timezone and ``merchant`` and
+    ``category`` are interned, so repeated grouping hashes shared strings.
+    """
+
+    __slots__ = ("amount", "spend_gbp", "created", "category", "merchant")
+
+    def __init__(self, amount: int, created: datetime, category: str, merchant: str) -> None:
+        self.amount = amount
+        self.spend_gbp = abs(amount) / 100 if amount < 0 else 0.0
+        self.created = created
+        self.category = category
+        self.merchant = merchant
+
+    @classmethod
+    def from_monzo(cls, tx: dict, timezone: ZoneInfo) -> "TxRecord":
+        return cls(
+            amount=int(tx.get("amount", 0)),
+            created=_to_dt(tx["created"], timezone),
+            category=sys.intern(str(tx.get("category") or "uncategorised")),
+            merchant=sys.intern(_merchant_name(tx)),
+        )
+
+    def __repr__(self) -> str:
+        return f"TxRecord({self.amount}, {self.created.isoformat()}, {self.category!r}, {self.merchant!r})"
+
+
+def to_records(transactions: Iterable[dict | TxRecord], timezone: ZoneInfo) -> list[TxRecord]:
+    """Parse Monzo payloads into records; records already built pass through."""
+    return [
+        tx if isinstance(tx, TxRecord) else TxRecord.from_monzo(tx, timezone)
+        for tx in transactions
+    ]
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from .cards import get_insight_cards
+from .types import InsightCard
 
 
 @dataclass(frozen=True)
@@ -22,9 +23,9 @@ def _resolve_path(payload: dict[str, Any], path: str) -> Any:
     return current
 
 
-def validate_llm_response(*, response: dict, spend_context: dict, max_matches: int = 3, cards_dir: str = "insights/cards") -> ValidationResult:
+def validate_llm_response(*, response: dict, spend_context: dict, max_matches: int = 3, cards_dir: str = "insights/cards", cards: list[InsightCard] | None = None) -> ValidationResult:
     errors: list[str] = []
-    cards = {c.id: c for c in get_insight_cards(cards_dir)}
+    cards_by_id = {c.id: c for c in (cards if cards is not None else get_insight_cards(cards_dir))}
     matches = response.get("matches")
     non_matches = response.get("non_matches")
 
@@ -39,14 +40,14 @@ def validate_llm_response(*, response: dict, spend_context: dict, max_matches: i
 
     for idx, match in enumerate(matches):
         insight_id = match.get("insight_id")
-        if insight_id not in cards:
+        if insight_id not in cards_by_id:
             errors.append(f"match[{idx}] unknown insight_id: {insight_id}")
             continue
         evidence = match.get("evidence", {})
         if not isinstance(evidence, dict):
             errors.append(f"match[{idx}] evidence must be object")
             continue
-        required = set(cards[insight_id].evidence_keys_required)
+        required = set(cards_by_id[insight_id].evidence_keys_required)
         present = set(evidence.keys())
         if not required.issubset(present):
             errors.append(f"match[{idx}] missing required evidence keys")
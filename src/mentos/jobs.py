@@ -1,25 +1,37 @@
 import logging
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
+from . import profiling, telemetry
 from .aggregates import rebuild_daily
 from .breakthroughs import detect_breakthroughs, seed_v1_goals, update_weekly_goal_progress
 from .chatgpt import ChatGPTClient
+from .copywriter import CopyWriter
+from .db import database_path
 from .drift import detect_goal_drift_events
-from .notifications import Notification, PushoverClient, can_send
+from .notifications import Notification, PushoverClient, can_send, in_quiet_hours
+from .outbox import DeliveryWorker, Outbox, has_due
+from .reconcile import reconcile_pending as reconcile_pending_transactions
 from .reports import (
     monthly_review as generate_monthly_review,
 )
 from .reports import (
     nightly_report as generate_nightly_report,
 )
-from .storage import get_rule
+from .rule_store import rule_store
+from .storage import prune_job_runs
 from .sweep import run_daily_sweep
 from .sync import sync_all
 
 logger = logging.getLogger("mentos.jobs")
 
+# Jobs polled every few minutes. Their job_runs rows carry timings only:
+# they are not idempotency keys and are pruned after a while.
+INTERVAL_JOBS = ("poll_and_aggregate", "reconcile_pending", "deliver_notifications")
+INTERVAL_RUN_RETENTION_DAYS = 14
+
 
 def run_idempotent(conn, job_name: str, run_key: str, func):
     try:
@@ -34,76 +46,105 @@ def run_idempotent(conn, job_name: str, run_key: str, func):
     except Exception:
         logger.info("Job already ran: %s %s", job_name, run_key)
         return
+    _run_recorded(conn, job_name, run_key, func)
 
-    try:
-        func()
-        conn.execute(
-            (
-                "UPDATE job_runs SET status = ?, finished_at = datetime('now') "
-                "WHERE job_name = ? AND run_key = ?"
-            ),
-            ("ok", job_name, run_key),
-        )
-        conn.commit()
-    except Exception as exc:
-        conn.execute(
-            (
-                "UPDATE job_runs SET status = ?, finished_at = datetime('now'), detail = ? "
-                "WHERE job_name = ? AND run_key = ?"
-            ),
-            ("error", str(exc), job_name, run_key),
-        )
-        conn.commit()
-        raise
+
+def record_run(conn, job_name: str, func):
+    """Run ``func`` unconditionally, recording its timings in ``job_runs``."""
+    run_key = f"{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')}-{uuid.uuid4().hex[:8]}"
+    conn.execute(
+        (
+            "INSERT INTO job_runs (id, job_name, run_key, status, started_at) "
+            "VALUES (?, ?, ?, ?, datetime('now'))"
+        ),
+        (str(uuid.uuid4()), job_name, run_key, "running"),
+    )
+    conn.commit()
+    _run_recorded(conn, job_name, run_key, func)
+
+
+def _run_recorded(conn, job_name: str, run_key: str, func) -> None:
+    started = time.perf_counter()
+    with telemetry.recording() as metrics:
+        try:
+            with profiling.maybe_profile(job_name, run_key):
+                func()
+        except Exception as exc:
+            _finish_run(conn, job_name, run_key, "error", started, metrics, str(exc))
+            raise
+    _finish_run(conn, job_name, run_key, "ok", started, metrics)
+
+
+def _finish_run(conn, job_name, run_key, status, started, metrics, detail=None) -> None:
+    conn.execute(
+        (
+            "UPDATE job_runs SET status = ?, finished_at = datetime('now'), detail = ?, "
+            "duration_ms = ?, metrics_json = ? WHERE job_name = ? AND run_key = ?"
+        ),
+        (
+            status,
+            detail,
+            int((time.perf_counter() - started) * 1000),
+            metrics.to_json(),
+            job_name,
+            run_key,
+        ),
+    )
+    conn.commit()
 
 
-def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None):
+def _can_notify(conn, tz: ZoneInfo) -> bool:
+    rules = rule_store(conn)
+    return can_send(
+        conn,
+        tz,
+        rules.get_int(conn, "max_notifications_per_day", 6),
+        rules.get_str(conn, "quiet_hours_start"),
+        rules.get_str(conn, "quiet_hours_end"),
+    )
+
+
+def nightly_report(
+    conn, tz: ZoneInfo, notifier: PushoverClient | Outbox | None = None, now: datetime | None = None
+):
+    # Reports the day before the slot, so a caught-up slot covers its own day.
+    day = ((now or datetime.now(tz)).astimezone(tz) - timedelta(days=1)).date()
+
     def _run():
-        if notifier and can_send(
-            conn,
-            tz,
-            int(get_rule(conn, "max_notifications_per_day") or 6),
-            str(get_rule(conn, "quiet_hours_start") or ""),
-            str(get_rule(conn, "quiet_hours_end") or ""),
-        ):
-            generate_nightly_report(conn, tz, notifier)
+        if notifier and _can_notify(conn, tz):
+            generate_nightly_report(conn, tz, notifier, day=day)
         else:
-            generate_nightly_report(conn, tz, None)
+            generate_nightly_report(conn, tz, None, day=day)
 
-    day = (datetime.now(tz) - timedelta(days=1)).date().isoformat()
-    run_idempotent(conn, "nightly_report", day, _run)
+    run_idempotent(conn, "nightly_report", day.isoformat(), _run)
 
 
-def daily_sweep(conn, tz: ZoneInfo, token: str | None):
+def daily_sweep(conn, tz: ZoneInfo, token: str | None, now: datetime | None = None):
     def _run():
         if not token:
             logger.info("Skipping sweep: missing token")
             return
-        run_daily_sweep(conn, token)
+        with telemetry.phase("sweep"):
+            run_daily_sweep(conn, token)
 
-    day = datetime.now(tz).date().isoformat()
+    day = (now or datetime.now(tz)).date().isoformat()
     run_idempotent(conn, "daily_sweep", day, _run)
 
 
 def monthly_review(
     conn,
     tz: ZoneInfo,
-    notifier: PushoverClient | None = None,
+    notifier: PushoverClient | Outbox | None = None,
     chatgpt_client: ChatGPTClient | None = None,
+    now: datetime | None = None,
 ):
     def _run():
-        if notifier and can_send(
-            conn,
-            tz,
-            int(get_rule(conn, "max_notifications_per_day") or 6),
-            str(get_rule(conn, "quiet_hours_start") or ""),
-            str(get_rule(conn, "quiet_hours_end") or ""),
-        ):
+        if notifier and _can_notify(conn, tz):
             generate_monthly_review(conn, tz, notifier, chatgpt_client=chatgpt_client)
         else:
             generate_monthly_review(conn, tz, None, chatgpt_client=chatgpt_client)
 
-    today = datetime.now(tz).date()
+    today = (now or datetime.now(tz)).date()
     run_key = f"{today.year}-{today.month:02d}"
     run_idempotent(conn, "monthly_review", run_key, _run)
 
@@ -111,24 +152,47 @@ def monthly_review(
 def weekly_breakthrough_review(
     conn,
     tz: ZoneInfo,
-    notifier: PushoverClient | None = None,
+    notifier: PushoverClient | Outbox | None = None,
     chatgpt_client: ChatGPTClient | None = None,
+    now: datetime | None = None,
 ):
     def _run():
         seed_v1_goals(conn)
-        update_weekly_goal_progress(conn)
-        breakthroughs = detect_breakthroughs(conn, chatgpt_client=chatgpt_client)
-        drift_events = detect_goal_drift_events(conn, chatgpt_client=chatgpt_client)
-        if not notifier:
-            return
+        with telemetry.phase("goal_progress"):
+            update_weekly_goal_progress(conn)
+        # Personalized copy is generated off the detection path; events are
+        # stored with fallback copy and upgraded in place when the LLM answers.
+        db_path = database_path(conn)
+        copywriter = (
+            CopyWriter(db_path)
+            if db_path and chatgpt_client and chatgpt_client.is_configured()
+            else None
+        )
+        try:
+            with telemetry.phase("breakthroughs"):
+                breakthroughs = detect_breakthroughs(
+                    conn, chatgpt_client=chatgpt_client, copywriter=copywriter
+                )
+            with telemetry.phase("drift"):
+                drift_events = detect_goal_drift_events(
+                    conn, chatgpt_client=chatgpt_client, copywriter=copywriter
+                )
+            if not notifier:
+                return
+            if copywriter:
+                deadline = rule_store(conn).get_float(conn, "llm_copy_deadline_seconds", 15)
+                events = breakthroughs + drift_events
+                with telemetry.phase("copy_wait"):
+                    upgrades = copywriter.collect([e["id"] for e in events], deadline)
+                for event in events:
+                    event.update(upgrades.get(event["id"], {}))
+        finally:
+            if copywriter:
+                copywriter.shutdown()
 
-        if can_send(
-            conn,
-            tz,
-            int(get_rule(conn, "max_notifications_per_day") or 6),
-            str(get_rule(conn, "quiet_hours_start") or ""),
-            str(get_rule(conn, "quiet_hours_end") or ""),
-        ):
+        if not _can_notify(conn, tz):
+            return
+        with telemetry.phase("notify"):
             for b in breakthroughs:
                 notifier.send(
                     Notification(
@@ -149,14 +213,57 @@ def weekly_breakthrough_review(
                     conn=conn,
                 )
 
-    today = datetime.now(tz).date()
+    today = (now or datetime.now(tz)).date()
     week_key = f"{today.isocalendar().year}-W{today.isocalendar().week:02d}"
     run_idempotent(conn, "weekly_breakthrough_review", week_key, _run)
 
 
-def poll_and_aggregate(conn, token: str | None) -> None:
+def poll_and_aggregate(conn, token: str | None, now: datetime | None = None) -> None:
+    prune_job_runs(conn, INTERVAL_JOBS, INTERVAL_RUN_RETENTION_DAYS)
     if not token:
         logger.info("Skipping sync: missing token")
         return
-    sync_all(conn, token)
-    rebuild_daily(conn)
+
+    def _run():
+        with telemetry.phase("sync"):
+            sync_all(conn, token)
+        with telemetry.phase("aggregate"):
+            rebuild_daily(conn)
+
+    record_run(conn, "poll_and_aggregate", _run)
+
+
+def reconcile_pending(conn, token: str | None, now: datetime | None = None) -> None:
+    if not token:
+        logger.info("Skipping pending reconciliation: missing token")
+        return
+
+    def _run():
+        with telemetry.phase("reconcile"):
+            result = reconcile_pending_transactions(conn, token)
+        telemetry.count("settled", result["settled"])
+
+    record_run(conn, "reconcile_pending", _run)
+
+
+def deliver_notifications(
+    conn, tz: ZoneInfo, client: PushoverClient, now: datetime | None = None
+) -> None:
+    now = now or datetime.now(tz)
+    # Polled every minute; only runs with due messages are recorded.
+    if not has_due(conn, now):
+        return
+    rules = rule_store(conn)
+    if in_quiet_hours(
+        now.astimezone(tz),
+        rules.get_str(conn, "quiet_hours_start"),
+        rules.get_str(conn, "quiet_hours_end"),
+    ):
+        return
+
+    def _run():
+        with telemetry.phase("notify"):
+            max_per_day = rules.get_int(conn, "max_notifications_per_day", 6)
+            DeliveryWorker(client, max_per_day=max_per_day).deliver(conn, now)
+
+    record_run(conn, "deliver_notifications", _run)
@@ -0,0 +1,122 @@
+import json
+import logging
+import re
+from datetime import datetime, timezone
+
+logger = logging.getLogger("mentos.merchants")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_merchant_name(name) -> str | None:
+    """Canonical display form of a merchant name, or None when blank."""
+    if not name:
+        return None
+    cleaned = _WHITESPACE.sub(" ", str(name)).strip()
+    return cleaned or None
+
+
+def merchant_alias(name) -> str | None:
+    """Lookup key for a merchant name: normalized and case-folded."""
+    cleaned = normalize_merchant_name(name)
+    return cleaned.casefold() if cleaned else None
+
+
+class MerchantResolver:
+    """Interns Monzo merchants into the ``merchants`` dimension.
+
+    Lookups are cached for the resolver's lifetime, so a batch only touches
+    the database once per distinct merchant. Inserts join the caller's
+    transaction; the caller owns the commit.
+    """
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+        self._by_alias: dict[str, int] = {}
+        self._by_monzo_id: dict[str, int] = {}
+
+    def resolve(self, merchant) -> int | None:
+        if not isinstance(merchant, dict):
+            return None
+        monzo_id = merchant.get("group_id") or merchant.get("id") or None
+        name = normalize_merchant_name(merchant.get("name"))
+        alias = name.casefold() if name else None
+        if monzo_id is None and alias is None:
+            return None
+
+        merchant_id = None
+        if monzo_id:
+            merchant_id = self._by_monzo_id.get(monzo_id) or self._lookup_monzo_id(monzo_id)
+        known_by_id = merchant_id is not None
+        if merchant_id is None and alias:
+            merchant_id = self._by_alias.get(alias) or self._lookup_alias(alias)
+        if merchant_id is None:
+            cur = self.conn.execute(
+                "INSERT INTO merchants (name, monzo_merchant_id, first_seen_at) VALUES (?, ?, ?)",
+                (name or monzo_id, monzo_id, datetime.now(timezone.utc).isoformat()),
+            )
+            merchant_id = cur.lastrowid
+        elif monzo_id and not known_by_id:
+            # First seen by name only: store the id so lookups by id in later
+            # runs find this row instead of creating a duplicate.
+            self.conn.execute(
+                "UPDATE merchants SET monzo_merchant_id = ? WHERE id = ? AND monzo_merchant_id IS NULL",
+                (monzo_id, merchant_id),
+            )
+        if alias and alias not in self._by_alias:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO merchant_aliases (alias, merchant_id) VALUES (?, ?)",
+                (alias, merchant_id),
+            )
+            self._by_alias[alias] = merchant_id
+        if monzo_id:
+            self._by_monzo_id[monzo_id] = merchant_id
+        return merchant_id
+
+    def _lookup_monzo_id(self, monzo_id: str) -> int | None:
+        row = self.conn.execute(
+            "SELECT id FROM merchants WHERE monzo_merchant_id = ?", (monzo_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _lookup_alias(self, alias: str) -> int | None:
+        row = self.conn.execute(
+            "SELECT merchant_id FROM merchant_aliases WHERE alias = ?", (alias,)
+        ).fetchone()
+        return row[0] if row else None
+
+
+def backfill_merchant_ids(conn, batch_size: int = 5000) -> int:
+    """Fill ``transactions.merchant_id`` for rows written before the dimension existed."""
+    resolver = MerchantResolver(conn)
+    updated = 0
+    last_id = ""
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, merchant_name, raw_json FROM transactions
+            WHERE merchant_id IS NULL AND merchant_name IS NOT NULL AND id > ?
+            ORDER BY id LIMIT ?
+            """,
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for tx_id, merchant_name, raw_json in rows:
+            try:
+                merchant = (json.loads(raw_json) if raw_json else {}).get("merchant")
+            except ValueError:
+                merchant = None
+            if not isinstance(merchant, dict):
+                merchant = {"name": merchant_name}
+            merchant_id = resolver.resolve(merchant)
+            if merchant_id is not None:
+                updates.append((merchant_id, tx_id))
+        conn.executemany("UPDATE transactions SET merchant_id = ? WHERE id = ?", updates)
+        conn.commit()
+        updated += len(updates)
+        last_id = rows[-1][0]
+    if updated:
+        logger.info("Backfilled merchant ids for %s transactions", updated)
+    return updated
@@ -3,6 +3,8 @@ import time
 import requests
 from typing import Any, Dict, Optional
 
+from . import telemetry, tracing
+
 logger = logging.getLogger("mentos.monzo")
 
 
@@ -30,9 +32,12 @@ class MonzoClient:
         url = f"{self.BASE_URL}{path}"
         backoff = 1
         for attempt in range(5):
-            resp = requests.request(
-                method, url, headers=headers, params=params, json=json_body, timeout=20
-            )
+            telemetry.count("http_calls")
+            with tracing.span("monzo.request", method=method, path=path, attempt=attempt):
+                resp = requests.request(
+                    method, url, headers=headers, params=params, json=json_body, timeout=20
+                )
+                tracing.set_attr("status", resp.status_code)
             if resp.status_code == 429:
                 retry_after = int(resp.headers.get("Retry-After", backoff))
                 logger.warning("Rate limited, retrying in %s", retry_after)
@@ -77,6 +82,10 @@ class MonzoClient:
                 return self._request("GET", "/transactions", params=params)
             raise
 
+    def get_transaction(self, transaction_id: str):
+        params = [("expand[]", "merchant")]
+        return self._request("GET", f"/transactions/{transaction_id}", params=params)
+
     def deposit_to_pot(self, pot_id: str, account_id: str, amount: int, dedupe_id: str):
         data = {
             "source_account_id": account_id,
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from .monzo_client import MonzoError
+
+
+def _parse(ts: str) -> datetime:
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+class StubMonzoClient:
+    """In-process stand-in for ``MonzoClient`` serving canned payloads.
+
+    Transactions are paged newest-first below ``before`` and above ``since``,
+    which is the pagination ``sync_all`` walks. ``calls`` counts requests per
+    endpoint so benchmarks and tests can assert on traffic; ``latency`` adds
+    a fixed delay per request to stand in for the network.
+    """
+
+    def __init__(
+        self,
+        accounts: dict,
+        pots: dict | None = None,
+        transactions: list[dict] | None = None,
+        page_size: int = 100,
+        latency: float = 0.0,
+    ) -> None:
+        self.accounts = accounts
+        self.pots = pots or {"pots": []}
+        self.page_size = page_size
+        self.latency = latency
+        self.calls: dict[str, int] = {}
+        self.transfers: list[dict[str, Any]] = []
+        default_account = next((a.get("id") for a in accounts.get("accounts", [])), None)
+        self._by_account: dict[str, list[tuple[datetime, dict]]] = {}
+        self._by_id: dict[str, dict] = {}
+        for tx in transactions or []:
+            account_id = tx.get("account_id") or default_account
+            self._by_account.setdefault(account_id, []).append((_parse(tx["created"]), tx))
+            self._by_id[tx["id"]] = tx
+        for rows in self._by_account.values():
+            rows.sort(key=lambda row: row[0], reverse=True)
+
+    @classmethod
+    def from_dir(cls, path: str, page_size: int = 100, latency: float = 0.0) -> "StubMonzoClient":
+        """Load ``monzo_accounts.json``/``monzo_pots.json``/``monzo_transactions.json``."""
+        base = Path(path)
+        accounts = json.loads((base / "monzo_accounts.json").read_text())
+        pots_path = base / "monzo_pots.json"
+        pots = json.loads(pots_path.read_text()) if pots_path.exists() else None
+        txs = json.loads((base / "monzo_transactions.json").read_text()).get("transactions", [])
+        return cls(accounts, pots, txs, page_size=page_size, latency=latency)
+
+    def oldest_created(self) -> str | None:
+        oldest = min(
+            (rows[-1] for rows in self._by_account.values() if rows), key=lambda row: row[0], default=None
+        )
+        return oldest[1]["created"] if oldest else None
+
+    def _count(self, endpoint: str) -> None:
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def list_accounts(self):
+        self._count("accounts")
+        return self.accounts
+
+    def list_pots(self, account_id: str):
+        self._count("pots")
+        return self.pots
+
+    def list_transactions(
+        self, account_id: str, since: Optional[str] = None, before: Optional[str] = None
+    ):
+        self._count("transactions")
+        since_dt = _parse(since) if since else None
+        before_dt = _parse(before) if before else None
+        page = []
+        for created, tx in self._by_account.get(account_id, []):
+            if before_dt is not None and created >= before_dt:
+                continue
+            if since_dt is not None and created < since_dt:
+                break
+            page.append(tx)
+            if len(page) >= self.page_size:
+                break
+        return {"transactions": page}
+
+    def get_transaction(self, transaction_id: str):
+        self._count("transaction")
+        tx = self._by_id.get(transaction_id)
+        if tx is None:
+            raise MonzoError(404, "transaction not found")
+        return {"transaction": tx}
+
+    def deposit_to_pot(self, pot_id: str, account_id: str, amount: int, dedupe_id: str):
+        self._count("deposit")
+        return self._transfer("deposit", pot_id, account_id, amount, dedupe_id)
+
+    def withdraw_from_pot(self, pot_id: str, account_id: str, amount: int, dedupe_id: str):
+        self._count("withdraw")
+        return self._transfer("withdraw", pot_id, account_id, amount, dedupe_id)
+
+    def _transfer(self, kind: str, pot_id: str, account_id: str, amount: int, dedupe_id: str):
+        for pot in self.pots.get("pots", []):
+            if pot.get("id") == pot_id:
+                delta = amount if kind == "deposit" else -amount
+                if pot.get("balance", 0) + delta < 0:
+                    raise MonzoError(400, "insufficient_funds")
+                pot["balance"] = pot.get("balance", 0) + delta
+                record = {"kind": kind, "pot_id": pot_id, "account_id": account_id, "amount": amount, "dedupe_id": dedupe_id}
+                self.transfers.append(record)
+                return pot
+        raise MonzoError(404, "pot not found")
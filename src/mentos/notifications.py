@@ -1,10 +1,12 @@
 import json
 import logging
-import requests
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
+import requests
+
+from . import telemetry, tracing
 from .storage import log_notification
 
 logger = logging.getLogger("mentos.notifications")
@@ -38,7 +40,10 @@ class PushoverClient:
         if notification.url:
             payload["url"] = notification.url
 
-        resp = requests.post("https://api.pushover.net/1/messages.json", data=payload, timeout=15)
+        telemetry.count("http_calls")
+        with tracing.span("pushover.request"):
+            resp = requests.post("https://api.pushover.net/1/messages.json", data=payload, timeout=15)
+            tracing.set_attr("status", resp.status_code)
         if resp.status_code >= 400:
             logger.error("Pushover error: %s", resp.text)
             resp.raise_for_status()
@@ -48,28 +53,39 @@ class PushoverClient:
             log_notification(conn, user_id, "pushover", payload, "sent")
 
 
-def can_send(conn, tz, max_per_day: int, quiet_start: str, quiet_end: str) -> bool:
-    now = datetime.now(tz)
-    if quiet_start and quiet_end:
-        try:
-            qs_h, qs_m = [int(x) for x in quiet_start.split(":")]
-            qe_h, qe_m = [int(x) for x in quiet_end.split(":")]
-            quiet_start_min = qs_h * 60 + qs_m
-            quiet_end_min = qe_h * 60 + qe_m
-            now_min = now.hour * 60 + now.minute
-            if quiet_start_min < quiet_end_min:
-                if quiet_start_min <= now_min < quiet_end_min:
-                    return False
-            else:
-                if now_min >= quiet_start_min or now_min < quiet_end_min:
-                    return False
-        except Exception:
-            pass
-
-    cur = conn.execute(
-        "SELECT COUNT(1) FROM notifications WHERE date(created_at) = date('now')"
-    )
-    count = cur.fetchone()[0] or 0
-    if max_per_day > 0 and count >= max_per_day:
+def in_quiet_hours(now: datetime, quiet_start: str, quiet_end: str) -> bool:
+    if not quiet_start or not quiet_end:
+        return False
+    try:
+        qs_h, qs_m = [int(x) for x in quiet_start.split(":")]
+        qe_h, qe_m = [int(x) for x in quiet_end.split(":")]
+    except Exception:
+        return False
+    quiet_start_min = qs_h * 60 + qs_m
+    quiet_end_min = qe_h * 60 + qe_m
+    now_min = now.hour * 60 + now.minute
+    if quiet_start_min < quiet_end_min:
+        return quiet_start_min <= now_min < quiet_end_min
+    return now_min >= quiet_start_min or now_min < quiet_end_min
+
+
+def can_send(
+    conn, tz, max_per_day: int, quiet_start: str, quiet_end: str, user_id: str = "user_1"
+) -> bool:
+    if in_quiet_hours(datetime.now(tz), quiet_start, quiet_end):
+        return False
+    return not over_daily_cap(conn, max_per_day, user_id)
+
+
+def over_daily_cap(
+    conn, max_per_day: int, user_id: str = "user_1", now: datetime | None = None
+) -> bool:
+    """Whether ``user_id`` has had ``max_per_day`` pushes on this UTC day (0 = no cap)."""
+    if max_per_day <= 0:
         return False
-    return True
+    day = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date().isoformat()
+    row = conn.execute(
+        "SELECT sent FROM notification_daily_counts WHERE user_id = ? AND day = ?",
+        (user_id, day),
+    ).fetchone()
+    return (row[0] if row else 0) >= max_per_day
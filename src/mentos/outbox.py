@@ -0,0 +1,167 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+
+from . import telemetry
+from .notifications import Notification, PushoverClient, over_daily_cap
+
+logger = logging.getLogger("mentos.outbox")
+
+DEFAULT_BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+BASE_BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 3600
+# Pushover truncates messages beyond this many characters.
+MESSAGE_LIMIT = 1024
+
+
+def _utc(now: datetime | None) -> str:
+    return (now or datetime.now(timezone.utc)).astimezone(timezone.utc).isoformat()
+
+
+def enqueue(conn, notification: Notification, user_id: str = "user_1", now: datetime | None = None) -> str:
+    outbox_id = str(uuid.uuid4())
+    at = _utc(now)
+    conn.execute(
+        """
+        INSERT INTO notification_outbox (
+            id, user_id, title, message, url, status, attempts, next_attempt_at, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, ?)
+        """,
+        (outbox_id, user_id, notification.title, notification.message, notification.url, at, at),
+    )
+    conn.commit()
+    return outbox_id
+
+
+def has_due(conn, now: datetime | None = None) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM notification_outbox WHERE status = 'pending' AND next_attempt_at <= ? LIMIT 1",
+        (_utc(now),),
+    ).fetchone()
+    return row is not None
+
+
+class Outbox:
+    """Drop-in notifier for jobs: queues messages instead of sending them.
+
+    Jobs hand their notifications to the outbox and return; ``DeliveryWorker``
+    sends them later, so a slow or failing Pushover call never holds up the
+    job that produced the message.
+    """
+
+    def send(self, notification: Notification, conn=None, user_id: str = "user_1") -> None:
+        if conn is None:
+            raise ValueError("Outbox.send needs a connection")
+        enqueue(conn, notification, user_id)
+
+
+def digest(notifications: list[Notification]) -> Notification:
+    """Fold several messages for one user into a single push."""
+    if len(notifications) == 1:
+        return notifications[0]
+    message = "\n\n".join(f"{n.title} {n.message}" for n in notifications)
+    if len(message) > MESSAGE_LIMIT:
+        message = message[: MESSAGE_LIMIT - 1] + "…"
+    urls = {n.url for n in notifications if n.url}
+    return Notification(
+        title=f"{len(notifications)} updates from mentos",
+        message=message,
+        url=urls.pop() if len(urls) == 1 else None,
+    )
+
+
+class DeliveryWorker:
+    """Sends due outbox rows, one digest per user per batch.
+
+    A failed push is retried with exponential backoff; after
+    ``max_attempts`` its rows are marked ``failed`` and left for inspection.
+    Messages queued before the user reached ``max_per_day`` pushes wait for
+    the next UTC day rather than going over the cap.
+    """
+
+    def __init__(
+        self,
+        client: PushoverClient,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_backoff_seconds: float = BASE_BACKOFF_SECONDS,
+        max_backoff_seconds: float = MAX_BACKOFF_SECONDS,
+        max_per_day: int = 0,
+    ) -> None:
+        self.client = client
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_per_day = max_per_day
+
+    def backoff(self, attempts: int) -> timedelta:
+        seconds = self.base_backoff_seconds * 2 ** max(attempts - 1, 0)
+        return timedelta(seconds=min(seconds, self.max_backoff_seconds))
+
+    def deliver(self, conn, now: datetime | None = None) -> dict:
+        now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        rows = conn.execute(
+            """
+            SELECT id, user_id, title, message, url, attempts
+            FROM notification_outbox
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY created_at
+            LIMIT ?
+            """,
+            (now.isoformat(), self.batch_size),
+        ).fetchall()
+        telemetry.count("rows_read", len(rows))
+        by_user: dict[str, list] = defaultdict(list)
+        for row in rows:
+            by_user[row["user_id"]].append(row)
+
+        result = {"messages": len(rows), "sent": 0, "retried": 0, "failed": 0, "deferred": 0}
+        for user_id, batch in by_user.items():
+            ids = [r["id"] for r in batch]
+            # Checked per send: other pushes may have landed since enqueue.
+            if over_daily_cap(conn, self.max_per_day, user_id, now):
+                tomorrow = datetime.combine(now.date() + timedelta(days=1), time(), timezone.utc)
+                conn.executemany(
+                    "UPDATE notification_outbox SET next_attempt_at = ? WHERE id = ?",
+                    [(tomorrow.isoformat(), outbox_id) for outbox_id in ids],
+                )
+                conn.commit()
+                result["deferred"] += len(ids)
+                continue
+            notification = digest([Notification(r["title"], r["message"], r["url"]) for r in batch])
+            try:
+                self.client.send(notification, conn=conn, user_id=user_id)
+            except Exception as exc:
+                logger.warning("Outbox delivery failed for %s (%s messages): %s", user_id, len(ids), exc)
+                attempts = max(r["attempts"] for r in batch) + 1
+                if attempts >= self.max_attempts:
+                    self._mark(conn, ids, "failed", attempts, now, str(exc))
+                    result["failed"] += len(ids)
+                else:
+                    self._mark(conn, ids, "pending", attempts, now + self.backoff(attempts), str(exc))
+                    result["retried"] += len(ids)
+                continue
+            conn.executemany(
+                "UPDATE notification_outbox SET status = 'sent', attempts = attempts + 1, sent_at = ? WHERE id = ?",
+                [(now.isoformat(), outbox_id) for outbox_id in ids],
+            )
+            conn.commit()
+            result["sent"] += 1
+        if rows:
+            logger.info("Outbox delivery: %s", result)
+        return result
+
+    def _mark(self, conn, ids, status, attempts, next_attempt_at, error) -> None:
+        conn.executemany(
+            """
+            UPDATE notification_outbox
+            SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+            WHERE id = ?
+            """,
+            [(status, attempts, next_attempt_at.isoformat(), error, outbox_id) for outbox_id in ids],
+        )
+        conn.commit()
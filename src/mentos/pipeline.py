@@ -0,0 +1,66 @@
+import contextvars
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def prefetch(items: Iterable[T], depth: int = 4) -> Iterator[T]:
+    """Iterate ``items`` on a background thread, up to ``depth`` items ahead.
+
+    The producer blocks once ``depth`` items are waiting, so a slow consumer
+    holds it back instead of letting it buffer everything. An exception in
+    the producer is re-raised in the consumer after the items produced
+    before it. If the consumer stops early, the producer is told to stop at
+    its next hand-off and is joined before this generator closes.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not _put(item):
+                    return
+        except BaseException as exc:
+            _put(_Failed(exc))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        _put(_DONE)
+
+    # Copy the context so telemetry from the producer lands in the same run.
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(_produce,), name="mentos-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        thread.join()
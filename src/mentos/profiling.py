@@ -0,0 +1,154 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger("mentos.profiling")
+
+DEFAULT_PROFILE_DIR = "./profiles"
+_TOP_FUNCTIONS = 40
+_TOP_ALLOCATIONS = 25
+
+_installed: "Profiler | None" = None
+_local = threading.local()
+# tracemalloc is process-wide; it runs while any profiled block is active.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+# Held by the run whose cProfile is active; see _claim_cprofile.
+_cprofile_lock = threading.Lock()
+
+
+def _start_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+def _claim_cprofile() -> "cProfile.Profile | None":
+    """Start a cProfile unless another run already has one.
+
+    Python 3.12+ allows one active profiler per process, so concurrent job
+    runs share it first come, first served; the others get wall time and
+    allocations only.
+    """
+    if not _cprofile_lock.acquire(blocking=False):
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Some other tool (a debugger, coverage) holds the profiler hook.
+        _cprofile_lock.release()
+        return None
+    return profile
+
+
+def _safe(part: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", part).strip("_") or "run"
+
+
+class Profiler:
+    """CPU and allocation profiles for named runs.
+
+    Each profiled block gets a ``.prof`` file (load with ``pstats`` or
+    snakeviz) and a ``.txt`` summary of the hottest functions and the
+    allocations made during the run. Runs faster than ``min_seconds`` are
+    discarded. Allocation figures are process-wide, so they include any
+    jobs running concurrently on other threads. Only one run at a time gets
+    a CPU profile; runs overlapping it get the summary without one.
+    """
+
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR, min_seconds: float = 0.0) -> None:
+        self.directory = Path(directory)
+        self.min_seconds = min_seconds
+
+    @classmethod
+    def from_env(cls) -> "Profiler | None":
+        if os.getenv("MENTOS_PROFILE", "").strip().lower() not in {"1", "true", "yes", "on"}:
+            return None
+        return cls(
+            os.getenv("MENTOS_PROFILE_DIR") or DEFAULT_PROFILE_DIR,
+            float(os.getenv("MENTOS_PROFILE_MIN_SECONDS") or 0),
+        )
+
+    @contextmanager
+    def profile(self, name: str, run_key: str) -> Iterator[None]:
+        if getattr(_local, "active", False):
+            # cProfile cannot nest on one thread; the outer profile covers this block.
+            yield
+            return
+        _local.active = True
+        # Set up inside the try so a failure part way leaves nothing behind.
+        traced = False
+        profile = None
+        started = None
+        try:
+            _start_tracing()
+            traced = True
+            before = tracemalloc.take_snapshot()
+            profile = _claim_cprofile()
+            started = time.perf_counter()
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                _cprofile_lock.release()
+            if started is not None:
+                elapsed = time.perf_counter() - started
+                after = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            if traced:
+                _stop_tracing()
+            _local.active = False
+            if started is not None and elapsed >= self.min_seconds:
+                self._write(name, run_key, elapsed, profile, after.compare_to(before, "lineno"), peak)
+
+    def _write(self, name, run_key, elapsed, profile, allocations, peak) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / f"{_safe(name)}-{_safe(run_key)}"
+
+        out = io.StringIO()
+        out.write(f"{name} {run_key}: {elapsed:.3f}s wall, peak traced memory {peak / 1024:.0f} KiB\n\n")
+        if profile is not None:
+            profile.dump_stats(f"{base}.prof")
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(_TOP_FUNCTIONS)
+        else:
+            out.write("No CPU profile: another run held the profiler. Wall time only.\n\n")
+        out.write("Top allocations during the run:\n")
+        for stat in allocations[:_TOP_ALLOCATIONS]:
+            out.write(f"{stat}\n")
+        Path(f"{base}.txt").write_text(out.getvalue(), encoding="utf-8")
+        logger.info("Wrote profile for %s %s (%.2fs) to %s.txt", name, run_key, elapsed, base)
+
+
+def install(profiler: Profiler | None) -> None:
+    """Profile every job run in this process with ``profiler`` (None turns it off)."""
+    global _installed
+    _installed = profiler
+
+
+@contextmanager
+def maybe_profile(name: str, run_key: str) -> Iterator[None]:
+    if _installed is None:
+        yield
+        return
+    with _installed.profile(name, run_key):
+        yield
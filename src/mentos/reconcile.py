@@ -0,0 +1,108 @@
+import logging
+from datetime import datetime, timezone
+
+from . import telemetry
+from .aggregates import daily_cells, refresh_daily_cells
+from .ingest import upsert_transactions
+from .monzo_client import MonzoClient, MonzoError
+from .storage import ensure_user
+
+logger = logging.getLogger("mentos.reconcile")
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_BATCHES = 4
+
+
+def pending_due(conn, limit: int) -> list:
+    """Pending transactions to re-check, least recently checked first.
+
+    Rows whose payload showed a decline, or that the API no longer returns,
+    are parked in ``pending_checks`` and skipped.
+    """
+    return conn.execute(
+        """
+        SELECT t.id, t.account_id
+        FROM transactions t
+        LEFT JOIN pending_checks c ON c.transaction_id = t.id
+        WHERE t.is_pending = 1 AND COALESCE(c.status, 'pending') = 'pending'
+        ORDER BY c.checked_at IS NOT NULL, c.checked_at, t.created_at
+        LIMIT ?
+        """,
+        (limit,),
+    ).fetchall()
+
+
+def _record_check(conn, tx_id: str, status: str, now: str) -> None:
+    conn.execute(
+        """
+        INSERT INTO pending_checks (transaction_id, status, attempts, checked_at)
+        VALUES (?, ?, 1, ?)
+        ON CONFLICT(transaction_id) DO UPDATE SET
+          status = excluded.status, attempts = attempts + 1, checked_at = excluded.checked_at
+        """,
+        (tx_id, status, now),
+    )
+
+
+def reconcile_pending(
+    conn,
+    token: str | None = None,
+    client: MonzoClient | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int = DEFAULT_MAX_BATCHES,
+) -> dict:
+    """Re-fetch pending transactions by id until they settle.
+
+    At most ``batch_size * max_batches`` transactions are fetched per call,
+    committed a batch at a time. Settled or changed transactions are
+    upserted and only the aggregate cells they touch are recomputed.
+    """
+    client = client or MonzoClient(token)
+    user_id = ensure_user(conn)
+    result = {"checked": 0, "settled": 0, "still_pending": 0, "declined": 0, "missing": 0}
+    due = pending_due(conn, batch_size * max_batches)
+    telemetry.count("rows_read", len(due))
+    for start in range(0, len(due), batch_size):
+        batch = due[start : start + batch_size]
+        now = datetime.now(timezone.utc).isoformat()
+        fetched: dict[str, list[dict]] = {}
+        for row in batch:
+            try:
+                tx = client.get_transaction(row["id"]).get("transaction") or {}
+            except MonzoError as exc:
+                if exc.status != 404:
+                    raise
+                logger.warning("Pending transaction %s no longer exists upstream", row["id"])
+                _record_check(conn, row["id"], "missing", now)
+                result["missing"] += 1
+                continue
+            result["checked"] += 1
+            if tx.get("settled"):
+                result["settled"] += 1
+            elif tx.get("decline_reason"):
+                _record_check(conn, row["id"], "declined", now)
+                result["declined"] += 1
+            else:
+                _record_check(conn, row["id"], "pending", now)
+                result["still_pending"] += 1
+            fetched.setdefault(row["account_id"], []).append(tx)
+
+        ids = [tx["id"] for txs in fetched.values() for tx in txs if tx.get("id")]
+        cells = daily_cells(conn, ids)
+        for account_id, txs in fetched.items():
+            upsert_transactions(conn, user_id, account_id, txs)
+        cells |= daily_cells(conn, ids)
+        refresh_daily_cells(conn, cells)
+        if ids:
+            conn.execute(
+                f"""
+                DELETE FROM pending_checks WHERE transaction_id IN (
+                  SELECT id FROM transactions WHERE is_pending = 0 AND id IN ({",".join("?" for _ in ids)})
+                )
+                """,
+                ids,
+            )
+        conn.commit()
+    if due:
+        logger.info("Pending reconciliation: %s", result)
+    return result
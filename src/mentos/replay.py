@@ -0,0 +1,180 @@
+import json
+import logging
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from . import telemetry, tracing
+from .aggregates import rebuild_daily
+from .db import apply_migrations, connect
+from .monzo_stub import StubMonzoClient
+from .reports import nightly_report
+from .storage import (
+    DEFAULT_CONN_ID,
+    DEFAULT_USER_ID,
+    ensure_default_rules,
+    ensure_user,
+    update_last_sync,
+)
+from .sync import sync_all
+from .synthetic import generate_user, write_monzo_dir
+
+logger = logging.getLogger("mentos.replay")
+
+STAGES = ("sync_all", "rebuild_daily", "nightly_report")
+TRANSACTION_EVENT_KINDS = ("monzo.transactions", "monzo.webhook.transaction.created", "monzo.webhook.transaction.updated")
+
+
+def _parse_dt(ts: str) -> datetime:
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+def capture(conn, out_dir: str) -> dict:
+    """Write the Monzo responses kept in ``raw_events`` as a Monzo directory.
+
+    The layout matches ``scripts/mocks`` and ``mentos synth``. Transactions
+    seen in several pages or webhooks keep their latest captured version.
+    """
+    latest: dict[str, dict] = {}
+    for kind in ("monzo.accounts", "monzo.pots"):
+        row = conn.execute(
+            "SELECT payload_json FROM raw_events WHERE kind = ? ORDER BY received_at DESC LIMIT 1", (kind,)
+        ).fetchone()
+        latest[kind] = json.loads(row[0]) if row else {}
+
+    transactions: dict[str, dict] = {}
+    pages = 0
+    cur = conn.execute(
+        f"""
+        SELECT kind, payload_json FROM raw_events
+        WHERE kind IN ({",".join("?" for _ in TRANSACTION_EVENT_KINDS)})
+        ORDER BY received_at
+        """,
+        TRANSACTION_EVENT_KINDS,
+    )
+    for kind, payload_json in cur:
+        payload = json.loads(payload_json)
+        pages += 1
+        items = payload.get("transactions", []) if kind == "monzo.transactions" else [payload.get("data") or {}]
+        for tx in items:
+            if tx.get("id") and tx.get("created"):
+                transactions[tx["id"]] = tx
+
+    accounts = latest["monzo.accounts"]
+    if not accounts.get("accounts"):
+        accounts = {"accounts": [{"id": row[0]} for row in conn.execute("SELECT id FROM accounts ORDER BY id")]}
+
+    path = Path(out_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "monzo_accounts.json").write_text(json.dumps(accounts, indent=2))
+    (path / "monzo_pots.json").write_text(json.dumps(latest["monzo.pots"] or {"pots": []}, indent=2))
+    ordered = sorted(transactions.values(), key=lambda tx: _parse_dt(tx["created"]))
+    with (path / "monzo_transactions.json").open("w", encoding="utf-8") as handle:
+        handle.write('{"transactions": [\n')
+        handle.write(",\n".join(json.dumps(tx) for tx in ordered))
+        handle.write("\n]}\n")
+    logger.info("Captured %s transactions from %s pages/events into %s", len(ordered), pages, out_dir)
+    return {"pages": pages, "transactions": len(ordered), "accounts": len(accounts.get("accounts", []))}
+
+
+def synthetic_source(out_dir: str, transactions: int, seed: int = 7) -> str:
+    """Generate a Monzo directory to replay when no capture is at hand."""
+    user = generate_user(seed=seed, transactions=transactions)
+    write_monzo_dir(user, out_dir)
+    return out_dir
+
+
+def prime_last_sync(conn, oldest_created: str) -> None:
+    """Pretend a sync finished just before ``oldest_created`` so ``sync_all``
+    pages through the whole history instead of the last 30 days."""
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO monzo_connections (id, user_id, mode, scopes, status, created_at, updated_at)
+        VALUES (?, ?, 'personal_token', '', 'active', datetime('now'), datetime('now'))
+        """,
+        (DEFAULT_CONN_ID, DEFAULT_USER_ID),
+    )
+    update_last_sync(conn, oldest_created.replace("Z", "+00:00"))
+
+
+def _run_once(source_dir: str, tz: ZoneInfo, latency: float, workdir: str) -> dict:
+    # Pages of 100, as Monzo serves them; sync stops on the first short page.
+    client = StubMonzoClient.from_dir(source_dir, latency=latency)
+    oldest = client.oldest_created()
+    db_path = str(Path(workdir, "replay.sqlite"))
+    apply_migrations(db_path)
+    conn = connect(db_path)
+    try:
+        ensure_default_rules(conn, ensure_user(conn))
+        if oldest:
+            prime_last_sync(conn, oldest)
+        days = (datetime.now(timezone.utc) - _parse_dt(oldest)).days + 1 if oldest else 35
+
+        timings: dict[str, float] = {}
+        rows: dict[str, int] = {}
+        with telemetry.recording() as metrics:
+            started = time.perf_counter()
+            with tracing.span("sync_all"):
+                sync_all(conn, "replay", client=client)
+            timings["sync_all"] = time.perf_counter() - started
+            rows["sync_all"] = conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0]
+
+            started = time.perf_counter()
+            with tracing.span("rebuild_daily"):
+                rebuild_daily(conn, days=days)
+            timings["rebuild_daily"] = time.perf_counter() - started
+            rows["rebuild_daily"] = conn.execute("SELECT COUNT(1) FROM aggregates_daily").fetchone()[0]
+
+            started = time.perf_counter()
+            with tracing.span("nightly_report"):
+                payload = nightly_report(conn, tz, None)
+            timings["nightly_report"] = time.perf_counter() - started
+            rows["nightly_report"] = len(payload["summary"])
+        return {"timings": timings, "rows": rows, "calls": dict(client.calls), "counters": metrics.counters}
+    finally:
+        conn.close()
+
+
+def replay(
+    source_dir: str,
+    tz: ZoneInfo,
+    repeat: int = 3,
+    latency_ms: float = 0.0,
+) -> dict:
+    """Run captured pages through sync -> aggregates -> report on fresh databases.
+
+    Each repeat starts from an empty database and a stub client serving
+    ``source_dir``; ``latency_ms`` is added to every stub request. Per stage
+    the p50/p95 wall time across repeats and the p50 throughput are
+    reported, plus the same for the whole path.
+    """
+    runs = []
+    for _ in range(max(1, repeat)):
+        with tempfile.TemporaryDirectory() as workdir:
+            runs.append(_run_once(source_dir, tz, latency_ms / 1000, workdir))
+
+    stages: dict[str, dict] = {}
+    for name in (*STAGES, "end_to_end"):
+        if name == "end_to_end":
+            seconds = [sum(run["timings"].values()) for run in runs]
+            rows = runs[-1]["rows"]["sync_all"]
+        else:
+            seconds = [run["timings"][name] for run in runs]
+            rows = runs[-1]["rows"][name]
+        p50 = telemetry.percentile(seconds, 50)
+        stages[name] = {
+            "p50_ms": round(p50 * 1000, 2),
+            "p95_ms": round(telemetry.percentile(seconds, 95) * 1000, 2),
+            "rows": rows,
+            "rows_per_second": int(rows / p50) if p50 else None,
+        }
+    return {
+        "source": str(source_dir),
+        "repeat": len(runs),
+        "latency_ms": latency_ms,
+        "requests": runs[-1]["calls"],
+        "counters": runs[-1]["counters"],
+        "stages": stages,
+    }
@@ -1,8 +1,9 @@
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from . import telemetry
 from .chatgpt import ChatGPTClient
 from .goals import goal_catalog, insight_patterns_for_goals, normalize_selected_goals
 from .heuristics import (
@@ -13,6 +14,7 @@ from .heuristics import (
     recurring_merchants,
 )
 from .notifications import Notification, PushoverClient
+from .outbox import Outbox
 from .storage import get_rule
 
 logger = logging.getLogger("mentos.reports")
@@ -20,9 +22,11 @@ logger = logging.getLogger("mentos.reports")
 
 
 
-def _yesterday_range(tz: ZoneInfo):
-    now = datetime.now(tz)
-    start = datetime(now.year, now.month, now.day, tzinfo=tz) - timedelta(days=1)
+def _yesterday_range(tz: ZoneInfo, day: date | None = None):
+    """Local-midnight bounds of ``day`` (default: yesterday)."""
+    if day is None:
+        day = datetime.now(tz).date() - timedelta(days=1)
+    start = datetime(day.year, day.month, day.day, tzinfo=tz)
     end = start + timedelta(days=1)
     return start, end
 
@@ -164,8 +168,13 @@ def _personalize_insights(
     return personalized
 
 
-def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -> dict:
-    start, end = _yesterday_range(tz)
+def nightly_report(
+    conn, tz: ZoneInfo, notifier: PushoverClient | Outbox | None = None, day: date | None = None
+) -> dict:
+    start, end = _yesterday_range(tz, day)
+    # A caught-up report names its day instead of saying "Yesterday".
+    yesterday = datetime.now(tz).date() - timedelta(days=1)
+    label = "Yesterday" if start.date() == yesterday else f"{start:%a %d %b}"
     cur = conn.execute(
         """
         SELECT category, SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END) AS total
@@ -177,6 +186,7 @@ def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -
         (start.isoformat(), end.isoformat()),
     )
     rows = cur.fetchall()
+    telemetry.count("rows_read", len(rows))
     summary_lines = []
     total_spend = 0
     for category, total in rows:
@@ -184,7 +194,10 @@ def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -
         summary_lines.append(f"{category or 'uncategorized'}: £{(total or 0)/100:.2f}")
 
     nudges = []
-    outliers = category_outliers(conn)
+    with telemetry.phase("heuristics"):
+        outliers = category_outliers(conn)
+        drift = budget_drift(conn)
+        late_night = late_night_spend_count(conn, tz=tz)
     for o in outliers:
         if o["mad"] == 0:
             continue
@@ -194,22 +207,21 @@ def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -
                 nudges.append(f"{category} was higher than usual yesterday.")
                 break
 
-    drift = budget_drift(conn)
     if drift["drift_ratio"] and drift["drift_ratio"] > 1.25:
         nudges.append("Spending is running hot vs the last month.")
 
-    late_night = late_night_spend_count(conn, tz=tz)
     if late_night >= 5:
         nudges.append("Late-night spending is up this week.")
 
     if not nudges:
         nudges.append("Nice steady day yesterday.")
 
-    headline = f"Yesterday: £{total_spend/100:.2f} spent"
+    headline = f"{label}: £{total_spend/100:.2f} spent"
     why = summary_lines[0] if summary_lines else "No spend recorded"
     action = nudges[0]
 
     payload = {
+        "day": start.date().isoformat(),
         "headline": headline,
         "why": why,
         "action": action,
@@ -218,7 +230,8 @@ def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -
 
     if notifier:
         message = f"{why}. {action}"
-        notifier.send(Notification(title=headline, message=message), conn=conn)
+        with telemetry.phase("notify"):
+            notifier.send(Notification(title=headline, message=message), conn=conn)
 
     return payload
 
@@ -226,11 +239,12 @@ def nightly_report(conn, tz: ZoneInfo, notifier: PushoverClient | None = None) -
 def monthly_review(
     conn,
     tz: ZoneInfo,
-    notifier: PushoverClient | None = None,
+    notifier: PushoverClient | Outbox | None = None,
     chatgpt_client: ChatGPTClient | None = None,
 ) -> dict:
-    salaries = detect_salary(conn)
-    recurring = recurring_merchants(conn)
+    with telemetry.phase("heuristics"):
+        salaries = detect_salary(conn)
+        recurring = recurring_merchants(conn)
 
     summary = []
     if salaries:
@@ -244,8 +258,9 @@ def monthly_review(
         summary.append("Not enough data yet for strong patterns.")
 
     selected_goals = normalize_selected_goals(get_rule(conn, "insight_goals"))
-    adaptive_signals = _adaptive_signals(conn, selected_goals)
-    spending_context = _build_spending_context(conn, tz)
+    with telemetry.phase("heuristics"):
+        adaptive_signals = _adaptive_signals(conn, selected_goals)
+        spending_context = _build_spending_context(conn, tz)
     llm_context = {**spending_context, "adaptive_signals": adaptive_signals}
     insights = _personalize_insights(chatgpt_client, llm_context, selected_goals)
 
@@ -262,7 +277,8 @@ def monthly_review(
 
     if notifier:
         top_message = insights[0]["final_message"] if insights else "No insights available"
-        notifier.send(Notification(title="Monthly review", message=top_message), conn=conn)
+        with telemetry.phase("notify"):
+            notifier.send(Notification(title="Monthly review", message=top_message), conn=conn)
 
     conn.execute(
         """
@@ -0,0 +1,168 @@
+import itertools
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import Iterable, Iterator
+
+from .breakthroughs import (
+    evaluate_breakthrough,
+    metric_value,
+    rolling_baseline,
+    score_week,
+)
+from .drift import DRIFT_WINDOW_WEEKS, RECENT_EVENT_COOLDOWN_DAYS, evaluate_drift
+from .goal_rules import V1_RULES, BreakthroughRule
+from .weekly_metrics import load_weekly_metrics, week_start
+
+BASELINE_WEEKS = 6
+GRID_PARAMETERS = ("improvement_target", "trigger_green_weeks", "green_threshold_ratio")
+
+# Cooldowns expressed in scored weeks: the weekly review stamps events one
+# week after the scored week, so a breakthrough blocks the following week and
+# a drift event the following three.
+_BREAKTHROUGH_GAP_WEEKS = 2
+_DRIFT_GAP_WEEKS = (RECENT_EVENT_COOLDOWN_DAYS + 7) // 7 + 1
+
+
+@dataclass(frozen=True)
+class GoalHistory:
+    goal_name: str
+    rule: BreakthroughRule
+    weeks: tuple[date, ...]
+    values: tuple[float, ...]
+    baselines: tuple[float, ...]
+
+
+def load_histories(
+    conn,
+    goal_names: Iterable[str] | None = None,
+    first: date | None = None,
+    last: date | None = None,
+) -> list[GoalHistory]:
+    """Per-goal weekly metric values and baselines from ``weekly_metrics``.
+
+    Read once; every simulated parameter set reuses them. Baselines are
+    derived from scratch the way a freshly seeded goal would get them.
+    """
+    bounds = conn.execute("SELECT MIN(week_start), MAX(week_start) FROM weekly_metrics").fetchone()
+    if not bounds[0]:
+        return []
+    first_week = week_start(first) if first else date.fromisoformat(bounds[0]) + timedelta(weeks=BASELINE_WEEKS)
+    last_week = week_start(last) if last else date.fromisoformat(bounds[1])
+    weekly = load_weekly_metrics(
+        conn, first_week - timedelta(weeks=BASELINE_WEEKS), last_week + timedelta(weeks=1)
+    )
+    weeks = tuple(ws for ws in weekly if ws >= first_week)
+
+    histories = []
+    for name in goal_names or V1_RULES:
+        rule = V1_RULES[name]
+        if rule.metric is None:
+            continue
+        values = []
+        baselines = []
+        baseline = 0.0
+        for ws in weeks:
+            if not baseline:
+                baseline = rolling_baseline(weekly, rule.metric.name, ws + timedelta(weeks=1), BASELINE_WEEKS)
+            values.append(metric_value(weekly[ws], rule.metric.name))
+            baselines.append(baseline)
+        histories.append(GoalHistory(name, rule, weeks, tuple(values), tuple(baselines)))
+    return histories
+
+
+def _scores(history: GoalHistory, green_ratio: float) -> list[int]:
+    return [
+        score_week(value, baseline, history.goal_name, green_ratio)
+        for value, baseline in zip(history.values, history.baselines)
+    ]
+
+
+def _fire(triggers: Iterable[bool], gap_weeks: int) -> list[int]:
+    fired: list[int] = []
+    for i, triggered in enumerate(triggers):
+        if triggered and (not fired or i - fired[-1] >= gap_weeks):
+            fired.append(i)
+    return fired
+
+
+def _rows(history: GoalHistory, scores: list[int]) -> list[tuple]:
+    return list(zip((ws.isoformat() for ws in history.weeks), history.values, scores))
+
+
+def _breakthrough_weeks(history: GoalHistory, rows: list[tuple], rule: BreakthroughRule) -> list[str]:
+    # As live: only the last trigger_window_weeks count, so a green-weeks
+    # requirement above the window never fires.
+    window = rule.trigger_window_weeks
+    fired = _fire(
+        (
+            evaluate_breakthrough(
+                rule, history.goal_name, history.baselines[i], rows[max(0, i - window + 1) : i + 1][::-1]
+            )
+            is not None
+            for i in range(len(rows))
+        ),
+        _BREAKTHROUGH_GAP_WEEKS,
+    )
+    return [rows[i][0] for i in fired]
+
+
+def _drift_weeks(history: GoalHistory, rows: list[tuple]) -> list[str]:
+    fired = _fire(
+        (
+            evaluate_drift(rows[max(0, i - DRIFT_WINDOW_WEEKS + 1) : i + 1][::-1], history.baselines[i])
+            is not None
+            for i in range(len(rows))
+        ),
+        _DRIFT_GAP_WEEKS,
+    )
+    return [rows[i][0] for i in fired]
+
+
+def simulate(history: GoalHistory, rule: BreakthroughRule) -> dict:
+    """Weeks in which ``rule`` would have produced breakthroughs and drift events."""
+    rows = _rows(history, _scores(history, rule.green_threshold_ratio))
+    return {
+        "breakthrough_weeks": _breakthrough_weeks(history, rows, rule),
+        "drift_weeks": _drift_weeks(history, rows),
+    }
+
+
+def run_grid(histories: list[GoalHistory], grid: dict[str, list]) -> Iterator[dict]:
+    """Evaluate every combination in ``grid`` (keys from ``GRID_PARAMETERS``) per goal.
+
+    Parameters missing from ``grid`` keep each rule's own value. Scores and
+    drift depend only on the green ratio, so both are computed once per ratio.
+    """
+    unknown = set(grid) - set(GRID_PARAMETERS)
+    if unknown:
+        raise ValueError(f"unknown grid parameters: {', '.join(sorted(unknown))}")
+    for history in histories:
+        axes = {key: grid.get(key) or [getattr(history.rule, key)] for key in GRID_PARAMETERS}
+        by_ratio: dict[float, tuple[list[tuple], list[str]]] = {}
+        for combo in itertools.product(*axes.values()):
+            params = dict(zip(axes, combo))
+            ratio = params["green_threshold_ratio"]
+            if ratio not in by_ratio:
+                rows = _rows(history, _scores(history, ratio))
+                by_ratio[ratio] = (rows, _drift_weeks(history, rows))
+            rows, drift_weeks = by_ratio[ratio]
+            breakthrough_weeks = _breakthrough_weeks(history, rows, replace(history.rule, **params))
+            yield {
+                "goal": history.goal_name,
+                **params,
+                "breakthroughs": len(breakthrough_weeks),
+                "drift_events": len(drift_weeks),
+                "breakthrough_weeks": breakthrough_weeks,
+                "drift_weeks": drift_weeks,
+            }
+
+
+def parse_grid_values(raw: str, cast=float) -> list:
+    """``"a,b,c"`` or an inclusive ``"start:stop:step"`` range."""
+    if ":" in raw:
+        start, stop, step = (cast(part) for part in raw.split(":"))
+        if step <= 0:
+            raise ValueError(f"step must be positive: {raw}")
+        count = int(round((stop - start) / step)) + 1
+        return [cast(round(start + n * step, 6)) for n in range(max(0, count))]
+    return [cast(part) for part in raw.split(",") if part.strip()]
@@ -0,0 +1,155 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from .db import database_path
+
+logger = logging.getLogger("mentos.rule_store")
+
+# How stale a lookup may be with respect to writes from other processes.
+CHECK_INTERVAL_SECONDS = 5.0
+
+ChangeHook = Callable[[set[str]], None]
+
+
+def _diff(before: dict[str, Any], after: dict[str, Any]) -> set[str]:
+    return {key for key in before.keys() | after.keys() if before.get(key) != after.get(key)}
+
+
+class RuleStore:
+    """In-memory copy of the ``rules`` table.
+
+    The table is read once and lookups are served from memory. ``set_rule``
+    writes through to the cache; writes from other processes are noticed by
+    polling ``rules_version`` (bumped by triggers on ``rules``) at most every
+    ``check_interval`` seconds. Hooks registered with ``on_change`` receive
+    the set of keys whose values changed.
+    """
+
+    def __init__(self, check_interval: float = CHECK_INTERVAL_SECONDS) -> None:
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._rules: dict[str, Any] | None = None
+        self._version: int | None = None
+        self._checked_at = float("-inf")
+        self._hooks: list[ChangeHook] = []
+        self._derived: dict[str, tuple[frozenset[str], Any]] = {}
+
+    def _current_version(self, conn) -> int | None:
+        try:
+            row = conn.execute("SELECT version FROM rules_version WHERE id = 1").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def _rules_for(self, conn) -> dict[str, Any]:
+        now = time.monotonic()
+        if self._rules is not None and now - self._checked_at < self.check_interval:
+            return self._rules
+        version = self._current_version(conn)
+        self._checked_at = now
+        if self._rules is not None and version is not None and version == self._version:
+            return self._rules
+        rules = {key: json.loads(value) for key, value in conn.execute("SELECT key, value_json FROM rules")}
+        previous, self._rules, self._version = self._rules, rules, version
+        if previous is not None:
+            self._changed(_diff(previous, rules))
+        return rules
+
+    def _changed(self, keys: set[str]) -> None:
+        if not keys:
+            return
+        logger.debug("Rules changed: %s", sorted(keys))
+        for name, (depends_on, _) in list(self._derived.items()):
+            if depends_on & keys:
+                del self._derived[name]
+        for hook in list(self._hooks):
+            try:
+                hook(keys)
+            except Exception:
+                logger.exception("Rule change hook failed")
+
+    def get(self, conn, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._rules_for(conn).get(key)
+        return default if value is None else value
+
+    # Numeric getters keep an explicit 0; only a missing or blank rule
+    # falls back to the default.
+    def get_int(self, conn, key: str, default: int = 0) -> int:
+        value = self.get(conn, key)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, conn, key: str, default: float = 0.0) -> float:
+        value = self.get(conn, key)
+        if value is None or value == "":
+            return default
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_str(self, conn, key: str, default: str = "") -> str:
+        return str(self.get(conn, key) or default)
+
+    def get_list(self, conn, key: str) -> list:
+        value = self.get(conn, key)
+        return value if isinstance(value, list) else []
+
+    def all(self, conn) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._rules_for(conn))
+
+    def put(self, key: str, value: Any) -> None:
+        """Write-through after ``set_rule`` has committed ``key``."""
+        with self._lock:
+            if self._rules is None or self._rules.get(key) == value:
+                return
+            self._rules[key] = value
+            self._changed({key})
+
+    def invalidate(self) -> None:
+        """Re-read the table on the next lookup."""
+        with self._lock:
+            self._version = None
+            self._checked_at = float("-inf")
+
+    def on_change(self, hook: ChangeHook) -> None:
+        with self._lock:
+            self._hooks.append(hook)
+
+    def derive(self, conn, name: str, depends_on: set[str], build: Callable[[], Any]) -> Any:
+        """Cache ``build()`` until one of the ``depends_on`` rules changes."""
+        with self._lock:
+            self._rules_for(conn)
+            cached = self._derived.get(name)
+            if cached is None:
+                cached = self._derived[name] = (frozenset(depends_on), build())
+            return cached[1]
+
+
+_stores: dict[str, RuleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def rule_store(conn) -> RuleStore:
+    """The process-wide store for the database behind ``conn``."""
+    path = getattr(conn, "path", None)
+    if path is None:
+        path = database_path(conn)
+    if not path or path == ":memory:":
+        # Nothing to share with other connections; read through every time.
+        return RuleStore(check_interval=0)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = RuleStore()
+        return store
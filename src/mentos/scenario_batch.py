@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from .insights.cards import get_insight_cards
+from .insights.llm import LLMClient
+from .insights.types import InsightCard
+from .scenario_runner import run_scenario
+
+logger = logging.getLogger("mentos.scenario_batch")
+
+# Card registry loaded once per worker process by _init_worker.
+_CARDS: list[InsightCard] | None = None
+
+
+@dataclass(frozen=True)
+class ScenarioTask:
+    name: str
+    path: str | None = None
+    payload: str | None = None
+
+
+def iter_scenario_tasks(source: str) -> Iterator[ScenarioTask]:
+    """Yield scenarios from a fixture directory or a JSON-lines corpus file.
+
+    Corpus lines are passed to workers as raw text so the parent never holds
+    more than the in-flight window of fixtures in memory.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for fixture_path in sorted(path.glob("*.json")):
+            yield ScenarioTask(name=fixture_path.stem, path=str(fixture_path))
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            yield ScenarioTask(name=f"{path.stem}:{line_no}", payload=line)
+
+
+def _init_worker(cards_dir: str) -> None:
+    global _CARDS
+    _CARDS = get_insight_cards(cards_dir)
+
+
+def _load_fixture(task: ScenarioTask) -> dict:
+    if task.payload is not None:
+        return json.loads(task.payload)
+    return json.loads(Path(task.path).read_text())
+
+
+def _llm_for(task: ScenarioTask, fixture: dict, stubs_dir: str | None) -> LLMClient:
+    """Pick the LLM for a scenario: one stub file for all, a per-scenario stub, or live."""
+    if not stubs_dir:
+        return LLMClient()
+    if Path(stubs_dir).is_file():
+        return LLMClient(mock_response_path=stubs_dir)
+    stub_name = fixture.get("meta", {}).get("stub") or task.name
+    return LLMClient(mock_response_path=str(Path(stubs_dir) / f"{stub_name}.response.json"))
+
+
+def evaluate_task(
+    task: ScenarioTask,
+    *,
+    stubs_dir: str | None = None,
+    cards_dir: str = "insights/cards",
+    max_matches: int = 3,
+) -> dict:
+    cards = _CARDS if _CARDS is not None else get_insight_cards(cards_dir)
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        fixture = _load_fixture(task)
+        result = run_scenario(
+            fixture,
+            llm_client=_llm_for(task, fixture, stubs_dir),
+            max_matches=max_matches,
+            cards_dir=cards_dir,
+            cards=cards,
+            timings=timings,
+        )
+    except Exception as exc:
+        return {
+            "scenario": task.name,
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+            "timings_ms": timings,
+        }
+    timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+    return {
+        "scenario": task.name,
+        "status": "ok" if not result["validation_errors"] else "invalid",
+        "notifications": [n["insight_id"] for n in result["notifications"]],
+        "suppressed": result["suppressed"],
+        "validation_errors": result["validation_errors"],
+        "timings_ms": timings,
+    }
+
+
+def run_batch(
+    source: str,
+    *,
+    out: TextIO | None = None,
+    workers: int = 1,
+    stubs_dir: str | None = None,
+    cards_dir: str = "insights/cards",
+    max_matches: int = 3,
+    max_in_flight: int | None = None,
+) -> dict:
+    """Evaluate every scenario in ``source`` and stream one JSON line per result.
+
+    Results are written as they complete, so with ``workers > 1`` the output
+    order follows completion order rather than input order.
+    """
+    out = out or sys.stdout
+    counts = {"ok": 0, "invalid": 0, "error": 0}
+    started = time.perf_counter()
+
+    def _emit(record: dict) -> None:
+        counts[record["status"]] += 1
+        out.write(json.dumps(record, sort_keys=True) + "\n")
+
+    options = {"stubs_dir": stubs_dir, "cards_dir": cards_dir, "max_matches": max_matches}
+    tasks = iter_scenario_tasks(source)
+    if workers <= 1:
+        _init_worker(cards_dir)
+        for task in tasks:
+            _emit(evaluate_task(task, **options))
+    else:
+        window = max_in_flight or workers * 4
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(cards_dir,)
+        ) as pool:
+            pending = set()
+            for task in tasks:
+                pending.add(pool.submit(evaluate_task, task, **options))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _emit(future.result())
+            for future in wait(pending).done:
+                _emit(future.result())
+    out.flush()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    summary = {
+        **counts,
+        "total": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "scenarios_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info("Scenario batch complete: %s", json.dumps(summary))
+    return summary
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import time
+
 from .insights.cards import get_insight_cards
 from .insights.context import build_spend_context
 from .insights.llm import LLMClient, build_prompt
 from .insights.notifications import apply_notification_policy, serialize_notification
+from .insights.records import TxRecord
+from .insights.types import InsightCard
 from .insights.validator import validate_llm_response
 
+SCENARIO_PHASES = ("context", "prompt", "llm", "validation", "gating")
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
 
 def run_scenario(
     fixture: dict,
@@ -13,27 +23,51 @@ def run_scenario(
     llm_client: LLMClient | None = None,
     max_matches: int = 3,
     cards_dir: str = "insights/cards",
+    cards: list[InsightCard] | None = None,
+    timings: dict[str, float] | None = None,
+    records: list[TxRecord] | None = None,
 ) -> dict:
+    """Evaluate one fixture through the insight pipeline.
+
+    ``cards`` lets callers share an already-loaded card registry across many
+    scenarios; ``timings`` (if given) is filled with per-phase milliseconds
+    keyed by ``SCENARIO_PHASES``. ``records`` replaces the fixture's raw
+    transactions when the caller has already parsed them with ``to_records``.
+    """
     llm = llm_client or LLMClient()
+    if timings is None:
+        timings = {}
+    if cards is None:
+        cards = get_insight_cards(cards_dir)
     meta = fixture["meta"]
+
+    started = time.perf_counter()
     context = build_spend_context(
-        transactions=fixture["monzo"].get("transactions", []),
+        transactions=records if records is not None else fixture["monzo"].get("transactions", []),
         goals=fixture.get("goals", {}),
         prefs=fixture.get("preferences", {}),
         meta_now=meta["now"],
         timezone=meta["timezone"],
     )
+    timings["context"] = _elapsed_ms(started)
 
-    cards = get_insight_cards(cards_dir)
+    started = time.perf_counter()
     prompt = build_prompt(spend_context=context, cards=cards, max_matches=max_matches)
+    timings["prompt"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
     response = llm.complete(prompt)
+    timings["llm"] = _elapsed_ms(started)
 
+    started = time.perf_counter()
     validation = validate_llm_response(
         response=response,
         spend_context=context,
         max_matches=max_matches,
         cards_dir=cards_dir,
+        cards=cards,
     )
+    timings["validation"] = _elapsed_ms(started)
 
     if not validation.valid:
         return {
@@ -43,6 +77,7 @@ def run_scenario(
             "suppressed": [{"reason": "validation_failed"}],
         }
 
+    started = time.perf_counter()
     gate = apply_notification_policy(
         matches=response["matches"],
         prefs=context["preferences"],
@@ -50,9 +85,11 @@ def run_scenario(
         now_iso=context["meta"]["now"],
         timezone=context["meta"]["timezone"],
         cards_dir=cards_dir,
+        cards=cards,
     )
 
     notifications = [serialize_notification(m, "queued", context["meta"]["now"]) for m in gate.allowed]
+    timings["gating"] = _elapsed_ms(started)
 
     return {
         "spend_context": context,
@@ -0,0 +1,249 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from . import tracing
+from .chatgpt import ChatGPTClient
+from .db import connect
+from .jobs import (
+    daily_sweep,
+    deliver_notifications,
+    monthly_review,
+    nightly_report,
+    poll_and_aggregate,
+    reconcile_pending,
+    weekly_breakthrough_review,
+)
+from .notifications import PushoverClient
+from .outbox import Outbox
+
+logger = logging.getLogger("mentos.scheduler")
+
+# Jobs write from separate connections; wait for a competing writer instead
+# of failing with "database is locked".
+BUSY_TIMEOUT_MS = 30000
+# Bound on slots replayed for one calendar job after a long outage.
+MAX_CATCH_UP_SLOTS = 31
+
+
+@dataclass(frozen=True)
+class Every:
+    minutes: int
+
+    def last_slot(self, now: datetime) -> datetime:
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        step = timedelta(minutes=self.minutes)
+        return midnight + ((now - midnight) // step) * step
+
+
+@dataclass(frozen=True)
+class Daily:
+    hour: int
+    minute: int
+
+    def last_slot(self, now: datetime) -> datetime:
+        slot = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        return slot if slot <= now else slot - timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class Weekly:
+    weekday: int
+    hour: int
+    minute: int
+
+    def last_slot(self, now: datetime) -> datetime:
+        slot = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        slot -= timedelta(days=(now.weekday() - self.weekday) % 7)
+        return slot if slot <= now else slot - timedelta(weeks=1)
+
+
+@dataclass(frozen=True)
+class Monthly:
+    day: int
+    hour: int
+    minute: int
+
+    def last_slot(self, now: datetime) -> datetime:
+        slot = now.replace(day=self.day, hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if slot <= now:
+            return slot
+        previous = slot.replace(day=1) - timedelta(days=1)
+        return slot.replace(year=previous.year, month=previous.month)
+
+
+@dataclass(frozen=True)
+class Job:
+    """A named unit of work and when it is due.
+
+    ``run`` receives a connection owned by the worker thread and the slot
+    being run, so run keys derive from the schedule rather than the moment
+    the worker happened to start. Set ``catch_up`` only for jobs that do the
+    work *for* the slot they are given; others would repeat today's work.
+    """
+
+    name: str
+    schedule: Every | Daily | Weekly | Monthly
+    run: Callable[..., None]
+    catch_up: bool = False
+
+
+class Scheduler:
+    """Dispatches due jobs onto a worker pool.
+
+    Each job has its own lock, so a slow run is never overlapped by the next
+    one, while independent jobs proceed in parallel. Jobs are offered their
+    most recent slot. Calendar jobs marked ``catch_up`` are also offered every
+    slot since their latest ``job_runs`` entry (up to ``MAX_CATCH_UP_SLOTS``),
+    oldest first, so days missed while the process was down are caught up
+    one by one; ``run_idempotent`` skips any slot already recorded.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        jobs: list[Job],
+        tz: ZoneInfo,
+        workers: int = 4,
+        tick_seconds: float = 15,
+    ) -> None:
+        self.db_path = db_path
+        self.jobs = jobs
+        self.tz = tz
+        self.tick_seconds = tick_seconds
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mentos-job")
+        self._locks = {job.name: threading.Lock() for job in jobs}
+        self._dispatched: dict[str, datetime] = {}
+        self._stop = threading.Event()
+
+    def tick(self, now: datetime | None = None) -> list[Future]:
+        """Submit every job whose latest slot has not been dispatched yet."""
+        now = now or datetime.now(self.tz)
+        futures = []
+        for job in self.jobs:
+            slot = job.schedule.last_slot(now)
+            if self._dispatched.get(job.name) == slot:
+                continue
+            lock = self._locks[job.name]
+            if not lock.acquire(blocking=False):
+                logger.info("Job %s still running; %s deferred", job.name, slot.isoformat())
+                continue
+            self._dispatched[job.name] = slot
+            try:
+                slots = self._due_slots(job, slot)
+            except Exception:
+                lock.release()
+                raise
+            futures.append(self._pool.submit(self._execute, job, slots, lock))
+        return futures
+
+    def _due_slots(self, job: Job, latest: datetime) -> list[datetime]:
+        if not job.catch_up or isinstance(job.schedule, Every):
+            return [latest]
+        last_run = self._last_run(job.name)
+        if last_run is None:
+            # Never ran here: start from now rather than replaying history.
+            return [latest]
+        slots = [latest]
+        while len(slots) < MAX_CATCH_UP_SLOTS:
+            previous = job.schedule.last_slot(slots[-1] - timedelta(microseconds=1))
+            if previous <= last_run:
+                break
+            slots.append(previous)
+        if len(slots) > 1:
+            logger.info("Job %s catching up %s missed slots", job.name, len(slots) - 1)
+        return slots[::-1]
+
+    def _last_run(self, job_name: str) -> datetime | None:
+        conn = connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT MAX(started_at) FROM job_runs WHERE job_name = ?", (job_name,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row[0]:
+            return None
+        # started_at is SQLite's datetime('now'), naive UTC.
+        started = datetime.fromisoformat(row[0]).replace(tzinfo=timezone.utc)
+        return started.astimezone(self.tz)
+
+    def _execute(self, job: Job, slots: list[datetime], lock: threading.Lock) -> None:
+        conn = connect(self.db_path)
+        try:
+            for slot in slots:
+                try:
+                    # Each job run is the root of its own trace.
+                    with tracing.span(f"job.{job.name}", slot=slot.isoformat()):
+                        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+                        job.run(conn, slot)
+                except Exception:
+                    logger.exception("Job %s failed for %s", job.name, slot.isoformat())
+        finally:
+            conn.close()
+            lock.release()
+
+    def run_forever(self) -> None:
+        logger.info("Scheduler starting with %s jobs", len(self.jobs))
+        try:
+            while not self._stop.is_set():
+                self.tick()
+                self._stop.wait(self.tick_seconds)
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+def default_jobs(
+    tz: ZoneInfo,
+    token: str | None,
+    notifier: PushoverClient | None,
+    chatgpt_client: ChatGPTClient | None,
+    poll_minutes: int = 5,
+    reconcile_minutes: int = 60,
+) -> list[Job]:
+    # Jobs queue their notifications; the delivery job sends them.
+    outbox = Outbox() if notifier else None
+    jobs = [
+        Job("poll_and_aggregate", Every(poll_minutes), lambda conn, slot: poll_and_aggregate(conn, token, now=slot)),
+        Job(
+            "reconcile_pending",
+            Every(reconcile_minutes),
+            lambda conn, slot: reconcile_pending(conn, token, now=slot),
+        ),
+        Job("daily_sweep", Daily(0, 5), lambda conn, slot: daily_sweep(conn, tz, token, now=slot)),
+        # The only calendar job that works for its slot's day; the sweep moves
+        # money and the reviews use the real clock, so they only run once.
+        Job(
+            "nightly_report",
+            Daily(0, 10),
+            lambda conn, slot: nightly_report(conn, tz, outbox, now=slot),
+            catch_up=True,
+        ),
+        Job(
+            "weekly_breakthrough_review",
+            Weekly(0, 9, 5),
+            lambda conn, slot: weekly_breakthrough_review(
+                conn, tz, outbox, chatgpt_client=chatgpt_client, now=slot
+            ),
+        ),
+        Job(
+            "monthly_review",
+            Monthly(1, 9, 0),
+            lambda conn, slot: monthly_review(conn, tz, outbox, chatgpt_client=chatgpt_client, now=slot),
+        ),
+    ]
+    if notifier:
+        jobs.append(
+            Job("deliver_notifications", Every(1), lambda conn, slot: deliver_notifications(conn, tz, notifier, now=slot))
+        )
+    return jobs
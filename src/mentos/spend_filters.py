@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from .storage import get_rule
+from .rule_store import rule_store
+
+FILTER_RULES = {"exclude_categories", "exclude_description_keywords"}
 
 
 def build_spend_filter_clause(conn) -> tuple[str, list[Any]]:
@@ -11,11 +13,19 @@ def build_spend_filter_clause(conn) -> tuple[str, list[Any]]:
     Supported rules:
     - exclude_categories: JSON array of categories to exclude.
     - exclude_description_keywords: JSON array of case-insensitive substrings.
+
+    The clause is rebuilt only when one of those rules changes.
     """
+    rules = rule_store(conn)
+    clause, params = rules.derive(conn, "spend_filter_clause", FILTER_RULES, lambda: _build_clause(conn, rules))
+    return clause, list(params)
+
+
+def _build_clause(conn, rules) -> tuple[str, list[Any]]:
     clauses: list[str] = []
     params: list[Any] = []
 
-    categories = get_rule(conn, "exclude_categories") or []
+    categories = rules.get(conn, "exclude_categories", [])
     if isinstance(categories, list):
         categories = [c for c in categories if isinstance(c, str) and c]
         if categories:
@@ -23,7 +33,7 @@ def build_spend_filter_clause(conn) -> tuple[str, list[Any]]:
             clauses.append(f"COALESCE(category, '') NOT IN ({placeholders})")
             params.extend(categories)
 
-    keywords = get_rule(conn, "exclude_description_keywords") or []
+    keywords = rules.get(conn, "exclude_description_keywords", [])
     if isinstance(keywords, list):
         keywords = [k.lower() for k in keywords if isinstance(k, str) and k]
         for keyword in keywords:
@@ -2,14 +2,26 @@ import json
 import sqlite3
 import uuid
 from datetime import datetime
-from typing import Any, Optional
-
-from .crypto import encrypt, decrypt
+from typing import Any, Iterable, Optional
 
+from .rule_store import rule_store
 
 DEFAULT_USER_ID = "user_1"
 DEFAULT_CONN_ID = "monzo_default"
 
+DEFAULT_RULES: dict[str, Any] = {
+    "poll_interval_minutes": 5,
+    "reconcile_interval_minutes": 60,
+    "max_notifications_per_day": 6,
+    "quiet_hours_start": "22:00",
+    "quiet_hours_end": "07:00",
+    "sweep_enabled": False,
+    "exclude_categories": ["transfers", "savings"],
+    "exclude_description_keywords": ["pot_"],
+    "insight_goals": ["balanced"],
+    "llm_copy_deadline_seconds": 15,
+}
+
 
 def ensure_user(conn: sqlite3.Connection) -> str:
     cur = conn.execute("SELECT id FROM users WHERE id = ?", (DEFAULT_USER_ID,))
@@ -35,25 +47,29 @@ def set_rule(conn: sqlite3.Connection, user_id: str, key: str, value: Any) -> No
         (str(uuid.uuid4()), user_id, key, payload, now, now),
     )
     conn.commit()
+    rule_store(conn).put(key, json.loads(payload))
+
+
+def ensure_default_rules(
+    conn: sqlite3.Connection, user_id: str, overrides: dict[str, Any] | None = None
+) -> None:
+    defaults = {**DEFAULT_RULES, **(overrides or {})}
+    for key, value in defaults.items():
+        if get_rule(conn, key) is None:
+            set_rule(conn, user_id, key, value)
 
 
 def get_rule(conn: sqlite3.Connection, key: str) -> Optional[Any]:
-    cur = conn.execute("SELECT value_json FROM rules WHERE key = ?", (key,))
-    row = cur.fetchone()
-    if not row:
-        return None
-    return json.loads(row[0])
+    return rule_store(conn).get(conn, key)
 
 
 def list_rules(conn: sqlite3.Connection) -> dict[str, Any]:
-    cur = conn.execute("SELECT key, value_json FROM rules")
-    out: dict[str, Any] = {}
-    for row in cur.fetchall():
-        out[row[0]] = json.loads(row[1])
-    return out
+    return rule_store(conn).all(conn)
 
 
 def store_monzo_token(conn: sqlite3.Connection, user_id: str, key: bytes, token: str) -> None:
+    from .crypto import encrypt
+
     payload = encrypt(key, token.encode("utf-8"))
     now = datetime.utcnow().isoformat()
     conn.execute(
@@ -75,6 +91,8 @@ def load_monzo_token(conn: sqlite3.Connection, key: bytes) -> Optional[str]:
     row = cur.fetchone()
     if not row or row[0] is None:
         return None
+    from .crypto import decrypt
+
     return decrypt(key, row[0]).decode("utf-8")
 
 
@@ -104,6 +122,16 @@ def log_notification(conn: sqlite3.Connection, user_id: str, provider: str, payl
         """,
         (str(uuid.uuid4()), user_id, provider, json.dumps(payload), status, now, now),
     )
+    if status == "sent":
+        # Per-day counter read by can_send, keyed by the UTC day like created_at.
+        conn.execute(
+            """
+            INSERT INTO notification_daily_counts (user_id, day, sent)
+            VALUES (?, ?, 1)
+            ON CONFLICT(user_id, day) DO UPDATE SET sent = sent + 1
+            """,
+            (user_id, now[:10]),
+        )
     conn.commit()
 
 
@@ -130,6 +158,18 @@ def log_raw_event(conn: sqlite3.Connection, user_id: str, kind: str, payload: di
     conn.commit()
 
 
+def prune_job_runs(conn: sqlite3.Connection, job_names: Iterable[str], days: int) -> None:
+    names = list(job_names)
+    conn.execute(
+        f"""
+        DELETE FROM job_runs
+        WHERE job_name IN ({",".join("?" for _ in names)}) AND started_at < datetime('now', ?)
+        """,
+        (*names, f"-{days} days"),
+    )
+    conn.commit()
+
+
 def prune_raw_events(conn: sqlite3.Connection, days: int) -> None:
     conn.execute(
         "DELETE FROM raw_events WHERE received_at < datetime('now', ?)",
@@ -2,20 +2,22 @@ import logging
 from datetime import datetime
 
 from .monzo_client import MonzoClient
-from .storage import get_rule, log_transfer
+from .rule_store import rule_store
+from .storage import log_transfer
 
 logger = logging.getLogger("mentos.sweep")
 
 
 def run_daily_sweep(conn, token: str) -> dict:
-    enabled = get_rule(conn, "sweep_enabled")
+    rules = rule_store(conn)
+    enabled = rules.get(conn, "sweep_enabled")
     if enabled is False:
         return {"status": "skipped", "reason": "disabled"}
 
-    daily_pot_id = get_rule(conn, "daily_spend_pot_id")
-    savings_pot_id = get_rule(conn, "savings_pot_id")
-    min_residual = int(get_rule(conn, "sweep_min_residual") or 0)
-    max_amount = int(get_rule(conn, "sweep_max_amount") or 0)
+    daily_pot_id = rules.get(conn, "daily_spend_pot_id")
+    savings_pot_id = rules.get(conn, "savings_pot_id")
+    min_residual = rules.get_int(conn, "sweep_min_residual")
+    max_amount = rules.get_int(conn, "sweep_max_amount")
 
     if not daily_pot_id or not savings_pot_id:
         return {"status": "skipped", "reason": "missing pot ids"}
@@ -36,7 +38,7 @@ def run_daily_sweep(conn, token: str) -> dict:
     if amount <= 0:
         return {"status": "skipped", "reason": "zero amount"}
 
-    account_id = get_rule(conn, "primary_account_id")
+    account_id = rules.get(conn, "primary_account_id")
     if not account_id:
         cur = conn.execute("SELECT id FROM accounts LIMIT 1")
         row = cur.fetchone()
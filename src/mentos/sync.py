@@ -1,8 +1,12 @@
 import json
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
 
+from . import telemetry
+from .ingest import upsert_transactions
 from .monzo_client import MonzoClient, MonzoError
+from .pipeline import prefetch
 from .storage import (
     ensure_user,
     get_last_sync,
@@ -13,6 +17,12 @@ from .storage import (
 
 logger = logging.getLogger("mentos.sync")
 
+# Only catches transactions that show up late; pending->settled changes are
+# picked up by the reconcile stage instead of re-reading a wide window.
+LOOKBACK = timedelta(hours=1)
+# Transaction pages the fetcher may get ahead of the database writes.
+PREFETCH_PAGES = 4
+
 
 def _parse_iso(ts: str) -> str:
     return ts.replace("Z", "+00:00")
@@ -22,16 +32,7 @@ def _parse_dt(ts: str) -> datetime:
     return datetime.fromisoformat(_parse_iso(ts))
 
 
-def sync_all(conn, token: str) -> None:
-    user_id = ensure_user(conn)
-    client = MonzoClient(token)
-
-    try:
-        accounts = client.list_accounts()
-    except MonzoError as exc:
-        logger.error("Monzo accounts error: %s", exc)
-        raise
-
+def store_accounts(conn, user_id: str, accounts: dict) -> None:
     log_raw_event(conn, user_id, "monzo.accounts", accounts)
     for acc in accounts.get("accounts", []):
         conn.execute(
@@ -51,6 +52,25 @@ def sync_all(conn, token: str) -> None:
         )
     conn.commit()
 
+
+def sync_all(
+    conn,
+    token: str,
+    client: MonzoClient | None = None,
+    lookback: timedelta = LOOKBACK,
+    prefetch_pages: int = PREFETCH_PAGES,
+) -> None:
+    user_id = ensure_user(conn)
+    client = client or MonzoClient(token)
+
+    try:
+        accounts = client.list_accounts()
+    except MonzoError as exc:
+        logger.error("Monzo accounts error: %s", exc)
+        raise
+
+    store_accounts(conn, user_id, accounts)
+
     account_id_for_pots = None
     # Prefer configured primary account id for pots
     try:
@@ -94,7 +114,7 @@ def sync_all(conn, token: str) -> None:
     last_sync = get_last_sync(conn)
     if last_sync:
         # small lookback to catch delayed/late transactions
-        last_sync_dt = _parse_dt(last_sync) - timedelta(days=2)
+        last_sync_dt = _parse_dt(last_sync) - lookback
         last_sync = last_sync_dt.isoformat()
         logger.info("Syncing transactions since %s (lookback)", last_sync)
     else:
@@ -103,6 +123,38 @@ def sync_all(conn, token: str) -> None:
         logger.info("No prior sync. Fetching last 30 days since %s", last_sync)
 
     max_seen_created = None
+    # Pages are fetched ahead on a background thread while this thread
+    # writes, so network and disk time overlap.
+    for account_id, txs in prefetch(_transaction_pages(client, accounts, last_sync), prefetch_pages):
+        log_raw_event(conn, user_id, "monzo.transactions", txs)
+        items = txs.get("transactions", [])
+        if not items:
+            continue
+        telemetry.count("rows_read", len(items))
+        for tx in items:
+            created = tx.get("created")
+            if created:
+                try:
+                    created_dt = _parse_dt(created)
+                    if max_seen_created is None or created_dt > max_seen_created:
+                        max_seen_created = created_dt
+                except Exception:
+                    pass
+        upsert_transactions(conn, user_id, account_id, items)
+        conn.commit()
+
+    if max_seen_created is not None:
+        update_last_sync(conn, max_seen_created.isoformat())
+    else:
+        update_last_sync(conn, datetime.now(timezone.utc).isoformat())
+
+    retention = 14
+    prune_raw_events(conn, retention)
+
+
+def _transaction_pages(client, accounts: dict, since: str) -> Iterator[tuple[str, dict]]:
+    """``(account_id, payload)`` for every transactions page fetched."""
+    last_sync = since
     for acc in accounts.get("accounts", []):
         account_id = acc.get("id")
         if not account_id:
@@ -125,47 +177,8 @@ def sync_all(conn, token: str) -> None:
                     continue
                 logger.error("Monzo transactions error: %s", exc)
                 raise
-            log_raw_event(conn, user_id, "monzo.transactions", txs)
+            yield account_id, txs
             items = txs.get("transactions", [])
-            if not items:
-                break
-            for tx in items:
-                merchant_name = None
-                merchant = tx.get("merchant")
-                if isinstance(merchant, dict):
-                    merchant_name = merchant.get("name")
-                created = tx.get("created")
-                if created:
-                    try:
-                        created_dt = _parse_dt(created)
-                        if max_seen_created is None or created_dt > max_seen_created:
-                            max_seen_created = created_dt
-                    except Exception:
-                        pass
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO transactions (
-                      id, user_id, account_id, amount, currency, description, merchant_name, category,
-                      is_load, is_pending, created_at, settled_at, raw_json
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        tx.get("id"),
-                        user_id,
-                        account_id,
-                        tx.get("amount", 0),
-                        tx.get("currency"),
-                        tx.get("description"),
-                        merchant_name,
-                        tx.get("category"),
-                        1 if tx.get("is_load") else 0,
-                        1 if tx.get("settled") is None and tx.get("created") else 0,
-                        _parse_iso(tx.get("created", datetime.now(timezone.utc).isoformat())),
-                        _parse_iso(tx.get("settled")) if tx.get("settled") else None,
-                        json.dumps(tx),
-                    ),
-                )
-            conn.commit()
             if len(items) < 100:
                 break
             before = items[-1].get("created")
@@ -175,11 +188,3 @@ def sync_all(conn, token: str) -> None:
                         break
                 except Exception:
                     pass
-
-    if max_seen_created is not None:
-        update_last_sync(conn, max_seen_created.isoformat())
-    else:
-        update_last_sync(conn, datetime.now(timezone.utc).isoformat())
-
-    retention = 14
-    prune_raw_events(conn, retention)
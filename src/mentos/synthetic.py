@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+# Generic, made-up merchant names. Production code must stay merchant-name
+# agnostic, so the generator builds names from neutral word lists.
+_NAME_PREFIXES = (
+    "Corner", "Green", "Urban", "Little", "Golden", "River", "Market", "North",
+    "Harbour", "Maple", "Bright", "Station", "Copper", "Orchard", "Union", "Velvet",
+)
+_NAME_SUFFIXES = {
+    "groceries": ("Grocer", "Market", "Foods", "Pantry", "Larder"),
+    "eating_out": ("Kitchen", "Cafe", "Bistro", "Noodles", "Bakery", "Diner", "Deli"),
+    "transport": ("Cabs", "Rail", "Fuel", "Bikes"),
+    "shopping": ("Outfitters", "Goods", "Books", "Hardware", "Supply"),
+    "entertainment": ("Cinema", "Arcade", "Tickets", "Lanes"),
+    "personal_care": ("Pharmacy", "Barbers", "Salon"),
+    "bills": ("Energy", "Water", "Mobile", "Broadband"),
+}
+
+# (category, relative weight, min pence, max pence, late-night share)
+_DISCRETIONARY = (
+    ("groceries", 24, 300, 9000, 0.02),
+    ("eating_out", 30, 250, 4500, 0.18),
+    ("transport", 14, 150, 3500, 0.10),
+    ("shopping", 14, 500, 12000, 0.05),
+    ("entertainment", 8, 600, 6000, 0.30),
+    ("personal_care", 6, 400, 5000, 0.0),
+    ("general", 4, 100, 2500, 0.05),
+)
+
+_SUBSCRIPTIONS = (
+    ("Stream Box", "entertainment", 1099),
+    ("Tune Cloud", "entertainment", 1199),
+    ("Fit Studio", "personal_care", 3500),
+    ("Cloud Drive", "bills", 299),
+    ("News Daily", "entertainment", 799),
+    ("Game Pass Plus", "entertainment", 899),
+    ("Mobile Plan", "bills", 1800),
+    ("Broadband Co", "bills", 3200),
+)
+
+
+@dataclass
+class SyntheticUser:
+    user_id: str
+    accounts: dict
+    pots: dict
+    transactions: list[dict]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _merchant_pool(rng: random.Random, category: str, size: int) -> list[dict]:
+    suffixes = _NAME_SUFFIXES.get(category, ("Store",))
+    names = sorted({f"{rng.choice(_NAME_PREFIXES)} {rng.choice(suffixes)}" for _ in range(size)})
+    return [
+        {"id": f"merch_{category}_{index:03d}", "name": name, "category": category}
+        for index, name in enumerate(names)
+    ]
+
+
+def _tx(
+    *,
+    tx_id: str,
+    account_id: str,
+    created: datetime,
+    amount: int,
+    category: str,
+    description: str,
+    merchant: dict | None,
+    pending: bool,
+) -> dict:
+    return {
+        "id": tx_id,
+        "account_id": account_id,
+        "created": _iso(created),
+        "settled": None if pending else _iso(created + timedelta(seconds=5)),
+        "amount": amount,
+        "currency": "GBP",
+        "description": description,
+        "merchant": (
+            {"id": merchant["id"], "name": merchant["name"], "category": merchant["category"], "online": False}
+            if merchant
+            else None
+        ),
+        "category": category,
+        "is_load": False,
+        "notes": "",
+        "metadata": {},
+    }
+
+
+def iter_transactions(
+    *,
+    seed: int,
+    index: int = 0,
+    transactions: int = 1000,
+    end: datetime | None = None,
+    days: int | None = None,
+    per_day: float = 6.0,
+) -> Iterator[dict]:
+    """Yield roughly ``transactions`` Monzo-shaped transactions, oldest first.
+
+    Each user gets a monthly payday, a handful of fixed-day subscriptions,
+    periodic pot transfers and a late-night-leaning share of discretionary
+    spend. Output depends only on ``seed``, ``index`` and ``end``, so runs
+    are reproducible. Transactions created in the last day are left pending.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    end = (end or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    span_days = days or max(30, int(transactions / per_day + 0.999))
+    start_day = (end - timedelta(days=span_days)).date()
+    account_id = f"acc_{index:05d}"
+
+    pools = {category: _merchant_pool(rng, category, 8) for category, *_ in _DISCRETIONARY}
+    weights = [weight for _, weight, *_ in _DISCRETIONARY]
+    payday = rng.randint(24, 28)
+    salary = rng.randrange(180000, 420000, 500)
+    employer = f"{rng.choice(_NAME_PREFIXES).upper()} LTD"
+    subscriptions = [
+        (name, category, amount, rng.randint(1, 28))
+        for name, category, amount in rng.sample(_SUBSCRIPTIONS, rng.randint(3, 6))
+    ]
+    pot_day = rng.randint(1, 7)
+
+    base, remainder = divmod(transactions, span_days)
+    seq = 0
+    for day_offset in range(span_days):
+        day = start_day + timedelta(days=day_offset + 1)
+        quota = base + (1 if day_offset < remainder else 0)
+        day_start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        items: list[tuple[datetime, int, str, str, dict | None]] = []
+
+        if day.day == payday:
+            items.append((day_start + timedelta(hours=6), salary, "income", f"SALARY {employer}", None))
+        for name, category, amount, charge_day in subscriptions:
+            if day.day == charge_day:
+                merchant = {"id": f"merch_sub_{name.lower().replace(' ', '_')}", "name": name, "category": category}
+                items.append((day_start + timedelta(hours=3, minutes=rng.randint(0, 59)), -amount, category, name, merchant))
+        if day.weekday() == pot_day % 7 and rng.random() < 0.5:
+            items.append(
+                (day_start + timedelta(hours=12), -rng.randrange(1000, 20000, 500), "savings", "pot_savings", None)
+            )
+
+        for _ in range(max(0, quota - len(items))):
+            category, _, low, high, late_share = rng.choices(_DISCRETIONARY, weights=weights)[0]
+            if rng.random() < late_share:
+                hour = rng.choice((22, 23, 0, 1, 2, 3))
+            else:
+                hour = rng.randint(7, 21)
+            created = day_start + timedelta(hours=hour, minutes=rng.randint(0, 59), seconds=rng.randint(0, 59))
+            merchant = rng.choice(pools[category])
+            amount = -int(rng.triangular(low, high, low + (high - low) * 0.2))
+            items.append((created, amount, category, merchant["name"].upper(), merchant))
+
+        items.sort(key=lambda item: item[0])
+        for created, amount, category, description, merchant in items:
+            if created > end:
+                continue
+            seq += 1
+            yield _tx(
+                tx_id=f"tx_{index:05d}_{seq:07d}",
+                account_id=account_id,
+                created=created,
+                amount=amount,
+                category=category,
+                description=description,
+                merchant=merchant,
+                pending=created > end - timedelta(days=1),
+            )
+
+
+def generate_user(
+    *,
+    seed: int,
+    index: int = 0,
+    transactions: int = 1000,
+    end: datetime | None = None,
+    days: int | None = None,
+) -> SyntheticUser:
+    end = (end or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    txs = list(iter_transactions(seed=seed, index=index, transactions=transactions, end=end, days=days))
+    account_id = f"acc_{index:05d}"
+    opened = _iso(end - timedelta(days=900))
+    rng = random.Random(f"{seed}:{index}:pots")
+    return SyntheticUser(
+        user_id=f"user_{index + 1}",
+        accounts={
+            "accounts": [
+                {
+                    "id": account_id,
+                    "description": f"user_{index + 1}",
+                    "type": "uk_retail",
+                    "currency": "GBP",
+                    "created": opened,
+                }
+            ]
+        },
+        pots={
+            "pots": [
+                {
+                    "id": f"pot_daily_{index:05d}",
+                    "name": "Daily Spend",
+                    "balance": rng.randrange(0, 20000),
+                    "currency": "GBP",
+                    "created": opened,
+                },
+                {
+                    "id": f"pot_savings_{index:05d}",
+                    "name": "Savings",
+                    "balance": rng.randrange(50000, 1500000),
+                    "currency": "GBP",
+                    "created": opened,
+                },
+            ]
+        },
+        transactions=txs,
+    )
+
+
+def iter_users(
+    *,
+    users: int,
+    transactions_per_user: int,
+    seed: int,
+    end: datetime | None = None,
+) -> Iterator[SyntheticUser]:
+    end = end or datetime.now(timezone.utc)
+    for index in range(users):
+        yield generate_user(seed=seed, index=index, transactions=transactions_per_user, end=end)
+
+
+def to_fixture(user: SyntheticUser, *, now: datetime, tz_name: str = "Europe/London") -> dict:
+    """Shape a synthetic user as a scenario fixture for ``run_scenario``."""
+    since = now - timedelta(days=90)
+    window = [tx for tx in user.transactions if tx["created"] >= _iso(since)]
+    return {
+        "meta": {"timezone": tz_name, "now": _iso(now), "user_id": user.user_id},
+        "goals": {"active_goal_ids": [], "active_goal_tags": ["saving_more"]},
+        "preferences": {
+            "tone": "supportive",
+            "quiet_hours": {"start": "22:00", "end": "07:00"},
+            "max_notifications_per_day": 1,
+        },
+        "monzo": {"transactions": window},
+        "previous_notifications": [],
+    }
+
+
+def write_monzo_dir(user: SyntheticUser, out_dir: str) -> None:
+    """Write accounts/pots/transactions JSON in the layout of ``scripts/mocks``."""
+    path = Path(out_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "monzo_accounts.json").write_text(json.dumps(user.accounts, indent=2))
+    (path / "monzo_pots.json").write_text(json.dumps(user.pots, indent=2))
+    with (path / "monzo_transactions.json").open("w", encoding="utf-8") as handle:
+        handle.write('{"transactions": [\n')
+        for position, tx in enumerate(user.transactions):
+            if position:
+                handle.write(",\n")
+            handle.write(json.dumps(tx))
+        handle.write("\n]}\n")
@@ -0,0 +1,117 @@
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from . import tracing
+
+# The run being measured. Worker threads each set their own; code that
+# hands work to another thread copies the context along with it.
+_current: ContextVar["RunMetrics | None"] = ContextVar("mentos_run_metrics", default=None)
+
+
+class RunMetrics:
+    """Per-phase wall time and counters for one job run."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_json(self) -> str:
+        with self._lock:
+            return json.dumps(
+                {
+                    "phases_ms": {k: round(v * 1000, 1) for k, v in self.phases.items()},
+                    "counters": dict(self.counters),
+                },
+                sort_keys=True,
+            )
+
+
+@contextmanager
+def recording() -> Iterator[RunMetrics]:
+    metrics = RunMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block against the current run, and trace it as a span when
+    tracing is on; a no-op outside a run with tracing off."""
+    metrics = _current.get()
+    if metrics is None:
+        with tracing.span(name):
+            yield
+        return
+    started = time.perf_counter()
+    try:
+        with tracing.span(name):
+            yield
+    finally:
+        metrics.add_time(name, time.perf_counter() - started)
+
+
+def count(name: str, n: int = 1) -> None:
+    metrics = _current.get()
+    if metrics is not None and n:
+        metrics.add(name, n)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def perf_summary(conn, runs: int = 50) -> list[dict]:
+    """p50/p95 per job and phase over each job's last ``runs`` finished runs."""
+    cur = conn.execute(
+        """
+        SELECT job_name, duration_ms, metrics_json FROM (
+          SELECT job_name, duration_ms, metrics_json,
+                 ROW_NUMBER() OVER (PARTITION BY job_name ORDER BY started_at DESC) AS n
+          FROM job_runs
+          WHERE duration_ms IS NOT NULL
+        )
+        WHERE n <= ?
+        ORDER BY job_name
+        """,
+        (runs,),
+    )
+    samples: dict[tuple[str, str, str], list[float]] = {}
+    for job_name, duration_ms, metrics_json in cur.fetchall():
+        metrics = json.loads(metrics_json or "{}")
+        samples.setdefault((job_name, "total", "ms"), []).append(float(duration_ms))
+        for name, ms in metrics.get("phases_ms", {}).items():
+            samples.setdefault((job_name, name, "ms"), []).append(float(ms))
+        for name, value in metrics.get("counters", {}).items():
+            samples.setdefault((job_name, name, "count"), []).append(float(value))
+    return [
+        {
+            "job": job_name,
+            "metric": name,
+            "unit": unit,
+            "runs": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+        }
+        for (job_name, name, unit), values in samples.items()
+    ]
@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger("mentos.tracing")
+
+DEFAULT_TRACE_PATH = "./traces/mentos-trace.jsonl"
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+_STATEMENT_CHARS = 160
+
+_installed: "Tracer | None" = None
+# The span new spans are parented to. Code that hands work to another
+# thread copies the context along with it, as for telemetry.
+_current: ContextVar["_Span | None"] = ContextVar("mentos_trace_span", default=None)
+
+
+class _Span:
+    __slots__ = ("trace_id", "span_id", "attrs")
+
+    def __init__(self, trace_id: str, span_id: str, attrs: dict) -> None:
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.attrs = attrs
+
+
+def _new_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Tracer:
+    """Writes finished spans as JSON lines, rotating like ``RotatingFileHandler``.
+
+    ``path`` is rotated to ``path.1`` (and so on up to ``backups``) before it
+    would grow past ``max_bytes``. Each line carries the trace, span and parent
+    ids, the start time, the duration and the span's attributes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_TRACE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._handle = None
+
+    @classmethod
+    def from_env(cls) -> "Tracer | None":
+        if os.getenv("MENTOS_TRACE", "").strip().lower() not in {"1", "true", "yes", "on"}:
+            return None
+        return cls(
+            os.getenv("MENTOS_TRACE_PATH") or DEFAULT_TRACE_PATH,
+            int(os.getenv("MENTOS_TRACE_MAX_BYTES") or DEFAULT_MAX_BYTES),
+            int(os.getenv("MENTOS_TRACE_BACKUPS") or DEFAULT_BACKUPS),
+        )
+
+    def export(self, record: dict) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+            position = self._handle.tell()
+            if self.max_bytes and position and position + len(line) > self.max_bytes:
+                self._rotate()
+            self._handle.write(line)
+            self._handle.flush()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for n in range(self.backups - 1, 0, -1):
+            older = Path(f"{self.path}.{n}")
+            if older.exists():
+                older.replace(f"{self.path}.{n + 1}")
+        if self.backups:
+            self.path.replace(f"{self.path}.1")
+        else:
+            self.path.unlink()
+        self._handle = self.path.open("a", encoding="utf-8")
+
+    def files(self) -> list[Path]:
+        """Current and rotated trace files, oldest first."""
+        rotated = [Path(f"{self.path}.{n}") for n in range(self.backups, 0, -1)]
+        return [p for p in [*rotated, self.path] if p.exists()]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def install(tracer: Tracer | None) -> None:
+    """Export spans from this process to ``tracer`` (None turns tracing off)."""
+    global _installed
+    previous, _installed = _installed, tracer
+    if previous is not None and previous is not tracer:
+        previous.close()
+
+
+def enabled() -> bool:
+    return _installed is not None
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[None]:
+    """Trace a block as a child of the current span; a no-op unless installed."""
+    tracer = _installed
+    if tracer is None:
+        yield
+        return
+    parent = _current.get()
+    current = _Span(parent.trace_id if parent else _new_id(), _new_id(), attrs)
+    token = _current.set(current)
+    start = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _current.reset(token)
+        record = {
+            "trace_id": current.trace_id,
+            "span_id": current.span_id,
+            "parent_id": parent.span_id if parent else None,
+            "name": name,
+            "start": round(start, 6),
+            "duration_ms": round(duration * 1000, 3),
+            "thread": threading.current_thread().name,
+        }
+        if current.attrs:
+            record["attrs"] = current.attrs
+        if error:
+            record["error"] = error
+        try:
+            tracer.export(record)
+        except OSError:
+            logger.exception("Could not write span %s", name)
+
+
+def set_attr(key: str, value) -> None:
+    """Attach an attribute to the current span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.attrs[key] = value
+
+
+def sql_statement(sql: str) -> str:
+    return " ".join(sql.split())[:_STATEMENT_CHARS]
+
+
+def read_spans(paths: list[Path]) -> list[dict]:
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A process killed mid-write leaves a partial last line.
+                    continue
+    return spans
+
+
+def summarize(spans: list[dict]) -> list[dict]:
+    """Aggregate spans by their stack of names, flame-graph style.
+
+    Returns one row per distinct stack (root first) with the number of
+    spans, total wall time and self time (total minus direct children).
+    Spans whose parent was rotated away are treated as roots. Children run
+    on other threads can overlap, so self time is floored at zero.
+    """
+    by_id = {s["span_id"]: s for s in spans}
+    child_ms: dict[str, float] = {}
+    for s in spans:
+        if s.get("parent_id") in by_id:
+            child_ms[s["parent_id"]] = child_ms.get(s["parent_id"], 0.0) + s["duration_ms"]
+
+    stacks: dict[str, tuple[str, ...]] = {}
+
+    def stack_of(s: dict) -> tuple[str, ...]:
+        cached = stacks.get(s["span_id"])
+        if cached is not None:
+            return cached
+        parent = by_id.get(s.get("parent_id"))
+        stack = (*stack_of(parent), s["name"]) if parent else (s["name"],)
+        stacks[s["span_id"]] = stack
+        return stack
+
+    rows: dict[tuple[str, ...], dict] = {}
+    for s in spans:
+        stack = stack_of(s)
+        row = rows.setdefault(
+            stack, {"stack": stack, "count": 0, "total_ms": 0.0, "self_ms": 0.0, "errors": 0}
+        )
+        row["count"] += 1
+        row["total_ms"] += s["duration_ms"]
+        row["self_ms"] += max(0.0, s["duration_ms"] - child_ms.get(s["span_id"], 0.0))
+        row["errors"] += 1 if s.get("error") else 0
+    return sorted(rows.values(), key=lambda row: row["stack"])
+
+
+def folded(rows: list[dict]) -> str:
+    """``summarize`` rows as folded stacks (self time in microseconds) for
+    flamegraph.pl or speedscope."""
+    return "".join(
+        f"{';'.join(row['stack'])} {int(row['self_ms'] * 1000)}\n"
+        for row in rows
+        if row["self_ms"] > 0
+    )
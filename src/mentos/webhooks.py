@@ -0,0 +1,154 @@
+import hmac
+import json
+import logging
+import urllib.request
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .aggregates import daily_cells, refresh_daily_cells
+from .db import connect
+from .ingest import upsert_transactions
+from .storage import ensure_user, log_raw_event
+
+logger = logging.getLogger("mentos.webhooks")
+
+WEBHOOK_PATH = "/webhooks/monzo"
+TRANSACTION_EVENTS = {"transaction.created", "transaction.updated"}
+# The HTTP server is single threaded; give the reconciliation poller's
+# writes time to finish instead of failing with "database is locked".
+BUSY_TIMEOUT_MS = 30000
+
+
+class WebhookError(ValueError):
+    pass
+
+
+def _ensure_account(conn, user_id: str, account_id: str) -> None:
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO accounts (id, user_id, created_at)
+        VALUES (?, ?, ?)
+        """,
+        (account_id, user_id, datetime.now(timezone.utc).isoformat()),
+    )
+
+
+def handle_event(conn, event: dict) -> dict:
+    """Apply one Monzo webhook event.
+
+    A transaction event upserts that single transaction and recomputes only
+    the daily aggregate cells it left or entered; weekly metrics are kept
+    current by the ingest path. Other event types are acknowledged and
+    ignored.
+    """
+    kind = event.get("type")
+    if kind not in TRANSACTION_EVENTS:
+        return {"status": "ignored", "type": kind}
+    data = event.get("data") or {}
+    tx_id = data.get("id")
+    account_id = data.get("account_id")
+    if not tx_id or not account_id or not data.get("created"):
+        raise WebhookError("transaction event needs id, account_id and created")
+
+    user_id = ensure_user(conn)
+    log_raw_event(conn, user_id, f"monzo.webhook.{kind}", event)
+    _ensure_account(conn, user_id, account_id)
+    cells = daily_cells(conn, [tx_id])
+    upsert_transactions(conn, user_id, account_id, [data])
+    cells |= daily_cells(conn, [tx_id])
+    refresh_daily_cells(conn, cells)
+    conn.commit()
+    logger.info("Applied %s for %s (%s aggregate cells)", kind, tx_id, len(cells))
+    return {"status": "ok", "transaction_id": tx_id, "cells": len(cells)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "WebhookServer"
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != self.server.webhook_path:
+            self._reply(404, {"error": "not found"})
+            return
+        if self.server.secret:
+            supplied = (parse_qs(url.query).get("token") or [""])[0]
+            if not hmac.compare_digest(supplied, self.server.secret):
+                self._reply(403, {"error": "forbidden"})
+                return
+        conn = connect(self.server.db_path)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            length = int(self.headers.get("Content-Length") or 0)
+            event = json.loads(self.rfile.read(length) or b"{}")
+            result = handle_event(conn, event)
+        except (ValueError, AttributeError) as exc:
+            self._reply(400, {"error": str(exc)})
+            return
+        except Exception:
+            logger.exception("Webhook handling failed")
+            self._reply(500, {"error": "internal error"})
+            return
+        finally:
+            conn.close()
+        self._reply(200, result)
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class WebhookServer(HTTPServer):
+    """Receives Monzo webhooks on ``path`` and applies them to ``db_path``.
+
+    Requests are handled one at a time, each on its own connection. When
+    ``secret`` is set, callers must pass it as ``?token=`` (Monzo webhooks
+    are unsigned, so the secret lives in the registered URL).
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        db_path: str,
+        path: str = WEBHOOK_PATH,
+        secret: str | None = None,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.db_path = db_path
+        self.webhook_path = path
+        self.secret = secret
+
+
+def mock_events(mocks_dir: str) -> list[dict]:
+    """``transaction.created`` events for the mock transactions in ``mocks_dir``."""
+    root = Path(mocks_dir)
+    accounts = json.loads((root / "monzo_accounts.json").read_text()).get("accounts", [])
+    account_id = accounts[0]["id"] if accounts else "acc_mock"
+    transactions = json.loads((root / "monzo_transactions.json").read_text()).get("transactions", [])
+    return [
+        {"type": "transaction.created", "data": {"account_id": account_id, **tx}}
+        for tx in transactions
+    ]
+
+
+def post_events(url: str, events: list[dict], timeout: float = 10) -> list[dict]:
+    """POST each event to a webhook receiver, the way Monzo would."""
+    results = []
+    for event in events:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(event).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            results.append(json.loads(resp.read() or b"{}"))
+    return results
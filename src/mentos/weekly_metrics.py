@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from .goal_rules import METRICS, compile_terms, metric_terms
+from .storage import DEFAULT_USER_ID
+
+# Every term the registered goal metrics need; all of them are computed by
+# the same grouped statement, so adding a goal adds a column, not a scan.
+_TERMS = metric_terms(METRICS.values())
+WEEKLY_COMPONENTS = tuple(term.name for term in _TERMS)
+_TERM_COLUMNS, _TERM_PARAMS = compile_terms(_TERMS)
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def week_of(created_at: str) -> date:
+    """Monday of the UTC week an ISO ``created_at`` falls in."""
+    return week_start(date.fromisoformat(created_at[:10]))
+
+
+def _empty_weeks(first_week: date, end_week: date) -> dict[date, dict[str, float]]:
+    weeks: dict[date, dict[str, float]] = {}
+    ws = first_week
+    while ws < end_week:
+        weeks[ws] = dict.fromkeys(WEEKLY_COMPONENTS, 0.0)
+        ws += timedelta(weeks=1)
+    return weeks
+
+
+def weekly_components(
+    conn, first_week: date, end_week: date, user_id: str | None = None
+) -> dict[date, dict[str, float]]:
+    """Per-week metric inputs for every week in ``[first_week, end_week)``.
+
+    Computed from ``transactions`` with one grouped scan; weeks with no
+    settled rows are returned as zeros.
+    """
+    start = datetime.combine(first_week, datetime.min.time())
+    end = datetime.combine(end_week, datetime.min.time())
+    user_clause = " AND user_id = ?" if user_id else ""
+    cur = conn.execute(
+        f"""
+        SELECT
+          date(substr(created_at, 1, 10), '-6 days', 'weekday 1') AS week,
+          {_TERM_COLUMNS}
+        FROM transactions
+        WHERE created_at >= ? AND created_at < ? AND is_pending = 0{user_clause}
+        GROUP BY week
+        """,
+        (*_TERM_PARAMS, start.isoformat(), end.isoformat(), *([user_id] if user_id else [])),
+    )
+    weeks = _empty_weeks(first_week, end_week)
+    for row in cur.fetchall():
+        bucket = weeks.get(date.fromisoformat(row[0]))
+        if bucket is not None:
+            bucket.update(zip(WEEKLY_COMPONENTS, (float(v or 0) for v in row[1:])))
+    return weeks
+
+
+def refresh_weekly_metrics(conn, user_id: str, weeks: Iterable[date]) -> int:
+    """Recompute the stored metrics for ``weeks`` from ``transactions``.
+
+    Called from the ingest path with the weeks a batch touched, so synced,
+    settled and imported rows keep ``weekly_metrics`` current. The caller
+    owns the commit.
+    """
+    touched = sorted(set(weeks))
+    if not touched:
+        return 0
+    computed = weekly_components(conn, touched[0], touched[-1] + timedelta(weeks=1), user_id)
+    rows = [
+        (user_id, ws.isoformat(), metric, value)
+        for ws in touched
+        for metric, value in computed[ws].items()
+    ]
+    conn.executemany(
+        """
+        INSERT INTO weekly_metrics (user_id, week_start, metric, value, updated_at)
+        VALUES (?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(user_id, week_start, metric) DO UPDATE
+        SET value = excluded.value, updated_at = excluded.updated_at
+        """,
+        rows,
+    )
+    return len(touched)
+
+
+def rebuild_weekly_metrics(conn, user_id: str = DEFAULT_USER_ID) -> int:
+    """Materialize every week that has transactions, e.g. after a migration."""
+    first, last = conn.execute(
+        "SELECT MIN(created_at), MAX(created_at) FROM transactions WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+    if not first:
+        return 0
+    weeks = list(_empty_weeks(week_of(first), week_of(last) + timedelta(weeks=1)))
+    refreshed = refresh_weekly_metrics(conn, user_id, weeks)
+    conn.commit()
+    return refreshed
+
+
+def load_weekly_metrics(
+    conn, first_week: date, end_week: date, user_id: str = DEFAULT_USER_ID
+) -> dict[date, dict[str, float]]:
+    """Read stored metrics for ``[first_week, end_week)``; missing weeks are zeros."""
+    weeks = _empty_weeks(first_week, end_week)
+    cur = conn.execute(
+        """
+        SELECT week_start, metric, value FROM weekly_metrics
+        WHERE user_id = ? AND week_start >= ? AND week_start < ?
+        """,
+        (user_id, first_week.isoformat(), end_week.isoformat()),
+    )
+    for ws, metric, value in cur.fetchall():
+        bucket = weeks.get(date.fromisoformat(ws))
+        if bucket is not None and metric in bucket:
+            bucket[metric] = float(value)
+    return weeks
@@ -0,0 +1,91 @@
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from mentos.backfill import RateLimiter, backfill, plan_slices
+from mentos.db import apply_migrations, connect
+from mentos.monzo_client import MonzoError
+from mentos.monzo_stub import StubMonzoClient
+from mentos.synthetic import generate_user
+
+UNTIL = datetime(2026, 6, 1, tzinfo=timezone.utc)
+SINCE = date(2026, 2, 1)
+
+
+class VerificationStub(StubMonzoClient):
+    """Refuses anything older than ``cutoff``, like Monzo after SCA expires."""
+
+    cutoff = "2026-04-01"
+
+    def list_transactions(self, account_id, since=None, before=None):
+        if since and since < self.cutoff:
+            self._count("refused")
+            raise MonzoError(403, '{"code": "forbidden.verification_required"}')
+        return super().list_transactions(account_id, since=since, before=before)
+
+
+class BackfillTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        self.user = generate_user(seed=11, transactions=1500, end=UNTIL, days=200)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def _stub(self, cls=StubMonzoClient):
+        return cls(self.user.accounts, self.user.pots, self.user.transactions, page_size=100)
+
+    def _expected(self, slice_days: int) -> set[str]:
+        start = plan_slices(["acc"], SINCE, UNTIL, slice_days)[0].start.isoformat()
+        return {tx["id"] for tx in self.user.transactions if tx["created"].replace("Z", "+00:00") >= start}
+
+    def _ids(self) -> set[str]:
+        return {row[0] for row in self.conn.execute("SELECT id FROM transactions")}
+
+    def test_slices_cover_the_range_and_resume(self):
+        client = self._stub()
+        result = backfill(self.conn, "t", SINCE, until=UNTIL, client=client, slice_days=10, workers=3, requests_per_second=1000)
+        self.assertEqual(result["skipped"], 0)
+        self.assertEqual(result["fetched"], result["slices"])
+        self.assertEqual(self._ids(), self._expected(10))
+
+        again = self._stub()
+        result = backfill(self.conn, "t", SINCE, until=UNTIL, client=again, slice_days=10, workers=3, requests_per_second=1000)
+        self.assertEqual(result["skipped"], result["slices"])
+        self.assertNotIn("transactions", again.calls)
+
+    def test_verification_required_is_per_slice(self):
+        refused = self._stub(VerificationStub)
+        result = backfill(self.conn, "t", SINCE, until=UNTIL, client=refused, slice_days=7, requests_per_second=1000)
+        self.assertGreater(result["verification_required"], 0)
+        self.assertGreater(result["fetched"], 0)
+        self.assertLess(len(self._ids()), len(self._expected(7)))
+
+        retry = self._stub()
+        result = backfill(self.conn, "t", SINCE, until=UNTIL, client=retry, slice_days=7, requests_per_second=1000)
+        self.assertEqual(result["fetched"], result["slices"] - result["skipped"])
+        self.assertEqual(result["verification_required"], 0)
+        self.assertEqual(self._ids(), self._expected(7))
+
+    def test_slice_grid_is_stable_across_start_dates(self):
+        a = plan_slices(["acc"], date(2026, 3, 2), UNTIL, 7)
+        b = plan_slices(["acc"], date(2026, 3, 4), UNTIL, 7)
+        self.assertEqual(a[-5:], b[-5:])
+        self.assertEqual(a[-1].end, UNTIL)
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        started = time.perf_counter()
+        for _ in range(11):
+            limiter.acquire()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
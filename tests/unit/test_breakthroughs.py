@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+from mentos.breakthroughs import metric_value, seed_v1_goals, update_weekly_goal_progress
+from mentos.db import apply_migrations, connect
+from mentos.ingest import upsert_transactions
+from mentos.storage import ensure_user
+from mentos.weekly_metrics import load_weekly_metrics, weekly_components
+
+
+def _tx(tx_id: str, created: str, amount: int, category: str) -> dict:
+    return {
+        "id": tx_id,
+        "created": created,
+        "settled": created,
+        "amount": amount,
+        "currency": "GBP",
+        "description": category,
+        "category": category,
+    }
+
+
+class WeeklyMetricTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        user_id = ensure_user(self.conn)
+        self.conn.execute(
+            "INSERT INTO accounts (id, user_id, created_at) VALUES ('acc_1', ?, datetime('now'))",
+            (user_id,),
+        )
+        upsert_transactions(
+            self.conn,
+            user_id,
+            "acc_1",
+            [
+                # Week of Monday 2026-01-05.
+                _tx("a", "2026-01-05T00:00:00Z", -1000, "eating_out"),
+                _tx("b", "2026-01-11T23:30:00Z", -500, "groceries"),
+                _tx("c", "2026-01-08T09:00:00Z", 20000, "income"),
+                # Week of Monday 2026-01-12.
+                _tx("d", "2026-01-12T12:00:00Z", -3000, "groceries"),
+            ],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_buckets_rows_into_monday_weeks(self):
+        weekly = weekly_components(self.conn, date(2025, 12, 29), date(2026, 1, 19))
+        self.assertEqual(list(weekly), [date(2025, 12, 29), date(2026, 1, 5), date(2026, 1, 12)])
+        self.assertEqual(weekly[date(2025, 12, 29)]["spend"], 0.0)
+        first = weekly[date(2026, 1, 5)]
+        self.assertEqual(first["delivery"], 1000)
+        self.assertEqual(first["nightlife"], 500)
+        self.assertEqual(metric_value(first, "savings_surplus"), 18500)
+        self.assertAlmostEqual(metric_value(first, "healthy_spending"), 500 / 1500)
+        self.assertEqual(metric_value(weekly[date(2026, 1, 12)], "healthy_spending"), 1.0)
+
+    def test_ingest_materializes_the_same_components(self):
+        first, end = date(2025, 12, 29), date(2026, 1, 19)
+        self.assertEqual(load_weekly_metrics(self.conn, first, end), weekly_components(self.conn, first, end))
+
+    def test_settling_a_pending_row_refreshes_its_week(self):
+        pending = _tx("e", "2026-01-13T08:00:00Z", -700, "groceries")
+        pending["settled"] = None
+        upsert_transactions(self.conn, "user_1", "acc_1", [pending])
+        week = date(2026, 1, 12)
+        self.assertEqual(load_weekly_metrics(self.conn, week, date(2026, 1, 19))[week]["groceries"], 3000)
+        upsert_transactions(self.conn, "user_1", "acc_1", [_tx("e", "2026-01-13T08:00:00Z", -700, "groceries")])
+        self.assertEqual(load_weekly_metrics(self.conn, week, date(2026, 1, 19))[week]["groceries"], 3700)
+
+    def test_weekly_update_reads_materialized_metrics(self):
+        seed_v1_goals(self.conn)
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        updated = update_weekly_goal_progress(self.conn, as_of=datetime(2026, 1, 19, 9))
+        self.conn.set_trace_callback(None)
+        self.assertEqual(updated, 4)
+        self.assertFalse(any("FROM transactions" in sql for sql in statements))
+        row = self.conn.execute(
+            """
+            SELECT p.metric_value FROM goal_progress p JOIN goals g ON g.id = p.goal_id
+            WHERE g.name = 'healthy_spending' AND p.week_start = '2026-01-12'
+            """
+        ).fetchone()
+        self.assertEqual(row[0], 1.0)
+
+    def test_weekly_update_scores_with_the_rule_green_ratio(self):
+        seed_v1_goals(self.conn)
+        # 0.72 of baseline is green at the default 0.75 but not at
+        # reduce_nightlife's 0.70.
+        self.conn.execute("UPDATE goals SET baseline_value = 1000 WHERE name = 'reduce_nightlife'")
+        upsert_transactions(self.conn, "user_1", "acc_1", [_tx("n", "2026-01-13T22:30:00Z", -720, "eating_out")])
+        update_weekly_goal_progress(self.conn, as_of=datetime(2026, 1, 19, 9))
+        row = self.conn.execute(
+            """
+            SELECT p.metric_value, p.score FROM goal_progress p JOIN goals g ON g.id = p.goal_id
+            WHERE g.name = 'reduce_nightlife' AND p.week_start = '2026-01-12'
+            """
+        ).fetchone()
+        self.assertEqual(tuple(row), (720.0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
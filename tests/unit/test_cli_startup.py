@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from mentos.bench import CLI_STARTUP_COMMANDS, run_benchmarks, run_cli
+from mentos.db import apply_migrations
+
+# Modules that only specific subcommands need; none of them may load when a
+# short command starts.
+HEAVY_MODULES = (
+    "requests",
+    "cryptography",
+    "mentos.bench",
+    "mentos.breakthroughs",
+    "mentos.chatgpt",
+    "mentos.drift",
+    "mentos.jobs",
+    "mentos.reports",
+    "mentos.scheduler",
+    "mentos.sync",
+)
+
+
+def _imported_modules(stderr: str) -> set[str]:
+    # -X importtime lines look like "import time: self | cumulative | name".
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class CliStartupTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_short_commands_do_not_import_heavy_dependencies(self):
+        for args in CLI_STARTUP_COMMANDS:
+            with self.subTest(command=" ".join(args)):
+                result = run_cli(args, self.db_path, "-X", "importtime")
+                modules = _imported_modules(result.stderr)
+                self.assertIn("mentos.cli", modules)
+                self.assertEqual(sorted(modules.intersection(HEAVY_MODULES)), [])
+
+    def test_startup_benchmark_reports_per_command_time(self):
+        results = run_benchmarks(transactions=50, repeat=1, only=["cli_startup"])
+        entry = results["benchmarks"]["cli_startup"]
+        self.assertEqual(entry["rows"], len(CLI_STARTUP_COMMANDS))
+        self.assertGreater(entry["seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import json
 import unittest
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 from mentos.insights.context import build_spend_context
+from mentos.insights.records import TxRecord, to_records
 
 
 class SpendContextBuilderTests(unittest.TestCase):
@@ -20,6 +22,18 @@ class SpendContextBuilderTests(unittest.TestCase):
         self.assertEqual(context["windows"]["last_7d"]["late_night_tx_count"], 0)
         self.assertTrue(context["windows"]["last_7d"]["top_merchants_by_spend"])
 
+    def test_prebuilt_records_match_raw_payloads(self):
+        fixture = json.loads(Path("tests/fixtures/scenarios/subscription_creep.json").read_text())
+        tz = fixture["meta"]["timezone"]
+        records = to_records(fixture["monzo"]["transactions"], ZoneInfo(tz))
+        self.assertIsInstance(records[0], TxRecord)
+        self.assertFalse(hasattr(records[0], "__dict__"))
+        kwargs = dict(goals=fixture["goals"], prefs=fixture["preferences"], meta_now=fixture["meta"]["now"], timezone=tz)
+        self.assertEqual(
+            build_spend_context(transactions=records, **kwargs),
+            build_spend_context(transactions=fixture["monzo"]["transactions"], **kwargs),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from mentos.copywriter import CopyWriter
+from mentos.db import apply_migrations, connect
+from mentos.drift import _build_fallback_message, detect_goal_drift_events
+from mentos.storage import ensure_user
+
+
+class _SlowChatGPT:
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def is_configured(self) -> bool:
+        return True
+
+    def generate_personalized_message(self, prompt, context):
+        self.release.wait(5)
+        return json.dumps({"message": f"Personal note for {context['goal']}"})
+
+
+class BackgroundCopyTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+        self.conn = connect(self.db_path)
+        user_id = ensure_user(self.conn)
+        for goal in ("reduce_nightlife", "healthy_spending"):
+            self.conn.execute(
+                "INSERT INTO goals (id, user_id, name, type, baseline_value, created_at) VALUES (?, ?, ?, 'spending', 0, datetime('now'))",
+                (goal, user_id, goal),
+            )
+            self.conn.executemany(
+                "INSERT INTO goal_progress (id, goal_id, week_start, metric_value, score) VALUES (?, ?, ?, 10, 0)",
+                [(f"{goal}-{n}", goal, f"2026-01-{5 + 7 * n:02d}") for n in range(4)],
+            )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def _messages(self) -> dict[str, str]:
+        return dict(self.conn.execute("SELECT goal_id, message FROM goal_drift_events").fetchall())
+
+    def test_detection_stores_fallback_and_upgrades_in_background(self):
+        release = threading.Event()
+        copywriter = CopyWriter(self.db_path)
+        try:
+            started = time.perf_counter()
+            events = detect_goal_drift_events(self.conn, _SlowChatGPT(release), copywriter=copywriter)
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertEqual(len(events), 2)
+            self.assertEqual(events[0]["message"], _build_fallback_message(events[0]["goal_name"], 4))
+            self.assertEqual(copywriter.collect([e["id"] for e in events], 0.05), {})
+
+            release.set()
+            upgrades = copywriter.collect([e["id"] for e in events], 5)
+        finally:
+            copywriter.shutdown(wait_for_pending=True)
+        self.assertEqual(len(upgrades), 2)
+        self.assertEqual(
+            self._messages(),
+            {goal: f"Personal note for {goal}" for goal in ("reduce_nightlife", "healthy_spending")},
+        )
+
+    def test_finished_upgrades_are_released(self):
+        copywriter = CopyWriter(self.db_path)
+        try:
+            futures = [
+                copywriter.submit("goal_drift_events", f"e{n}", lambda: {"message": "hi"})
+                for n in range(3)
+            ]
+            for future in futures:
+                future.result(5)
+            # Finished results wait for collect, which releases them.
+            self.assertEqual(set(copywriter.collect(["e0", "e1"], 5)), {"e0", "e1"})
+            self.assertEqual(copywriter.collect(["e0"], 5), {})
+            self.assertEqual(copywriter.collect(["e2"], 5), {"e2": {"message": "hi"}})
+            self.assertEqual((copywriter._pending, dict(copywriter._finished)), ({}, {}))
+        finally:
+            copywriter.shutdown(wait_for_pending=True)
+
+    def test_without_copywriter_copy_is_generated_inline(self):
+        release = threading.Event()
+        release.set()
+        detect_goal_drift_events(self.conn, _SlowChatGPT(release))
+        self.assertEqual(self._messages()["healthy_spending"], "Personal note for healthy_spending")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+from mentos.db import apply_migrations, connect
+from mentos.drift import DRIFT_WINDOW_WEEKS, detect_goal_drift_events, evaluate_drift
+from mentos.storage import ensure_user
+
+LATEST_WEEK = date(2026, 1, 26)
+
+
+class DriftDetectionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        self.user_id = ensure_user(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def _add_goal(self, goal_id: str, baseline: float, weeks: list[tuple[float, int]]) -> None:
+        self.conn.execute(
+            "INSERT INTO goals (id, user_id, name, type, baseline_value, created_at) VALUES (?, ?, ?, 'spending', ?, ?)",
+            (goal_id, self.user_id, f"goal_{goal_id}", baseline, goal_id),
+        )
+        self.conn.executemany(
+            "INSERT INTO goal_progress (id, goal_id, week_start, metric_value, score) VALUES (?, ?, ?, ?, ?)",
+            [
+                (f"{goal_id}-{n}", goal_id, (LATEST_WEEK - timedelta(weeks=n)).isoformat(), value, score)
+                for n, (value, score) in enumerate(weeks)
+            ],
+        )
+
+    def test_set_based_query_matches_per_goal_rules(self):
+        rng = random.Random(5)
+        expected = set()
+        for n in range(60):
+            goal_id = f"{n:03d}"
+            baseline = rng.choice([0.0, 50.0, 100.0])
+            weeks = [(rng.uniform(0, 150), rng.choice([0, 1, 1, 2, 2])) for _ in range(rng.randint(2, 7))]
+            self._add_goal(goal_id, baseline, weeks)
+            newest = [(None, value, score) for value, score in weeks[:DRIFT_WINDOW_WEEKS]]
+            if evaluate_drift(newest, baseline) is not None:
+                expected.add(goal_id)
+        self.conn.commit()
+        self.assertTrue(expected)
+
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        events = detect_goal_drift_events(self.conn)
+        self.conn.set_trace_callback(None)
+        self.assertEqual({e["goal_id"] for e in events}, expected)
+        self.assertEqual(sum("FROM goal_progress" in sql for sql in statements), 1)
+
+    def test_cooldown_suppresses_recent_goals(self):
+        self._add_goal("a", 0.0, [(10.0, 0)] * 4)
+        self._add_goal("b", 0.0, [(10.0, 0)] * 4)
+        self.conn.execute(
+            "INSERT INTO goal_drift_events (id, goal_id, triggered_at, weeks_off_track, message) VALUES ('e', 'a', ?, 4, 'x')",
+            ((LATEST_WEEK - timedelta(days=10)).isoformat(),),
+        )
+        self.conn.commit()
+        self.assertEqual([e["goal_id"] for e in detect_goal_drift_events(self.conn)], ["b"])
+        self.assertEqual(detect_goal_drift_events(self.conn), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
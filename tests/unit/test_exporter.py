@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mentos.aggregates import rebuild_daily
+from mentos.db import apply_migrations, connect
+from mentos.exporter import EXPORT_TABLES, export_table, iter_pages
+from mentos.ingest import upsert_transactions
+from mentos.storage import ensure_user
+from mentos.synthetic import generate_user
+
+END = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        user_id = ensure_user(self.conn)
+        user = generate_user(seed=5, transactions=1500, end=END)
+        # A run of rows sharing one timestamp straddles page boundaries.
+        same_time = [
+            {**user.transactions[-1], "id": f"tx_same_{n:02d}"} for n in range(25)
+        ]
+        self.conn.execute(
+            "INSERT INTO accounts (id, user_id, created_at) VALUES ('acc', ?, datetime('now'))",
+            (user_id,),
+        )
+        upsert_transactions(self.conn, user_id, "acc", user.transactions + same_time)
+        self.conn.commit()
+        rebuild_daily(self.conn, days=3650)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_pages_cover_every_row_once_in_key_order(self):
+        spec = EXPORT_TABLES["transactions"]
+        exported = [row["id"] for page in iter_pages(self.conn, spec, page_size=7) for row in page]
+        expected = [r[0] for r in self.conn.execute("SELECT id FROM transactions ORDER BY created_at, id")]
+        self.assertEqual(exported, expected)
+        self.assertGreater(len(exported), 7 * 100)
+        self.assertEqual(sum(1 for tx_id in exported if tx_id.startswith("tx_same_")), 25)
+
+    def test_jsonl_and_csv_round_trip(self):
+        spec = EXPORT_TABLES["aggregates"]
+        expected = self.conn.execute("SELECT COUNT(1) FROM aggregates_daily").fetchone()[0]
+
+        out = io.StringIO()
+        stats = export_table(self.conn, spec, out, "jsonl", page_size=50)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(stats["rows"], expected)
+        self.assertEqual(len(lines), expected)
+        self.assertEqual(set(json.loads(lines[0])), {"id", "user_id", "day", "category", "total_amount", "count", "created_at", "updated_at"})
+
+        out = io.StringIO()
+        export_table(self.conn, spec, out, "csv", page_size=50)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), expected)
+
+    def test_page_queries_seek_the_key_index(self):
+        for name in ("transactions", "aggregates", "insights"):
+            spec = EXPORT_TABLES[name]
+            key = ", ".join(spec.key)
+            marks = ", ".join("?" for _ in spec.key)
+            plan = " ".join(
+                row[-1]
+                for row in self.conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM {spec.table} WHERE ({key}) > ({marks}) ORDER BY {key} LIMIT 10",
+                    ("",) * len(spec.key),
+                )
+            )
+            self.assertIn("INDEX", plan, name)
+            self.assertNotIn("TEMP B-TREE", plan, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
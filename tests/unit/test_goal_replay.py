@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from mentos.breakthroughs import seed_v1_goals, update_weekly_goal_progress
+from mentos.db import apply_migrations, connect
+from mentos.goal_replay import replay_goals
+from mentos.ingest import upsert_transactions
+from mentos.storage import ensure_user
+from mentos.synthetic import generate_user
+
+END = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+FIRST = date(2025, 9, 1)
+LAST = date(2026, 1, 26)
+
+
+def _progress(conn) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in conn.execute(
+            """
+            SELECT g.name, p.week_start, p.metric_value, p.score
+            FROM goal_progress p JOIN goals g ON g.id = p.goal_id
+            ORDER BY g.name, p.week_start
+            """
+        )
+    ]
+
+
+class GoalReplayTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        user = generate_user(seed=3, transactions=6000, end=END)
+        self.conns = []
+        for name in ("live", "replay"):
+            db_path = str(Path(self._tmp.name, f"{name}.sqlite"))
+            apply_migrations(db_path)
+            conn = connect(db_path)
+            user_id = ensure_user(conn)
+            account_id = user.accounts["accounts"][0]["id"]
+            conn.execute(
+                "INSERT INTO accounts (id, user_id, created_at) VALUES (?, ?, datetime('now'))",
+                (account_id, user_id),
+            )
+            upsert_transactions(conn, user_id, account_id, user.transactions)
+            conn.commit()
+            seed_v1_goals(conn)
+            self.conns.append(conn)
+        self.live, self.replay = self.conns
+
+    def tearDown(self):
+        for conn in self.conns:
+            conn.close()
+        self._tmp.cleanup()
+
+    def test_matches_week_by_week_updates(self):
+        week = FIRST
+        while week <= LAST:
+            update_weekly_goal_progress(self.live, as_of=datetime.combine(week + timedelta(weeks=1), datetime.min.time()))
+            week += timedelta(weeks=1)
+        plan = replay_goals(self.replay, FIRST, LAST)
+        self.assertEqual(_progress(self.replay), _progress(self.live))
+        self.assertEqual(plan.summary()["progress_new"], len(_progress(self.live)))
+
+    def test_dry_run_writes_nothing_and_apply_is_idempotent(self):
+        plan = replay_goals(self.replay, FIRST, LAST, dry_run=True)
+        self.assertTrue(plan.progress)
+        self.assertEqual(_progress(self.replay), [])
+        self.assertEqual(self.replay.execute("SELECT COUNT(1) FROM goal_drift_events").fetchone()[0], 0)
+
+        applied = replay_goals(self.replay, FIRST, LAST)
+        events = len(applied.breakthroughs) + len(applied.drift_events)
+        stored = self.replay.execute(
+            "SELECT (SELECT COUNT(1) FROM breakthroughs) + (SELECT COUNT(1) FROM goal_drift_events)"
+        ).fetchone()[0]
+        self.assertEqual(stored, events)
+
+        again = replay_goals(self.replay, FIRST, LAST, dry_run=True)
+        self.assertEqual(again.changed_progress, [])
+        self.assertEqual(again.breakthroughs + again.drift_events, [])
+
+    def test_dry_run_does_not_seed_goals(self):
+        self.replay.execute("DELETE FROM goals")
+        self.replay.commit()
+        plan = replay_goals(self.replay, FIRST, LAST, dry_run=True)
+        self.assertEqual(plan.progress, [])
+        self.assertEqual(self.replay.execute("SELECT COUNT(1) FROM goals").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sqlite3
+import unittest
+
+from mentos.goal_rules import (
+    METRICS,
+    GoalMetric,
+    MetricTerm,
+    compile_term,
+    compile_terms,
+    metric_terms,
+)
+
+
+class GoalMetricRegistryTests(unittest.TestCase):
+    def test_every_rule_metric_compiles_into_one_statement(self):
+        terms = metric_terms(METRICS.values())
+        self.assertEqual(
+            {t.name for t in terms}, {"delivery", "nightlife", "income", "spend", "groceries"}
+        )
+        columns, params = compile_terms(terms)
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE transactions (amount INTEGER, category TEXT, created_at TEXT)")
+        conn.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?)",
+            [
+                (-1000, "eating_out", "2026-01-05T23:10:00+00:00"),
+                (-400, "groceries", "2026-01-06T10:00:00+00:00"),
+                (2500, "income", "2026-01-07T09:00:00+00:00"),
+            ],
+        )
+        row = conn.execute(f"SELECT {columns} FROM transactions", params).fetchone()
+        components = dict(zip((t.name for t in terms), row))
+        self.assertEqual(components, {"delivery": 1000, "income": 2500, "spend": 1400, "groceries": 400, "nightlife": 1000})
+        self.assertEqual(METRICS["savings_surplus"].evaluate(components), 1100)
+        self.assertAlmostEqual(METRICS["healthy_spending"].evaluate(components), 400 / 1400)
+
+    def test_hour_window_wraps_past_midnight(self):
+        sql, params = compile_term(MetricTerm("late", from_hour=22, to_hour=4))
+        self.assertIn(" OR ", sql)
+        self.assertEqual(params, [22, 4])
+
+    def test_conflicting_term_definitions_are_rejected(self):
+        clash = GoalMetric("other", MetricTerm("delivery", categories=("takeaway",)))
+        with self.assertRaises(ValueError):
+            metric_terms([*METRICS.values(), clash])
+
+    def test_ratio_with_empty_denominator_is_zero(self):
+        self.assertEqual(METRICS["healthy_spending"].evaluate({"groceries": 0.0, "spend": 0.0}), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
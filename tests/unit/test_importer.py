@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from mentos.db import apply_migrations, connect
+from mentos.importer import ImportFormatError, import_export, iter_export
+from mentos.synthetic import generate_user
+
+END = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+CSV_EXPORT = """Transaction ID,Date,Time,Type,Name,Emoji,Category,Amount,Currency,Local amount,Local currency,Notes and #tags,Address,Receipt,Description,Category split,Money Out,Money In
+tx_csv_1,15/07/2025,23:30:00,Card payment,Corner Shop,,Eating out,-12.50,GBP,-12.50,GBP,,,,CORNER SHOP LONDON,,-12.50,
+tx_csv_2,01/01/2025,09:00:00,Faster payment,Employer Ltd,,Income,2500.00,GBP,2500.00,GBP,,,,SALARY,,,2500.00
+"""
+
+
+class ImporterTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        db_path = str(self.tmp / "t.sqlite")
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_csv_rows_are_normalized_to_utc_pence(self):
+        path = self.tmp / "export.csv"
+        path.write_text(CSV_EXPORT)
+        txs = list(iter_export(str(path), tz=ZoneInfo("Europe/London")))
+        self.assertEqual(txs[0]["amount"], -1250)
+        self.assertEqual(txs[0]["created"], "2025-07-15T22:30:00+00:00")
+        self.assertEqual(txs[0]["category"], "eating_out")
+        self.assertEqual(txs[0]["merchant"], {"name": "Corner Shop"})
+        self.assertIsNone(txs[1]["merchant"])
+        self.assertEqual(txs[1]["created"], "2025-01-01T09:00:00+00:00")
+
+    def test_json_export_streams_in_batches_and_is_idempotent(self):
+        user = generate_user(seed=2, transactions=300, end=END)
+        path = self.tmp / "export.json"
+        path.write_text(json.dumps({"transactions": user.transactions}))
+
+        first = import_export(self.conn, str(path), batch_size=64)
+        self.assertEqual(first["read"], len(user.transactions))
+        self.assertEqual(first["inserted"], len(user.transactions))
+        count = self.conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0]
+        self.assertEqual(count, len(user.transactions))
+
+        second = import_export(self.conn, str(path), batch_size=64)
+        self.assertEqual(second["inserted"], 0)
+        self.assertEqual(second["skipped"], len(user.transactions))
+
+    def test_jsonl_matches_json(self):
+        user = generate_user(seed=2, transactions=50, end=END)
+        path = self.tmp / "export.jsonl"
+        path.write_text("".join(json.dumps(tx) + "\n" for tx in user.transactions))
+        self.assertEqual(list(iter_export(str(path))), user.transactions)
+
+    def test_truncated_json_raises(self):
+        path = self.tmp / "broken.json"
+        path.write_text('{"transactions": [{"id": "a"}, {"id": ')
+        with self.assertRaises(ImportFormatError):
+            list(iter_export(str(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
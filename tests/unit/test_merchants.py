@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from mentos.db import apply_migrations, connect
+from mentos.heuristics import recurring_merchants
+from mentos.ingest import upsert_transactions
+from mentos.merchants import MerchantResolver, backfill_merchant_ids, normalize_merchant_name
+from mentos.storage import ensure_user
+
+
+def _tx(tx_id: str, created: datetime, merchant: dict | None) -> dict:
+    return {
+        "id": tx_id,
+        "created": created.isoformat(),
+        "settled": created.isoformat(),
+        "amount": -500,
+        "currency": "GBP",
+        "description": "card payment",
+        "merchant": merchant,
+        "category": "eating_out",
+    }
+
+
+class MerchantDimensionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        self.user_id = ensure_user(self.conn)
+        self.conn.execute(
+            "INSERT INTO accounts (id, user_id, created_at) VALUES ('acc_1', ?, datetime('now'))",
+            (self.user_id,),
+        )
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_name_variants_share_one_id(self):
+        self.assertEqual(normalize_merchant_name("  Corner   Cafe "), "Corner Cafe")
+        self.assertIsNone(normalize_merchant_name("   "))
+        resolver = MerchantResolver(self.conn)
+        first = resolver.resolve({"name": "Corner Cafe"})
+        self.assertEqual(resolver.resolve({"name": "corner  CAFE"}), first)
+        self.assertEqual(MerchantResolver(self.conn).resolve({"name": "CORNER CAFE"}), first)
+        self.assertNotEqual(resolver.resolve({"name": "Book Nook"}), first)
+        self.assertIsNone(resolver.resolve(None))
+
+    def test_monzo_id_wins_over_name(self):
+        resolver = MerchantResolver(self.conn)
+        first = resolver.resolve({"id": "merch_1", "name": "Gym Co"})
+        self.assertEqual(resolver.resolve({"id": "merch_1", "name": "GYMCO LTD"}), first)
+        self.assertEqual(MerchantResolver(self.conn).resolve({"name": "gymco ltd"}), first)
+
+    def test_alias_match_records_the_monzo_id(self):
+        first = MerchantResolver(self.conn).resolve({"name": "Corner Cafe"})
+        self.assertEqual(MerchantResolver(self.conn).resolve({"id": "merch_9", "name": "corner cafe"}), first)
+        # A later process that sees the id under a new name finds the same row.
+        self.assertEqual(MerchantResolver(self.conn).resolve({"id": "merch_9", "name": "CC Ltd"}), first)
+        self.assertEqual(self.conn.execute("SELECT COUNT(1) FROM merchants").fetchone()[0], 1)
+
+    def test_ingest_and_recurring_group_on_merchant_id(self):
+        now = datetime.now(timezone.utc)
+        txs = [
+            _tx(f"tx_{n}", now - timedelta(days=30 * n + 1), {"name": name})
+            for n, name in enumerate(["Corner Cafe", "corner cafe", "CORNER  CAFE "])
+        ]
+        upsert_transactions(self.conn, self.user_id, "acc_1", txs)
+        self.conn.commit()
+        ids = {row[0] for row in self.conn.execute("SELECT merchant_id FROM transactions")}
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(recurring_merchants(self.conn), ["Corner Cafe"])
+
+    def test_backfill_fills_legacy_rows(self):
+        now = datetime.now(timezone.utc)
+        upsert_transactions(self.conn, self.user_id, "acc_1", [_tx("tx_a", now, {"name": "Book Nook"})])
+        self.conn.execute("UPDATE transactions SET merchant_id = NULL")
+        self.conn.commit()
+        self.assertEqual(backfill_merchant_ids(self.conn), 1)
+        row = self.conn.execute("SELECT merchant_id FROM transactions").fetchone()
+        self.assertIsNotNone(row[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+
+from mentos.db import apply_migrations, connect
+from mentos.notifications import Notification, can_send
+from mentos.outbox import DeliveryWorker, Outbox, has_due
+from mentos.storage import ensure_user, log_notification
+
+
+class FakeClient:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.sent: list[Notification] = []
+
+    def send(self, notification, conn=None, user_id="user_1"):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("pushover down")
+        self.sent.append(notification)
+        log_notification(conn, user_id, "pushover", {"title": notification.title}, "sent")
+
+
+class OutboxTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        ensure_user(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def _statuses(self):
+        return [row[0] for row in self.conn.execute("SELECT status FROM notification_outbox ORDER BY created_at")]
+
+    def test_queued_messages_go_out_as_one_digest(self):
+        outbox = Outbox()
+        for n in range(3):
+            outbox.send(Notification(title=f"Event {n}", message="Details"), conn=self.conn)
+        client = FakeClient()
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        result = DeliveryWorker(client).deliver(self.conn, later)
+
+        self.assertEqual(
+            result, {"messages": 3, "sent": 1, "retried": 0, "failed": 0, "deferred": 0}
+        )
+        [push] = client.sent
+        self.assertEqual(push.title, "3 updates from mentos")
+        self.assertIn("Event 2 Details", push.message)
+        self.assertEqual(self._statuses(), ["sent"] * 3)
+        self.assertFalse(has_due(self.conn, later))
+
+    def test_daily_counter_drives_can_send(self):
+        tz = timezone.utc
+        self.assertTrue(can_send(self.conn, tz, 2, "", ""))
+        log_notification(self.conn, "user_1", "pushover", {}, "sent")
+        self.assertTrue(can_send(self.conn, tz, 2, "", ""))
+        log_notification(self.conn, "user_1", "pushover", {}, "sent")
+        self.assertFalse(can_send(self.conn, tz, 2, "", ""))
+        self.assertTrue(can_send(self.conn, tz, 0, "", ""))
+
+    def test_messages_over_the_daily_cap_wait_for_the_next_day(self):
+        log_notification(self.conn, "user_1", "pushover", {}, "sent")
+        log_notification(self.conn, "user_1", "pushover", {}, "sent")
+        Outbox().send(Notification(title="Hi", message="there"), conn=self.conn)
+        now = datetime.now(timezone.utc) + timedelta(seconds=1)
+        client = FakeClient()
+        worker = DeliveryWorker(client, max_per_day=2)
+
+        self.assertEqual(worker.deliver(self.conn, now)["deferred"], 1)
+        self.assertEqual(client.sent, [])
+        self.assertEqual(self._statuses(), ["pending"])
+        self.assertFalse(has_due(self.conn, now + timedelta(minutes=1)))
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), time(), timezone.utc)
+        self.assertTrue(has_due(self.conn, tomorrow))
+
+    def test_failures_back_off_then_give_up(self):
+        Outbox().send(Notification(title="Hi", message="there"), conn=self.conn)
+        worker = DeliveryWorker(FakeClient(failures=10), max_attempts=3, base_backoff_seconds=60)
+        now = datetime.now(timezone.utc)
+
+        self.assertEqual(worker.deliver(self.conn, now)["retried"], 1)
+        # Not due again until the first backoff has passed.
+        self.assertEqual(worker.deliver(self.conn, now + timedelta(seconds=30))["messages"], 0)
+        self.assertEqual(worker.deliver(self.conn, now + timedelta(seconds=61))["retried"], 1)
+        # Second backoff doubles.
+        self.assertEqual(worker.deliver(self.conn, now + timedelta(seconds=150))["messages"], 0)
+        self.assertEqual(worker.deliver(self.conn, now + timedelta(seconds=182))["failed"], 1)
+        self.assertEqual(self._statuses(), ["failed"])
+        self.assertFalse(has_due(self.conn, now + timedelta(days=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
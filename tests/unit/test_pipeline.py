@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+
+from mentos.pipeline import prefetch
+
+
+class PrefetchTests(unittest.TestCase):
+    def test_items_arrive_in_order_with_bounded_lookahead(self):
+        produced = []
+        ahead = []
+
+        def items():
+            for n in range(20):
+                produced.append(n)
+                yield n
+
+        consumed = []
+        for item in prefetch(items(), depth=3):
+            time.sleep(0.002)
+            # Queue holds at most 3, plus the one the producer is blocked on.
+            ahead.append(len(produced) - len(consumed))
+            consumed.append(item)
+        self.assertEqual(consumed, list(range(20)))
+        self.assertLessEqual(max(ahead), 5)
+
+    def test_producer_errors_surface_after_earlier_items(self):
+        def items():
+            yield 1
+            yield 2
+            raise ValueError("page 3 failed")
+
+        seen = []
+        with self.assertRaises(ValueError):
+            for item in prefetch(items()):
+                seen.append(item)
+        self.assertEqual(seen, [1, 2])
+
+    def test_consumer_failure_stops_the_producer(self):
+        stopped = threading.Event()
+
+        def items():
+            try:
+                n = 0
+                while True:
+                    n += 1
+                    yield n
+            finally:
+                stopped.set()
+
+        with self.assertRaises(RuntimeError):
+            for item in prefetch(items(), depth=2):
+                if item == 3:
+                    raise RuntimeError("disk full")
+        self.assertTrue(stopped.wait(1))
+
+    def test_network_and_disk_time_overlap(self):
+        def slow_pages():
+            for n in range(8):
+                time.sleep(0.05)
+                yield n
+
+        started = time.perf_counter()
+        for _ in prefetch(slow_pages(), depth=4):
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        # Serial would take ~0.8s; overlapped is ~0.45s.
+        self.assertLess(elapsed, 0.65)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mentos import profiling
+from mentos.db import apply_migrations, connect
+from mentos.jobs import run_idempotent
+from mentos.profiling import Profiler
+
+
+def _work() -> list[int]:
+    return [n * n for n in range(20000)]
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name, "profiles")
+
+    def tearDown(self):
+        profiling.install(None)
+        self._tmp.cleanup()
+
+    def test_profile_writes_stats_and_summary(self):
+        with Profiler(str(self.dir)).profile("nightly_report", "2026-03-01"):
+            _work()
+        self.assertEqual(
+            sorted(p.name for p in self.dir.iterdir()),
+            ["nightly_report-2026-03-01.prof", "nightly_report-2026-03-01.txt"],
+        )
+        summary = (self.dir / "nightly_report-2026-03-01.txt").read_text()
+        self.assertIn("_work", summary)
+        self.assertIn("Top allocations", summary)
+
+    def test_fast_runs_are_discarded_below_threshold(self):
+        with Profiler(str(self.dir), min_seconds=5).profile("poll", "fast"):
+            _work()
+        self.assertFalse(self.dir.exists())
+
+    def test_installed_profiler_covers_job_runs_without_nesting(self):
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        conn = connect(db_path)
+        profiler = Profiler(str(self.dir))
+        profiling.install(profiler)
+        try:
+            run_idempotent(conn, "daily_sweep", "2026-03-01", lambda: time.sleep(0.01))
+            with profiler.profile("cli-sweep", "now"):
+                run_idempotent(conn, "daily_sweep", "2026-03-02", _work)
+        finally:
+            conn.close()
+        self.assertEqual(
+            sorted(p.stem for p in self.dir.glob("*.prof")),
+            ["cli-sweep-now", "daily_sweep-2026-03-01"],
+        )
+
+    def test_overlapping_runs_share_one_cpu_profile(self):
+        entered, release = threading.Event(), threading.Event()
+
+        def slow():
+            with Profiler(str(self.dir)).profile("poll", "a"):
+                entered.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=slow)
+        worker.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            with Profiler(str(self.dir)).profile("report", "b"):
+                _work()
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(sorted(p.name for p in self.dir.glob("*.prof")), ["poll-a.prof"])
+        self.assertIn("Wall time only", (self.dir / "report-b.txt").read_text())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_failed_setup_restores_state(self):
+        profiler = Profiler(str(self.dir))
+        with mock.patch("mentos.profiling.tracemalloc.take_snapshot", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                with profiler.profile("poll", "a"):
+                    pass
+        self.assertEqual(profiling._tracing_users, 0)
+        self.assertFalse(tracemalloc.is_tracing())
+        with profiler.profile("poll", "b"):
+            _work()
+        self.assertTrue((self.dir / "poll-b.prof").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
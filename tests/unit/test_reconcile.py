@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from mentos.aggregates import rebuild_daily
+from mentos.db import apply_migrations, connect
+from mentos.ingest import upsert_transactions
+from mentos.monzo_stub import StubMonzoClient
+from mentos.reconcile import pending_due, reconcile_pending
+from mentos.storage import ensure_user
+
+
+def _tx(n: int, **extra) -> dict:
+    created = (datetime.now(timezone.utc) - timedelta(days=n + 3)).isoformat()
+    return {
+        "id": f"tx_{n:02d}",
+        "amount": -100 * (n + 1),
+        "currency": "GBP",
+        "description": "SHOP",
+        "category": "groceries",
+        "created": created,
+        "settled": None,
+        **extra,
+    }
+
+
+def _aggregates(conn) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in conn.execute("SELECT day, category, total_amount, count FROM aggregates_daily ORDER BY day, category")
+    ]
+
+
+class ReconcileTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        user_id = ensure_user(self.conn)
+        self.conn.execute(
+            "INSERT INTO accounts (id, user_id, created_at) VALUES ('acc_1', ?, datetime('now'))", (user_id,)
+        )
+        pending = [_tx(n) for n in range(8)]
+        upsert_transactions(self.conn, user_id, "acc_1", pending + [_tx(20, settled=_tx(20)["created"])])
+        self.conn.commit()
+        rebuild_daily(self.conn)
+
+        upstream = [_tx(n, settled=_tx(n)["created"], category="eating_out") for n in range(5)]
+        upstream.append(_tx(5, decline_reason="INSUFFICIENT_FUNDS"))
+        upstream.append(_tx(6))
+        # tx_07 has vanished upstream.
+        self.client = StubMonzoClient({"accounts": [{"id": "acc_1"}]}, transactions=upstream)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_only_pending_rows_are_fetched_in_bounded_batches(self):
+        first = reconcile_pending(self.conn, client=self.client, batch_size=2, max_batches=2)
+        self.assertEqual(self.client.calls["transaction"], 4)
+        self.assertEqual(first["settled"] + first["still_pending"] + first["declined"] + first["missing"], 4)
+
+        reconcile_pending(self.conn, client=self.client, batch_size=2, max_batches=2)
+        self.assertEqual(self.client.calls["transaction"], 8)
+        self.assertNotIn("transactions", self.client.calls)
+
+        pending = {row[0] for row in self.conn.execute("SELECT id FROM transactions WHERE is_pending = 1")}
+        self.assertEqual(pending, {"tx_05", "tx_06", "tx_07"})
+        # Declined and vanished rows are parked; only tx_06 is still checked.
+        self.assertEqual([row["id"] for row in pending_due(self.conn, 10)], ["tx_06"])
+
+    def test_settled_rows_update_only_their_aggregate_cells(self):
+        reconcile_pending(self.conn, client=self.client)
+        incremental = _aggregates(self.conn)
+        self.assertIn("eating_out", {row[1] for row in incremental})
+        rebuild_daily(self.conn)
+        self.assertEqual(incremental, _aggregates(self.conn))
+
+
+if __name__ == "__main__":
+    unittest.main()
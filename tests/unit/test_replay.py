@@ -0,0 +1,50 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from mentos.db import apply_migrations, connect
+from mentos.monzo_stub import StubMonzoClient
+from mentos.replay import STAGES, capture, replay
+from mentos.sync import sync_all
+from mentos.synthetic import generate_user
+from mentos.webhooks import handle_event
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.workdir = Path(self._tmp.name)
+        db_path = str(self.workdir / "live.sqlite")
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        self.user = generate_user(seed=3, transactions=400, end=datetime.now(timezone.utc), days=20)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_captured_pages_replay_through_every_stage(self):
+        sync_all(self.conn, "t", client=StubMonzoClient(self.user.accounts, self.user.pots, self.user.transactions))
+        late = {**self.user.transactions[-1], "id": "tx_webhook", "account_id": self.user.accounts["accounts"][0]["id"]}
+        handle_event(self.conn, {"type": "transaction.created", "data": late})
+        expected = self.conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0]
+
+        out = self.workdir / "capture"
+        summary = capture(self.conn, str(out))
+        self.assertEqual(summary["transactions"], expected)
+        captured = json.loads((out / "monzo_transactions.json").read_text())["transactions"]
+        self.assertIn("tx_webhook", {tx["id"] for tx in captured})
+
+        results = replay(str(out), ZoneInfo("Europe/London"), repeat=2)
+        self.assertEqual(set(results["stages"]), {*STAGES, "end_to_end"})
+        self.assertEqual(results["stages"]["sync_all"]["rows"], expected)
+        self.assertGreater(results["requests"]["transactions"], expected // 100)
+        for stage in results["stages"].values():
+            self.assertLessEqual(stage["p50_ms"], stage["p95_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
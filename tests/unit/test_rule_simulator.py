@@ -0,0 +1,106 @@
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from mentos.breakthroughs import seed_v1_goals
+from mentos.db import apply_migrations, connect
+from mentos.goal_replay import plan_replay
+from mentos.goal_rules import V1_RULES
+from mentos.ingest import upsert_transactions
+from mentos.rule_simulator import load_histories, parse_grid_values, run_grid, simulate
+from mentos.storage import ensure_user
+from mentos.synthetic import generate_user
+
+END = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+FIRST = date(2025, 9, 1)
+LAST = date(2026, 1, 26)
+
+
+def _scored_week(triggered_at: str) -> str:
+    return (date.fromisoformat(triggered_at[:10]) - timedelta(weeks=1)).isoformat()
+
+
+class RuleSimulatorTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(db_path)
+        self.conn = connect(db_path)
+        user_id = ensure_user(self.conn)
+        user = generate_user(seed=3, transactions=6000, end=END)
+        account_id = user.accounts["accounts"][0]["id"]
+        self.conn.execute(
+            "INSERT INTO accounts (id, user_id, created_at) VALUES (?, ?, datetime('now'))",
+            (account_id, user_id),
+        )
+        upsert_transactions(self.conn, user_id, account_id, user.transactions)
+        self.conn.commit()
+        seed_v1_goals(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_current_rules_match_replay(self):
+        plan = plan_replay(self.conn, FIRST, LAST, rebaseline=True)
+        for history in load_histories(self.conn, first=FIRST, last=LAST):
+            result = simulate(history, history.rule)
+            self.assertEqual(
+                result["breakthrough_weeks"],
+                [_scored_week(e["triggered_at"]) for e in plan.breakthroughs if e["goal_name"] == history.goal_name],
+            )
+            self.assertEqual(
+                result["drift_weeks"],
+                [_scored_week(e["triggered_at"]) for e in plan.drift_events if e["goal_name"] == history.goal_name],
+            )
+
+    def test_grid_of_thousands_runs_in_memory(self):
+        histories = load_histories(self.conn, first=FIRST, last=LAST)
+        grid = {
+            "improvement_target": parse_grid_values("5:50:5"),
+            "trigger_green_weeks": parse_grid_values("1:6:1", int),
+            "green_threshold_ratio": parse_grid_values("0.5:0.95:0.05"),
+        }
+        started = time.perf_counter()
+        results = list(run_grid(histories, grid))
+        self.assertLess(time.perf_counter() - started, 10)
+        self.assertEqual(len(results), len(histories) * 10 * 6 * 10)
+        self.assertTrue(any(r["breakthroughs"] for r in results))
+
+        # Looser targets never produce fewer breakthroughs.
+        by_target = {
+            r["improvement_target"]: r["breakthroughs"]
+            for r in results
+            if r["goal"] == "reduce_food_delivery"
+            and r["trigger_green_weeks"] == 1
+            and r["green_threshold_ratio"] == 0.75
+        }
+        counts = [by_target[t] for t in sorted(by_target)]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+        # Like live rules, green weeks beyond the trigger window never fire.
+        window = V1_RULES["reduce_food_delivery"].trigger_window_weeks
+        self.assertFalse(
+            any(
+                r["breakthroughs"]
+                for r in results
+                if r["goal"] == "reduce_food_delivery" and r["trigger_green_weeks"] > window
+            )
+        )
+
+    def test_unknown_parameter_is_rejected(self):
+        histories = load_histories(self.conn, ["reduce_food_delivery"], FIRST, LAST)
+        self.assertEqual(histories[0].rule, V1_RULES["reduce_food_delivery"])
+        with self.assertRaises(ValueError):
+            list(run_grid(histories, {"cooldown_days": [7]}))
+
+    def test_parse_grid_values(self):
+        self.assertEqual(parse_grid_values("10,20"), [10.0, 20.0])
+        self.assertEqual(parse_grid_values("0.6:0.8:0.1"), [0.6, 0.7, 0.8])
+        self.assertEqual(parse_grid_values("2:4:1", int), [2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from mentos.db import apply_migrations, connect
+from mentos.rule_store import RuleStore, rule_store
+from mentos.spend_filters import build_spend_filter_clause
+from mentos.storage import ensure_default_rules, ensure_user, get_rule, set_rule
+
+
+class RuleStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+        self.conn = connect(self.db_path)
+        ensure_default_rules(self.conn, ensure_user(self.conn))
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_lookups_are_served_from_memory(self):
+        get_rule(self.conn, "quiet_hours_start")
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        rules = rule_store(self.conn)
+        for _ in range(50):
+            self.assertEqual(rules.get_int(self.conn, "max_notifications_per_day"), 6)
+            self.assertEqual(get_rule(self.conn, "quiet_hours_end"), "07:00")
+            build_spend_filter_clause(self.conn)
+        self.assertEqual(statements, [])
+
+    def test_set_rule_writes_through_and_notifies(self):
+        changed = []
+        rules = rule_store(self.conn)
+        rules.on_change(changed.append)
+        clause, _ = build_spend_filter_clause(self.conn)
+        self.assertIn("NOT IN", clause)
+
+        set_rule(self.conn, "user_1", "exclude_categories", [])
+        set_rule(self.conn, "user_1", "max_notifications_per_day", 2)
+
+        self.assertEqual(changed, [{"exclude_categories"}, {"max_notifications_per_day"}])
+        self.assertEqual(rules.get_int(self.conn, "max_notifications_per_day"), 2)
+        clause, _ = build_spend_filter_clause(self.conn)
+        self.assertNotIn("NOT IN", clause)
+
+    def test_numeric_getters_keep_an_explicit_zero(self):
+        rules = rule_store(self.conn)
+        set_rule(self.conn, "user_1", "llm_copy_deadline_seconds", 0)
+        set_rule(self.conn, "user_1", "max_notifications_per_day", 0)
+        self.assertEqual(rules.get_float(self.conn, "llm_copy_deadline_seconds", 15), 0.0)
+        self.assertEqual(rules.get_int(self.conn, "max_notifications_per_day", 6), 0)
+        self.assertEqual(rules.get_float(self.conn, "no_such_rule", 15), 15)
+        set_rule(self.conn, "user_1", "max_notifications_per_day", "")
+        self.assertEqual(rules.get_int(self.conn, "max_notifications_per_day", 6), 6)
+
+    def test_external_writes_bump_the_version(self):
+        store = RuleStore(check_interval=0)
+        changed = []
+        store.on_change(changed.append)
+        self.assertEqual(store.get(self.conn, "poll_interval_minutes"), 5)
+
+        other = connect(self.db_path)
+        other.execute("UPDATE rules SET value_json = '15' WHERE key = 'poll_interval_minutes'")
+        other.commit()
+        other.close()
+
+        self.assertEqual(store.get(self.conn, "poll_interval_minutes"), 15)
+        self.assertEqual(changed, [{"poll_interval_minutes"}])
+
+        slow = RuleStore(check_interval=3600)
+        self.assertEqual(slow.get(self.conn, "sweep_enabled"), False)
+        self.conn.execute("UPDATE rules SET value_json = 'true' WHERE key = 'sweep_enabled'")
+        self.conn.commit()
+        self.assertEqual(slow.get(self.conn, "sweep_enabled"), False)
+        slow.invalidate()
+        self.assertEqual(slow.get(self.conn, "sweep_enabled"), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
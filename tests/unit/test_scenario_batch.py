@@ -0,0 +1,55 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from mentos.scenario_batch import run_batch
+
+
+class ScenarioBatchTests(unittest.TestCase):
+    def test_streams_one_line_per_fixture(self):
+        out = io.StringIO()
+        summary = run_batch(
+            "tests/fixtures/scenarios",
+            out=out,
+            stubs_dir="tests/fixtures/scenarios/stubs",
+        )
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(summary["total"], 11)
+        self.assertEqual(summary["ok"], 11)
+        self.assertEqual(len(lines), 11)
+        for record in lines:
+            self.assertEqual(record["notifications"], [record["scenario"]])
+            for phase in ("context", "prompt", "llm", "validation", "gating", "total"):
+                self.assertIn(phase, record["timings_ms"])
+
+    def test_jsonl_corpus_with_process_pool(self):
+        fixture = json.loads(Path("tests/fixtures/scenarios/delivery_creep.json").read_text())
+        fixture["meta"]["stub"] = "delivery_creep"
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = Path(tmp, "corpus.jsonl")
+            corpus.write_text("\n".join(json.dumps(fixture) for _ in range(6)) + "\n")
+            out = io.StringIO()
+            summary = run_batch(
+                str(corpus),
+                out=out,
+                workers=2,
+                stubs_dir="tests/fixtures/scenarios/stubs",
+            )
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(summary["ok"], 6)
+        self.assertEqual(sorted(r["scenario"] for r in records), [f"corpus:{n}" for n in range(1, 7)])
+
+    def test_reports_errors_per_scenario(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "broken.json").write_text("{}")
+            out = io.StringIO()
+            summary = run_batch(tmp, out=out)
+        record = json.loads(out.getvalue())
+        self.assertEqual(summary["error"], 1)
+        self.assertEqual(record["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
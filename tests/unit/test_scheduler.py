@@ -0,0 +1,169 @@
+import tempfile
+import threading
+import unittest
+from concurrent.futures import wait
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from mentos import reports
+from mentos.db import apply_migrations, connect
+from mentos.jobs import nightly_report, run_idempotent
+from mentos.scheduler import Daily, Every, Job, Monthly, Scheduler, Weekly
+
+TZ = ZoneInfo("Europe/London")
+
+
+def _at(*args) -> datetime:
+    return datetime(*args, tzinfo=TZ)
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_last_slot_is_most_recent_occurrence(self):
+        now = _at(2026, 3, 1, 0, 7, 30)  # a Sunday
+        self.assertEqual(Every(5).last_slot(now), _at(2026, 3, 1, 0, 5))
+        self.assertEqual(Daily(0, 5).last_slot(now), _at(2026, 3, 1, 0, 5))
+        self.assertEqual(Daily(0, 10).last_slot(now), _at(2026, 2, 28, 0, 10))
+        self.assertEqual(Weekly(0, 9, 5).last_slot(now), _at(2026, 2, 23, 9, 5))
+        self.assertEqual(Monthly(1, 9, 0).last_slot(now), _at(2026, 2, 1, 9, 0))
+        self.assertEqual(Monthly(1, 9, 0).last_slot(_at(2026, 1, 1, 8, 0)), _at(2025, 12, 1, 9, 0))
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_missed_slot_is_caught_up_once_through_job_runs(self):
+        runs = []
+
+        def report(conn, slot):
+            run_idempotent(conn, "nightly_report", slot.date().isoformat(), lambda: runs.append(slot))
+
+        jobs = [Job("nightly_report", Daily(0, 10), report)]
+        # Started at 08:00, long after the 00:10 window.
+        first = Scheduler(self.db_path, jobs, TZ)
+        wait(first.tick(_at(2026, 3, 2, 8, 0)))
+        wait(first.tick(_at(2026, 3, 2, 8, 1)))
+        first.shutdown()
+        # A restart the same day finds the run in job_runs.
+        second = Scheduler(self.db_path, jobs, TZ)
+        wait(second.tick(_at(2026, 3, 2, 9, 0)))
+        second.shutdown()
+        self.assertEqual(runs, [_at(2026, 3, 2, 0, 10)])
+
+    def test_every_missed_calendar_slot_is_caught_up_in_order(self):
+        runs = []
+
+        def report(conn, slot):
+            run_idempotent(conn, "nightly_report", slot.date().isoformat(), lambda: runs.append(slot))
+
+        # Last ran for the 2 March slot, then down for three nights.
+        conn = connect(self.db_path)
+        conn.execute(
+            "INSERT INTO job_runs (id, job_name, run_key, status, started_at) "
+            "VALUES ('r1', 'nightly_report', '2026-03-02', 'ok', '2026-03-02 00:10:01')"
+        )
+        conn.commit()
+        conn.close()
+        job = Job("nightly_report", Daily(0, 10), report, catch_up=True)
+        scheduler = Scheduler(self.db_path, [job], TZ)
+        wait(scheduler.tick(_at(2026, 3, 5, 8, 0)))
+        scheduler.shutdown()
+        self.assertEqual(runs, [_at(2026, 3, day, 0, 10) for day in (3, 4, 5)])
+
+    def test_caught_up_nightly_reports_cover_their_own_nights(self):
+        payloads = []
+
+        def report(*args, **kwargs):
+            payloads.append(reports.nightly_report(*args, **kwargs))
+
+        conn = connect(self.db_path)
+        conn.execute(
+            "INSERT INTO job_runs (id, job_name, run_key, status, started_at) "
+            "VALUES ('r1', 'nightly_report', '2026-03-01', 'ok', '2026-03-02 00:10:01')"
+        )
+        conn.commit()
+        conn.close()
+        job = Job(
+            "nightly_report",
+            Daily(0, 10),
+            lambda conn, slot: nightly_report(conn, TZ, None, now=slot),
+            catch_up=True,
+        )
+        scheduler = Scheduler(self.db_path, [job], TZ)
+        with mock.patch("mentos.jobs.generate_nightly_report", side_effect=report):
+            wait(scheduler.tick(_at(2026, 3, 4, 8, 0)))
+        scheduler.shutdown()
+        self.assertEqual([p["day"] for p in payloads], ["2026-03-02", "2026-03-03"])
+        self.assertNotEqual(payloads[0]["headline"], payloads[1]["headline"])
+
+    def test_jobs_without_catch_up_only_run_the_newest_missed_slot(self):
+        runs = []
+
+        def sweep(conn, slot):
+            run_idempotent(conn, "daily_sweep", slot.date().isoformat(), lambda: runs.append(slot))
+
+        conn = connect(self.db_path)
+        conn.execute(
+            "INSERT INTO job_runs (id, job_name, run_key, status, started_at) "
+            "VALUES ('r1', 'daily_sweep', '2026-03-02', 'ok', '2026-03-02 00:05:01')"
+        )
+        conn.commit()
+        conn.close()
+        scheduler = Scheduler(self.db_path, [Job("daily_sweep", Daily(0, 5), sweep)], TZ)
+        wait(scheduler.tick(_at(2026, 3, 5, 8, 0)))
+        scheduler.shutdown()
+        self.assertEqual(runs, [_at(2026, 3, 5, 0, 5)])
+
+    def test_interval_jobs_only_run_their_latest_slot(self):
+        polls = []
+        jobs = [Job("poll", Every(5), lambda conn, slot: polls.append(slot))]
+        scheduler = Scheduler(self.db_path, jobs, TZ)
+        wait(scheduler.tick(_at(2026, 3, 2, 8, 0)))
+        wait(scheduler.tick(_at(2026, 3, 2, 9, 0)))
+        scheduler.shutdown()
+        self.assertEqual(polls, [_at(2026, 3, 2, 8, 0), _at(2026, 3, 2, 9, 0)])
+
+    def test_slow_job_is_not_overlapped_and_does_not_block_others(self):
+        release = threading.Event()
+        started = threading.Event()
+        polls = []
+        reports = []
+
+        def poll(conn, slot):
+            polls.append(slot)
+            started.set()
+            release.wait(5)
+
+        jobs = [
+            Job("poll", Every(5), poll),
+            Job("report", Every(5), lambda conn, slot: reports.append(slot)),
+        ]
+        scheduler = Scheduler(self.db_path, jobs, TZ)
+        try:
+            first = scheduler.tick(_at(2026, 3, 2, 8, 0))
+            started.wait(5)
+            # The first report must have released its lock before 08:05 is offered.
+            wait(first[1:])
+            wait(scheduler.tick(_at(2026, 3, 2, 8, 5)))
+            self.assertEqual(len(polls), 1)
+            self.assertEqual(len(reports), 2)
+
+            release.set()
+            wait(first)
+            # The deferred poll slot is picked up once the first run finishes.
+            wait(scheduler.tick(_at(2026, 3, 2, 8, 6)))
+            self.assertEqual(polls, [_at(2026, 3, 2, 8, 0), _at(2026, 3, 2, 8, 5)])
+        finally:
+            release.set()
+            scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mentos.bench import DEFAULT_END, run_benchmarks
+from mentos.db import apply_migrations, connect
+from mentos.monzo_stub import StubMonzoClient
+from mentos.sync import sync_all
+from mentos.synthetic import generate_user
+
+END = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+class SyntheticGeneratorTests(unittest.TestCase):
+    def test_seeded_output_is_reproducible(self):
+        first = generate_user(seed=3, transactions=500, end=END)
+        second = generate_user(seed=3, transactions=500, end=END)
+        other = generate_user(seed=4, transactions=500, end=END)
+        self.assertEqual(first.transactions, second.transactions)
+        self.assertNotEqual(first.transactions, other.transactions)
+
+    def test_produces_payday_subscription_and_late_night_patterns(self):
+        user = generate_user(seed=3, transactions=2000, end=END)
+        self.assertAlmostEqual(len(user.transactions), 2000, delta=20)
+        salaries = [tx for tx in user.transactions if tx["category"] == "income"]
+        self.assertGreaterEqual(len(salaries), 3)
+        self.assertEqual(len({tx["created"][8:10] for tx in salaries}), 1)
+        late = [tx for tx in user.transactions if int(tx["created"][11:13]) >= 22]
+        self.assertTrue(late)
+        self.assertTrue(any(tx["settled"] is None for tx in user.transactions))
+
+
+class StubMonzoClientTests(unittest.TestCase):
+    def test_sync_all_pages_through_stub(self):
+        user = generate_user(seed=5, transactions=600, end=datetime.now(timezone.utc), days=25)
+        client = StubMonzoClient(user.accounts, user.pots, user.transactions)
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp, "t.sqlite"))
+            apply_migrations(db_path)
+            conn = connect(db_path)
+            sync_all(conn, "token", client=client)
+            count = conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0]
+            conn.close()
+        self.assertGreater(count, 550)
+        self.assertGreater(client.calls["transactions"], 5)
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_results_are_stable_json_shape(self):
+        results = run_benchmarks(
+            transactions=300, repeat=1, only=["rebuild_daily", "build_spend_context"]
+        )
+        self.assertEqual(set(results["benchmarks"]), {"rebuild_daily", "build_spend_context"})
+        for entry in results["benchmarks"].values():
+            self.assertEqual(set(entry), {"seconds", "rows", "us_per_row"})
+        self.assertEqual(results["params"]["end"], DEFAULT_END.isoformat())
+
+    def test_rows_depend_on_end_not_the_clock(self):
+        only = ["rebuild_daily", "nightly_report"]
+        first = run_benchmarks(transactions=300, repeat=1, only=only, end=END)
+        second = run_benchmarks(transactions=300, repeat=1, only=only, end=END)
+        rows = {name: entry["rows"] for name, entry in first["benchmarks"].items()}
+        again = {name: entry["rows"] for name, entry in second["benchmarks"].items()}
+        self.assertEqual(rows, again)
+        self.assertGreater(rows["rebuild_daily"], 0)
+        self.assertGreater(rows["nightly_report"], 0)
+        self.assertEqual(first["params"]["end"], END.isoformat())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from mentos import telemetry
+from mentos.copywriter import CopyWriter
+from mentos.db import apply_migrations, connect
+from mentos.jobs import INTERVAL_JOBS, poll_and_aggregate, record_run, run_idempotent
+
+
+class TelemetryTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+        self.conn = connect(self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_run_records_phases_and_counters(self):
+        def job():
+            with telemetry.phase("sync"):
+                telemetry.count("http_calls", 3)
+                telemetry.count("rows_written", 120)
+            with telemetry.phase("aggregate"):
+                telemetry.count("rows_read", 40)
+
+        run_idempotent(self.conn, "poll", "k1", job)
+        duration, metrics_json = self.conn.execute(
+            "SELECT duration_ms, metrics_json FROM job_runs WHERE run_key = 'k1'"
+        ).fetchone()
+        metrics = json.loads(metrics_json)
+        self.assertGreaterEqual(duration, 0)
+        self.assertEqual(set(metrics["phases_ms"]), {"sync", "aggregate"})
+        self.assertEqual(metrics["counters"], {"http_calls": 3, "rows_written": 120, "rows_read": 40})
+
+    def test_failed_run_keeps_its_metrics(self):
+        def job():
+            telemetry.count("http_calls")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run_idempotent(self.conn, "poll", "k2", job)
+        status, metrics_json = self.conn.execute(
+            "SELECT status, metrics_json FROM job_runs WHERE run_key = 'k2'"
+        ).fetchone()
+        self.assertEqual(status, "error")
+        self.assertEqual(json.loads(metrics_json)["counters"], {"http_calls": 1})
+
+    def test_interval_runs_are_recorded_every_time_and_pruned(self):
+        calls = []
+        record_run(self.conn, "poll_and_aggregate", lambda: calls.append(1))
+        record_run(self.conn, "poll_and_aggregate", lambda: calls.append(2))
+        self.assertEqual(calls, [1, 2])
+        run_idempotent(self.conn, "nightly_report", "2026-01-01", lambda: None)
+        self.conn.execute("UPDATE job_runs SET started_at = datetime('now', '-30 days')")
+        self.conn.commit()
+
+        poll_and_aggregate(self.conn, None)
+        remaining = [
+            row[0] for row in self.conn.execute("SELECT job_name FROM job_runs ORDER BY job_name")
+        ]
+        self.assertEqual(remaining, ["nightly_report"])
+        self.assertIn("poll_and_aggregate", INTERVAL_JOBS)
+
+    def test_background_copy_counts_against_the_submitting_run(self):
+        copywriter = CopyWriter(self.db_path)
+        done = threading.Event()
+
+        def generate():
+            with telemetry.phase("llm"):
+                telemetry.count("llm_calls")
+            done.set()
+            return {}
+
+        try:
+            with telemetry.recording() as metrics:
+                copywriter.submit("goal_drift_events", "e1", generate)
+                copywriter.collect(["e1"], 5)
+        finally:
+            copywriter.shutdown(wait_for_pending=True)
+        self.assertTrue(done.is_set())
+        self.assertEqual(metrics.counters, {"llm_calls": 1})
+        self.assertIn("llm", metrics.phases)
+
+    def test_perf_summary_percentiles_per_job_and_phase(self):
+        for n in range(20):
+            self.conn.execute(
+                """
+                INSERT INTO job_runs (id, job_name, run_key, status, started_at, finished_at, duration_ms, metrics_json)
+                VALUES (?, 'poll', ?, 'ok', ?, ?, ?, ?)
+                """,
+                (
+                    f"r{n}",
+                    f"k{n}",
+                    f"2026-03-01 00:{n:02d}:00",
+                    f"2026-03-01 00:{n:02d}:01",
+                    (n + 1) * 10,
+                    json.dumps({"phases_ms": {"sync": (n + 1) * 5}, "counters": {"http_calls": n + 1}}),
+                ),
+            )
+        self.conn.commit()
+        summary = {(r["job"], r["metric"]): r for r in telemetry.perf_summary(self.conn, runs=10)}
+        total = summary[("poll", "total")]
+        self.assertEqual(total["runs"], 10)
+        # The last ten runs took 110..200ms.
+        self.assertEqual(total["p50"], 150)
+        self.assertEqual(total["p95"], 200)
+        self.assertEqual(summary[("poll", "sync")]["p50"], 75)
+        self.assertEqual(summary[("poll", "http_calls")]["unit"], "count")
+
+
+if __name__ == "__main__":
+    unittest.main()
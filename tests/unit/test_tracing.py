@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from mentos import telemetry, tracing
+from mentos.db import Connection, TracedConnection, apply_migrations, connect
+from mentos.pipeline import prefetch
+from mentos.tracing import Tracer, folded, read_spans, summarize
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+        self.tracer = Tracer(str(Path(self._tmp.name, "traces", "t.jsonl")))
+
+    def tearDown(self):
+        tracing.install(None)
+        self._tmp.cleanup()
+
+    def _spans(self) -> list[dict]:
+        self.tracer.close()
+        return read_spans(self.tracer.files())
+
+    def test_disabled_tracing_writes_nothing_and_leaves_connections_plain(self):
+        with tracing.span("job.poll"):
+            tracing.set_attr("ignored", True)
+        conn = connect(self.db_path)
+        self.assertIs(type(conn), Connection)
+        conn.close()
+        self.assertEqual(self.tracer.files(), [])
+
+    def test_spans_nest_across_phases_sql_and_worker_threads(self):
+        tracing.install(self.tracer)
+        conn = connect(self.db_path)
+        self.assertIs(type(conn), TracedConnection)
+
+        def pages():
+            with tracing.span("monzo.request", path="/transactions"):
+                yield 1
+
+        with tracing.span("job.poll", slot="2026-03-01T10:00"):
+            with telemetry.recording(), telemetry.phase("sync"):
+                for _ in prefetch(pages()):
+                    conn.execute("SELECT   COUNT(1)\n FROM transactions").fetchone()
+            with self.assertRaises(ZeroDivisionError), tracing.span("aggregate"):
+                1 / 0
+        conn.close()
+
+        spans = self._spans()
+        self.assertEqual(len({s["trace_id"] for s in spans}), 1)
+        by_name = {s["name"]: s for s in spans}
+        self.assertIsNone(by_name["job.poll"]["parent_id"])
+        self.assertEqual(by_name["sync"]["parent_id"], by_name["job.poll"]["span_id"])
+        self.assertEqual(by_name["monzo.request"]["parent_id"], by_name["sync"]["span_id"])
+        self.assertEqual(by_name["sql"]["attrs"]["statement"], "SELECT COUNT(1) FROM transactions")
+        self.assertEqual(by_name["aggregate"]["error"], "ZeroDivisionError")
+
+        stacks = {row["stack"]: row for row in summarize(spans)}
+        self.assertIn(("job.poll", "sync", "sql"), stacks)
+        self.assertEqual(stacks[("job.poll", "aggregate")]["errors"], 1)
+        root = stacks[("job.poll",)]
+        self.assertLessEqual(root["self_ms"], root["total_ms"])
+        self.assertIn("job.poll;sync;sql ", folded(summarize(spans)))
+
+    def test_trace_file_rotates_and_summary_reads_every_file(self):
+        self.tracer.max_bytes = 600
+        self.tracer.backups = 2
+        tracing.install(self.tracer)
+        for n in range(40):
+            with tracing.span("job.tick", n=n):
+                pass
+        files = self.tracer.files()
+        self.assertEqual([p.name for p in files], ["t.jsonl.2", "t.jsonl.1", "t.jsonl"])
+        self.assertTrue(all(p.stat().st_size < 1200 for p in files))
+        spans = self._spans()
+        self.assertLess(len(spans), 40)
+        self.assertEqual(spans[-1]["attrs"], {"n": 39})
+        self.assertEqual(summarize(spans)[0]["count"], len(spans))
+
+
+if __name__ == "__main__":
+    unittest.main()
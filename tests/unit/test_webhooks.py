@@ -0,0 +1,69 @@
+import tempfile
+import threading
+import unittest
+import urllib.error
+from pathlib import Path
+
+from mentos.aggregates import rebuild_daily
+from mentos.db import apply_migrations, connect
+from mentos.webhooks import WebhookServer, handle_event, mock_events, post_events
+
+MOCKS_DIR = str(Path(__file__).resolve().parents[2] / "scripts" / "mocks")
+
+
+def _aggregates(conn) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in conn.execute(
+            "SELECT day, category, total_amount, count FROM aggregates_daily ORDER BY day, category"
+        )
+    ]
+
+
+class WebhookTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name, "t.sqlite"))
+        apply_migrations(self.db_path)
+        self.server = WebhookServer(("127.0.0.1", 0), self.db_path, secret="s3cret")
+        self.url = f"http://127.0.0.1:{self.server.server_port}/webhooks/monzo?token=s3cret"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        self.conn = connect(self.db_path)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def test_replayed_mocks_match_a_full_rebuild(self):
+        events = mock_events(MOCKS_DIR)
+        results = post_events(self.url, events)
+        self.assertEqual([r["status"] for r in results], ["ok"] * len(events))
+        self.assertEqual(
+            self.conn.execute("SELECT COUNT(1) FROM transactions").fetchone()[0], len(events)
+        )
+        incremental = _aggregates(self.conn)
+        self.assertTrue(incremental)
+        rebuild_daily(self.conn, days=36500)
+        self.assertEqual(incremental, _aggregates(self.conn))
+
+    def test_update_moves_the_transaction_between_cells(self):
+        event = mock_events(MOCKS_DIR)[0]
+        handle_event(self.conn, event)
+        moved = {"type": "transaction.updated", "data": {**event["data"], "category": "groceries"}}
+        result = handle_event(self.conn, moved)
+        self.assertEqual(result["cells"], 2)
+        self.assertEqual([row[1] for row in _aggregates(self.conn)], ["groceries"])
+
+    def test_rejects_wrong_secret_and_ignores_other_events(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            post_events(self.url.replace("s3cret", "nope"), mock_events(MOCKS_DIR)[:1])
+        self.assertEqual(ctx.exception.code, 403)
+        [result] = post_events(self.url, [{"type": "account.updated", "data": {}}])
+        self.assertEqual(result["status"], "ignored")
+
+
+if __name__ == "__main__":
+    unittest.main()